@@ -6,7 +6,7 @@ MT-PaaS 설정
 
 import os
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 @dataclass
@@ -117,6 +117,237 @@ class PortConfig:
         )
 
 
+@dataclass
+class UsageReportConfig:
+    """사용량 보고 설정 (서비스 → 마켓)"""
+    enabled: bool = True
+    interval_minutes: int = 5
+    metrics: List[str] = field(default_factory=lambda: [
+        "api_calls",
+        "active_users",
+        "storage_usage",
+        "llm_tokens",
+        "cpu_ms",
+    ])
+
+    # 마켓 사용량 수집 엔드포인트 (없으면 보고 비활성)
+    endpoint: Optional[str] = None
+
+    # 마지막 보고 위치(커서) 저장 파일
+    cursor_path: str = ".mt_paas_usage_cursor.json"
+
+    # 재시도
+    max_retries: int = 5
+    backoff_max_seconds: int = 60
+
+    @classmethod
+    def from_env(cls) -> "UsageReportConfig":
+        """환경변수에서 설정 로드"""
+        metrics = os.getenv("MT_USAGE_REPORT_METRICS")
+        return cls(
+            enabled=os.getenv("MT_USAGE_REPORT_ENABLED", "true").lower() == "true",
+            interval_minutes=int(os.getenv("MT_USAGE_REPORT_INTERVAL_MINUTES", "5")),
+            metrics=metrics.split(",") if metrics else cls().metrics,
+            endpoint=os.getenv("MT_USAGE_REPORT_URL"),
+            cursor_path=os.getenv("MT_USAGE_REPORT_CURSOR", ".mt_paas_usage_cursor.json"),
+            max_retries=int(os.getenv("MT_USAGE_REPORT_MAX_RETRIES", "5")),
+            backoff_max_seconds=int(os.getenv("MT_USAGE_REPORT_BACKOFF_MAX", "60")),
+        )
+
+
+@dataclass
+class TenantCacheConfig:
+    """테넌트 조회 캐시 설정 (TenantMiddleware)"""
+    enabled: bool = True
+    ttl_seconds: float = 60
+    # 존재하지 않거나 비활성인 테넌트 ID 캐시 유지 시간
+    negative_ttl_seconds: float = 10
+    max_size: int = 10000
+    # 알려진 테넌트 ID Bloom filter (없는 ID는 DB 조회 없이 거절)
+    # 다른 워커/인스턴스에서 만든 테넌트는 다음 재구성 전까지 거절되므로 기본 비활성
+    known_ids_filter: bool = False
+    known_ids_error_rate: float = 0.001
+    known_ids_refresh_seconds: float = 300
+    # 워커 공유 테넌트 디렉터리 (mmap 파일, 켜면 워커별 조회 캐시는 없는 테넌트만 보관)
+    shared_directory: bool = False
+    shared_directory_path: str = "/dev/shm/mt_paas_tenants.dir"
+    shared_directory_refresh_seconds: float = 60
+
+    @classmethod
+    def from_env(cls) -> "TenantCacheConfig":
+        """환경변수에서 설정 로드"""
+        return cls(
+            enabled=os.getenv("MT_TENANT_CACHE_ENABLED", "true").lower() == "true",
+            ttl_seconds=float(os.getenv("MT_TENANT_CACHE_TTL", "60")),
+            negative_ttl_seconds=float(os.getenv("MT_TENANT_CACHE_NEGATIVE_TTL", "10")),
+            max_size=int(os.getenv("MT_TENANT_CACHE_MAX_SIZE", "10000")),
+            known_ids_filter=os.getenv("MT_TENANT_FILTER_ENABLED", "false").lower() == "true",
+            known_ids_error_rate=float(os.getenv("MT_TENANT_FILTER_ERROR_RATE", "0.001")),
+            known_ids_refresh_seconds=float(os.getenv("MT_TENANT_FILTER_REFRESH", "300")),
+            shared_directory=os.getenv("MT_TENANT_DIRECTORY_ENABLED", "false").lower() == "true",
+            shared_directory_path=os.getenv("MT_TENANT_DIRECTORY_PATH", "/dev/shm/mt_paas_tenants.dir"),
+            shared_directory_refresh_seconds=float(os.getenv("MT_TENANT_DIRECTORY_REFRESH", "60")),
+        )
+
+
+@dataclass
+class RateLimitConfig:
+    """
+    테넌트별 요청 속도 제한 설정 (requests per minute)
+
+    기본 비활성입니다. 켜면 429로 거절된 요청도 이미 api_calls 쿼터/사용량에
+    집계되므로, 한도를 정할 때 이를 감안하세요.
+    """
+    enabled: bool = False
+    by_plan: Dict[str, int] = field(default_factory=lambda: {
+        "free": 30,
+        "basic": 60,
+        "standard": 120,
+        "premium": 300,
+        "enterprise": 1000,
+    })
+    default_rpm: int = 60
+    # memory: 워커별 버킷, redis: 워커 간 공유 버킷 (RedisConfig 사용)
+    backend: str = "memory"
+    # memory 백엔드의 최대 버킷 수 (유휴 버킷은 1분 뒤 제거)
+    max_buckets: int = 10000
+
+    def rpm_for(self, plan: str) -> int:
+        """요금제별 분당 허용 요청 수 (0 이하: 무제한)"""
+        return self.by_plan.get(plan, self.default_rpm)
+
+    @classmethod
+    def from_env(cls) -> "RateLimitConfig":
+        """
+        환경변수에서 설정 로드
+
+        MT_RATE_LIMIT_BY_PLAN 형식: "free=30,basic=60,premium=300"
+        """
+        by_plan = cls().by_plan
+        for item in filter(None, os.getenv("MT_RATE_LIMIT_BY_PLAN", "").split(",")):
+            plan, _, rpm = item.partition("=")
+            by_plan[plan.strip()] = int(rpm)
+        return cls(
+            enabled=os.getenv("MT_RATE_LIMIT_ENABLED", "false").lower() == "true",
+            by_plan=by_plan,
+            default_rpm=int(os.getenv("MT_RATE_LIMIT_DEFAULT_RPM", "60")),
+            backend=os.getenv("MT_RATE_LIMIT_BACKEND", "memory"),
+            max_buckets=int(os.getenv("MT_RATE_LIMIT_MAX_BUCKETS", "10000")),
+        )
+
+
+@dataclass
+class ConcurrencyConfig:
+    """테넌트별 동시 처리 제한 설정"""
+    enabled: bool = False
+    # 워커 전체 동시 처리 수
+    max_concurrency: int = 64
+    # 요금제별 테넌트 동시 처리 수 (공정 분배 가중치)
+    by_plan: Dict[str, int] = field(default_factory=lambda: {
+        "free": 2,
+        "basic": 4,
+        "standard": 8,
+        "premium": 16,
+        "enterprise": 32,
+    })
+    default_limit: int = 4
+    max_wait_seconds: float = 10
+    max_queue_per_tenant: int = 100
+
+    @classmethod
+    def from_env(cls) -> "ConcurrencyConfig":
+        """
+        환경변수에서 설정 로드
+
+        MT_CONCURRENCY_BY_PLAN 형식: "free=2,basic=4,premium=16"
+        """
+        by_plan = cls().by_plan
+        for item in filter(None, os.getenv("MT_CONCURRENCY_BY_PLAN", "").split(",")):
+            plan, _, limit = item.partition("=")
+            by_plan[plan.strip()] = int(limit)
+        return cls(
+            enabled=os.getenv("MT_CONCURRENCY_ENABLED", "false").lower() == "true",
+            max_concurrency=int(os.getenv("MT_CONCURRENCY_MAX", "64")),
+            by_plan=by_plan,
+            default_limit=int(os.getenv("MT_CONCURRENCY_DEFAULT_LIMIT", "4")),
+            max_wait_seconds=float(os.getenv("MT_CONCURRENCY_MAX_WAIT", "10")),
+            max_queue_per_tenant=int(os.getenv("MT_CONCURRENCY_MAX_QUEUE", "100")),
+        )
+
+
+@dataclass
+class AdmissionConfig:
+    """표준 API 승인 제어(부하 차단) 설정"""
+    enabled: bool = False
+    # 워커 전체 표준 API 동시 처리 수 (헬스체크/라이프사이클 제외)
+    max_in_flight: int = 256
+    # 허용 대기열 지연, 이 지연이 interval 동안 계속되면 새 요청 503
+    target_delay_ms: float = 50
+    interval_ms: float = 500
+    max_queue: int = 1024
+    max_wait_seconds: float = 5
+
+    @classmethod
+    def from_env(cls) -> "AdmissionConfig":
+        """환경변수에서 설정 로드"""
+        return cls(
+            enabled=os.getenv("MT_ADMISSION_ENABLED", "false").lower() == "true",
+            max_in_flight=int(os.getenv("MT_ADMISSION_MAX_IN_FLIGHT", "256")),
+            target_delay_ms=float(os.getenv("MT_ADMISSION_TARGET_MS", "50")),
+            interval_ms=float(os.getenv("MT_ADMISSION_INTERVAL_MS", "500")),
+            max_queue=int(os.getenv("MT_ADMISSION_MAX_QUEUE", "1024")),
+            max_wait_seconds=float(os.getenv("MT_ADMISSION_MAX_WAIT", "5")),
+        )
+
+
+@dataclass
+class MemoryProfilingConfig:
+    """테넌트별 메모리 할당 샘플링 설정 (tracemalloc, 기본 꺼짐)"""
+    enabled: bool = False
+    # N건 중 1건 추적
+    sample_rate: int = 100
+    # 할당 위치당 스택 깊이
+    frames: int = 1
+    # 추적 시작 간 최소 간격 (초, 추적 중에는 프로세스 전체 할당이 느려짐)
+    min_interval_seconds: float = 1.0
+    # 보고서 경로 (기본 None: 노출 안 함, 켜면 memory_debug_dependencies로 인증)
+    debug_path: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "MemoryProfilingConfig":
+        """환경변수에서 설정 로드"""
+        return cls(
+            enabled=os.getenv("MT_MEMORY_PROFILING_ENABLED", "false").lower() == "true",
+            sample_rate=int(os.getenv("MT_MEMORY_PROFILING_SAMPLE_RATE", "100")),
+            frames=int(os.getenv("MT_MEMORY_PROFILING_FRAMES", "1")),
+            min_interval_seconds=float(os.getenv("MT_MEMORY_PROFILING_MIN_INTERVAL", "1.0")),
+            debug_path=os.getenv("MT_MEMORY_PROFILING_PATH") or None,
+        )
+
+
+@dataclass
+class ShardingConfig:
+    """테넌트 고정 배정 디스패처 설정 (mt_paas.sharding, 워커 앞에서 별도 프로세스로 실행)"""
+    # 워커 주소 (Unix 소켓 경로 또는 http://host:port, 주소가 링 위치를 결정)
+    workers: List[str] = field(default_factory=list)
+    # 워커당 가상 노드 수
+    virtual_nodes: int = 160
+    timeout_seconds: float = 60
+    # 연결 실패한 워커를 제외할 시간
+    retry_down_seconds: float = 5
+
+    @classmethod
+    def from_env(cls) -> "ShardingConfig":
+        """환경변수에서 설정 로드"""
+        workers = os.getenv("MT_SHARDING_WORKERS", "")
+        return cls(
+            workers=[w.strip() for w in workers.split(",") if w.strip()],
+            virtual_nodes=int(os.getenv("MT_SHARDING_VIRTUAL_NODES", "160")),
+            timeout_seconds=float(os.getenv("MT_SHARDING_TIMEOUT", "60")),
+            retry_down_seconds=float(os.getenv("MT_SHARDING_RETRY_DOWN", "5")),
+        )
+
+
 @dataclass
 class MTPaaSConfig:
     """MT-PaaS 전체 설정"""
@@ -131,10 +362,23 @@ class MTPaaSConfig:
     database: DatabaseConfig = field(default_factory=DatabaseConfig)
     redis: RedisConfig = field(default_factory=RedisConfig)
     ports: PortConfig = field(default_factory=PortConfig)
+    usage_report: UsageReportConfig = field(default_factory=UsageReportConfig)
+    tenant_cache: TenantCacheConfig = field(default_factory=TenantCacheConfig)
+    rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
+    concurrency: ConcurrencyConfig = field(default_factory=ConcurrencyConfig)
+    admission: AdmissionConfig = field(default_factory=AdmissionConfig)
+    # 테넌트별 CPU 시간 계측 (UsageRecorder "cpu_ms", /metrics)
+    # 켜면 anyio.to_thread.run_sync를 프로세스 전역으로 감싸므로 기본 비활성
+    cpu_accounting: bool = False
+    memory_profiling: MemoryProfilingConfig = field(default_factory=MemoryProfilingConfig)
+    sharding: ShardingConfig = field(default_factory=ShardingConfig)
 
     # 보안
     api_key: Optional[str] = None
     jwt_secret: Optional[str] = None
+    jwt_algorithm: str = "HS256"
+    # 테넌트 식별에 사용할 JWT 클레임 (jwt_secret 지정 시)
+    jwt_tenant_claim: str = "tenant_id"
 
     # 제한
     default_max_users: int = 50
@@ -152,8 +396,18 @@ class MTPaaSConfig:
             database=DatabaseConfig.from_env(),
             redis=RedisConfig.from_env(),
             ports=PortConfig.from_env(),
+            usage_report=UsageReportConfig.from_env(),
+            tenant_cache=TenantCacheConfig.from_env(),
+            rate_limit=RateLimitConfig.from_env(),
+            concurrency=ConcurrencyConfig.from_env(),
+            admission=AdmissionConfig.from_env(),
+            cpu_accounting=os.getenv("MT_CPU_ACCOUNTING", "false").lower() == "true",
+            memory_profiling=MemoryProfilingConfig.from_env(),
+            sharding=ShardingConfig.from_env(),
             api_key=os.getenv("MARKET_API_KEY"),
             jwt_secret=os.getenv("MT_JWT_SECRET"),
+            jwt_algorithm=os.getenv("MT_JWT_ALGORITHM", "HS256"),
+            jwt_tenant_claim=os.getenv("MT_JWT_TENANT_CLAIM", "tenant_id"),
             default_max_users=int(os.getenv("MT_DEFAULT_MAX_USERS", "50")),
             default_max_storage_mb=int(os.getenv("MT_DEFAULT_MAX_STORAGE_MB", "1000")),
             default_max_api_calls=int(os.getenv("MT_DEFAULT_MAX_API_CALLS", "1000")),
@@ -4,6 +4,9 @@ Core 모듈 - 멀티테넌트 핵심 기능
 - TenantManager: 테넌트 생명주기 관리
 - DatabaseManager: DB 연결 풀 관리
 - TenantLifecycle: 테넌트 라이프사이클 관리
+- QuotaEngine: 구독 한도 집행
+- DataLoader, TenantLoader: 동시 조회 병합(배치) 로더
+- SingleFlight: 키별 동시 호출 병합
 - Tenant, Subscription: 모델
 """
 from .manager import TenantManager
@@ -17,6 +20,8 @@ from .schemas import (
     SubscriptionResponse,
 )
 from .lifecycle import TenantLifecycle, LifecycleEvent
+from .quota import QuotaEngine, QuotaLimits, counts_from_handler
+from .loader import DataLoader, TenantLoader, SingleFlight
 
 __all__ = [
     # Managers
@@ -24,6 +29,12 @@ __all__ = [
     "DatabaseManager",
     "TenantLifecycle",
     "LifecycleEvent",
+    "QuotaEngine",
+    "QuotaLimits",
+    "counts_from_handler",
+    "DataLoader",
+    "TenantLoader",
+    "SingleFlight",
     # Models
     "Tenant",
     "TenantStatus",
@@ -64,6 +64,29 @@ class TenantLifecycle:
         if handler in self._hooks[event]:
             self._hooks[event].remove(handler)
 
+    def on_change(self, callback: Callable[[str], Any]) -> None:
+        """
+        테넌트 변경 훅 등록 (캐시 무효화용)
+
+        생성/프로비저닝/활성화/정지/삭제 후 callback(tenant_id)을 호출합니다.
+        """
+        def on_tenant(tenant: Any = None, **kwargs) -> Any:
+            if tenant is not None:
+                return callback(tenant.id)
+
+        def on_tenant_id(tenant_id: Optional[str] = None, **kwargs) -> Any:
+            if tenant_id is not None:
+                return callback(tenant_id)
+
+        for event in (
+            LifecycleEvent.AFTER_CREATE,
+            LifecycleEvent.AFTER_PROVISION,
+            LifecycleEvent.AFTER_ACTIVATE,
+            LifecycleEvent.AFTER_SUSPEND,
+        ):
+            self.on(event, on_tenant)
+        self.on(LifecycleEvent.AFTER_DELETE, on_tenant_id)
+
     async def _emit(self, event: LifecycleEvent, **kwargs) -> None:
         """이벤트 발생"""
         for handler in self._hooks[event]:
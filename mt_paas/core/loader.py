@@ -0,0 +1,218 @@
+"""
+요청 병합(DataLoader) 조회
+
+같은 이벤트 루프 tick 안에서 들어온 조회 요청을 모아 한 번의 배치 조회로 처리합니다.
+트래픽이 몰릴 때 테넌트마다(또는 같은 테넌트에 대해) 요청 수만큼 나가던
+테넌트/구독 쿼리를 tick당 쿼리 1회로 줄입니다.
+
+- 같은 키에 대한 동시 조회는 하나의 Future를 공유
+- 결과는 캐시하지 않음 (캐시는 TenantLookupCache 담당)
+- SingleFlight: 키별 동시 호출을 태스크 1개로 병합 (캐시/한도 적재 미스 처리용)
+"""
+
+import asyncio
+from typing import Optional, Any, Dict, List, Tuple, Callable, Awaitable, Hashable
+
+
+class DataLoader:
+    """
+    tick 단위 배치 조회기
+
+    Example:
+        async def batch_load(ids: List[str]) -> Dict[str, Tenant]:
+            ...  # WHERE id = ANY(:ids)
+
+        loader = DataLoader(batch_load)
+        a, b = await asyncio.gather(loader.load("t1"), loader.load("t2"))  # 쿼리 1회
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        max_batch_size: int = 500,
+    ):
+        """
+        Args:
+            batch_fn: 키 목록 → {키: 값} 비동기 함수 (결과에 없는 키는 None)
+            max_batch_size: 배치 1회 최대 키 수
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+
+        # 진행 중(대기 + 조회 중)인 키의 Future
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        # 다음 배치에 넣을 키
+        self._queue: List[Hashable] = []
+        self._scheduled = False
+
+        self.batches = 0
+        self.loads = 0
+
+    async def load(self, key: Hashable) -> Any:
+        """키 1개 조회 (같은 tick의 다른 조회와 병합)"""
+        self.loads += 1
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(self._dispatch)
+        # 한 요청이 취소되어도 같은 Future를 기다리는 다른 요청에는 영향 없음
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: List[Hashable]) -> List[Any]:
+        """여러 키 조회"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        self._scheduled = False
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self.max_batch_size):
+            asyncio.ensure_future(self._run_batch(queue[start:start + self.max_batch_size]))
+
+    async def _run_batch(self, keys: List[Hashable]) -> None:
+        self.batches += 1
+        results: Dict[Hashable, Any] = {}
+        error: Optional[BaseException] = None
+        try:
+            results = await self.batch_fn(keys)
+        except BaseException as e:
+            error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            # 취소/종료 시에도 대기 중인 Future를 남기지 않음 (남으면 같은 키 조회가 영원히 대기)
+            for key in keys:
+                future = self._futures.pop(key, None)
+                if future is None or future.done():
+                    continue
+                if error is None:
+                    future.set_result(results.get(key))
+                elif isinstance(error, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(error)
+
+
+class SingleFlight:
+    """
+    키별 동시 호출 병합기
+
+    같은 키로 진행 중인 호출이 있으면 새로 호출하지 않고 그 결과를 함께 기다립니다.
+    호출은 별도 태스크로 실행되므로 처음 요청한 쪽이 취소(연결 종료)되어도
+    함께 기다리던 요청은 결과를 받습니다.
+
+    Example:
+        flight = SingleFlight()
+        value = await flight.do(key, lambda: load(key), on_result=lambda v: cache.set(key, v))
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __iter__(self):
+        return iter(list(self._tasks))
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        on_result: Optional[Callable[[Any], None]] = None,
+    ) -> Any:
+        """
+        키 단위 병합 호출
+
+        on_result는 호출이 성공했고 그 사이 forget되지 않았을 때만 결과로 한 번 호출됩니다.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t, on_result))
+        return await asyncio.shield(task)
+
+    def _finish(
+        self,
+        key: Hashable,
+        task: asyncio.Future,
+        on_result: Optional[Callable[[Any], None]],
+    ) -> None:
+        if task.cancelled():
+            error = True
+        else:
+            # 대기자가 없어도 예외 로그 경고가 나지 않도록 항상 확인
+            error = task.exception() is not None
+        if self._tasks.get(key) is not task:
+            return
+        del self._tasks[key]
+        if not error and on_result is not None:
+            on_result(task.result())
+
+    def forget(self, key: Hashable) -> None:
+        """진행 중인 호출과의 연결 해제 (다음 호출은 새로 실행, 결과는 on_result로 전달 안 함)"""
+        self._tasks.pop(key, None)
+
+    def clear(self) -> None:
+        """모든 진행 중인 호출과의 연결 해제"""
+        self._tasks.clear()
+
+
+class TenantLoader(DataLoader):
+    """
+    테넌트 + 활성 구독 배치 조회기
+
+    tick 안의 테넌트 ID를 모아 테넌트와 활성 구독을 조인한 쿼리 1회로 읽습니다.
+    load()는 (Tenant, Subscription 또는 None) 또는 None(없는 테넌트)을 반환합니다.
+
+    Example:
+        loader = TenantLoader(db_manager)
+        row = await loader.load("hallym_univ")
+        if row:
+            tenant, subscription = row
+    """
+
+    def __init__(self, db_manager: Any, max_batch_size: int = 500):
+        super().__init__(self._load_tenants, max_batch_size=max_batch_size)
+        self.db = db_manager
+
+    async def _load_tenants(self, tenant_ids: List[str]) -> Dict[str, Tuple[Any, Optional[Any]]]:
+        return await self._query(tenant_ids)
+
+    async def load_all(self) -> Dict[str, Tuple[Any, Optional[Any]]]:
+        """전체 테넌트 + 활성 구독 (공유 디렉터리 구성용)"""
+        return await self._query(None)
+
+    async def _query(self, tenant_ids: Optional[List[str]]) -> Dict[str, Tuple[Any, Optional[Any]]]:
+        from sqlalchemy import select, and_, any_, bindparam, String
+        from sqlalchemy.dialects.postgresql import ARRAY
+        from mt_paas.core.models import Tenant, Subscription
+
+        async with self.db.get_central_session() as session:
+            query = (
+                select(Tenant, Subscription)
+                .outerjoin(
+                    Subscription,
+                    and_(Subscription.tenant_id == Tenant.id, Subscription.is_active == True),
+                )
+                .order_by(Tenant.id, Subscription.created_at.desc().nulls_last())
+            )
+            if tenant_ids is not None:
+                if session.get_bind().dialect.name == "postgresql":
+                    # 키 수와 관계없이 같은 SQL (prepared statement 재사용)
+                    query = query.where(Tenant.id == any_(bindparam("tenant_ids", tenant_ids, type_=ARRAY(String))))
+                else:
+                    query = query.where(Tenant.id.in_(tenant_ids))
+
+            result = await session.execute(query)
+
+            rows: Dict[str, Tuple[Any, Optional[Any]]] = {}
+            for tenant, subscription in result.all():
+                # 활성 구독이 여러 개면 최신 것
+                if tenant.id not in rows:
+                    rows[tenant.id] = (tenant, subscription)
+        return rows
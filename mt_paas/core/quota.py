@@ -0,0 +1,397 @@
+"""
+테넌트 한도(Quota) 집행 엔진
+
+Subscription의 max_users / max_storage_mb / max_api_calls_per_day 한도와
+테넌트별 현재 사용량을 메모리(선택: Redis)에 유지하여, 요청마다 DB 조회 없이
+"이 테넌트가 X를 해도 되는가"를 O(1)로 판단합니다.
+
+- 한도/사용량은 테넌트가 처음 조회될 때 DB에서 지연 적재(seed)
+- reconcile_interval마다 DB 값으로 재동기화 (다른 경로로 바뀐 사용자 수 등 보정)
+- Redis를 지정하면 카운터를 워커 간에 공유 (검사+증가는 Lua 스크립트로 원자 처리)
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable, Awaitable, NamedTuple
+
+from mt_paas.standard_api.handler import TenantNotFoundError
+from mt_paas.standard_api.handler_v2 import QuotaExceededError
+
+from .loader import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# 리소스 → (한도 필드, 일 단위 초기화 여부)
+RESOURCES = {
+    "users": ("max_users", False),
+    "storage_mb": ("max_storage_mb", False),
+    "api_calls": ("max_api_calls_per_day", True),
+}
+
+# Redis 검사+증가 스크립트
+# KEYS[1]=카운터 키, ARGV[1]=증가량, ARGV[2]=한도(-1: 무제한), ARGV[3]=TTL(0: 없음)
+# 반환: 증가 후 값, 한도 초과면 -1
+_CONSUME_SCRIPT = """
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+local limit = tonumber(ARGV[2])
+if limit >= 0 and value > limit and tonumber(ARGV[1]) > 0 then
+    redis.call('DECRBY', KEYS[1], ARGV[1])
+    return -1
+end
+if tonumber(ARGV[3]) > 0 then
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return value
+"""
+
+# Redis 감소 스크립트 (0 아래로 내려가지 않음, 일 단위 키의 TTL 유지)
+# KEYS[1]=카운터 키, ARGV[1]=감소량
+_RELEASE_SCRIPT = """
+local value = redis.call('DECRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('INCRBY', KEYS[1], -value)
+    value = 0
+end
+return value
+"""
+
+
+class QuotaLimits(NamedTuple):
+    """테넌트 한도 (None: 무제한)"""
+    max_users: Optional[int] = None
+    max_storage_mb: Optional[int] = None
+    max_api_calls_per_day: Optional[int] = None
+
+    @classmethod
+    def from_subscription(cls, subscription: Any) -> "QuotaLimits":
+        """Subscription 모델에서 한도 추출"""
+        return cls(
+            max_users=getattr(subscription, "max_users", None),
+            max_storage_mb=getattr(subscription, "max_storage_mb", None),
+            max_api_calls_per_day=getattr(subscription, "max_api_calls_per_day", None),
+        )
+
+
+class _TenantQuota:
+    """테넌트 1개의 한도/사용량"""
+    __slots__ = ("limits", "users", "storage_mb", "api_calls", "day", "seeded_at")
+
+    def __init__(self, limits: QuotaLimits):
+        self.limits = limits
+        self.users = 0
+        self.storage_mb = 0
+        self.api_calls = 0
+        self.day = _today()
+        self.seeded_at = time.monotonic()
+
+
+def _today() -> int:
+    return datetime.utcnow().date().toordinal()
+
+
+class QuotaEngine:
+    """
+    테넌트 한도 집행 엔진
+
+    Example:
+        quota = QuotaEngine(db_manager, counts_loader=count_tenant_usage)
+
+        # 요청 경로 (DB 조회 없음)
+        if not await quota.consume("hallym_univ", "api_calls"):
+            ...  # 429
+
+        # 사용자 생성 (초과 시 QuotaExceededError)
+        await quota.enforce("hallym_univ", "users")
+
+        # 라우터/미들웨어 연결
+        router = create_standard_router_v2(handler, quota=quota)
+        app.add_middleware(TenantMiddleware, ..., quota=quota)
+    """
+
+    def __init__(
+        self,
+        db_manager: Optional[Any] = None,
+        counts_loader: Optional[Callable[[str], Awaitable[Dict[str, int]]]] = None,
+        redis: Optional[Any] = None,
+        reconcile_interval: float = 300,
+        key_prefix: str = "mt:quota",
+    ):
+        """
+        Args:
+            db_manager: 한도 적재용 DatabaseManager (None이면 set_limits로만 지정)
+            counts_loader: 테넌트 현재 사용량 조회 함수 (async, {"users": n, "storage_mb": n})
+            redis: redis.asyncio 클라이언트 또는 Redis URL (지정 시 카운터 공유)
+            reconcile_interval: DB 재동기화 주기 (초)
+            key_prefix: Redis 키 prefix
+        """
+        self.db = db_manager
+        self.counts_loader = counts_loader
+        self.reconcile_interval = reconcile_interval
+        self.key_prefix = key_prefix
+
+        if isinstance(redis, str):
+            import redis.asyncio as aioredis
+            redis = aioredis.from_url(redis)
+        self.redis = redis
+        self._consume_script = redis.register_script(_CONSUME_SCRIPT) if redis is not None else None
+        self._release_script = redis.register_script(_RELEASE_SCRIPT) if redis is not None else None
+
+        self._tenants: Dict[str, _TenantQuota] = {}
+        self._seeding = SingleFlight()
+        self._task: Optional[asyncio.Task] = None
+
+    # =========================================================================
+    # 한도/사용량 지정
+    # =========================================================================
+
+    def set_limits(self, tenant_id: str, limits: QuotaLimits) -> None:
+        """테넌트 한도 지정 (사용량은 유지)"""
+        state = self._tenants.get(tenant_id)
+        if state is None:
+            self._tenants[tenant_id] = _TenantQuota(limits)
+        else:
+            state.limits = limits
+
+    def set_usage(self, tenant_id: str, **usage: int) -> None:
+        """테넌트 현재 사용량 지정 (users=, storage_mb=, api_calls=)"""
+        state = self._tenants.get(tenant_id)
+        if state is None:
+            state = self._tenants[tenant_id] = _TenantQuota(QuotaLimits())
+        for resource, value in usage.items():
+            if resource not in RESOURCES:
+                raise ValueError(f"Unknown quota resource: {resource}")
+            setattr(state, resource, int(value))
+
+    def forget_tenant(self, tenant_id: str) -> None:
+        """테넌트 상태 제거 (다음 조회 시 다시 적재)"""
+        self._tenants.pop(tenant_id, None)
+
+    # =========================================================================
+    # 검사
+    # =========================================================================
+
+    def check(self, tenant_id: str, resource: str, amount: int = 1) -> bool:
+        """
+        한도 내인지 확인 (메모리만 조회, 사용량 변경 없음)
+
+        아직 적재되지 않은 테넌트는 허용합니다.
+        """
+        state = self._tenants.get(tenant_id)
+        if state is None:
+            return True
+        limit = self._limit(state, resource)
+        if limit is None:
+            return True
+        return self._used(state, resource) + amount <= limit
+
+    def remaining(self, tenant_id: str, resource: str) -> Optional[int]:
+        """남은 한도 (무제한/미적재: None)"""
+        state = self._tenants.get(tenant_id)
+        if state is None:
+            return None
+        limit = self._limit(state, resource)
+        if limit is None:
+            return None
+        return max(limit - self._used(state, resource), 0)
+
+    async def consume(self, tenant_id: str, resource: str, amount: int = 1) -> bool:
+        """한도 내이면 사용량을 증가시키고 True, 초과면 False"""
+        state = self._tenants.get(tenant_id) or await self.ensure(tenant_id)
+        limit = self._limit(state, resource)
+
+        if self.redis is not None:
+            value = await self._consume_script(
+                keys=[self._key(tenant_id, resource)],
+                args=[amount, -1 if limit is None else limit, self._ttl(resource)],
+            )
+            if value < 0:
+                return False
+            self._set_used(state, resource, value)
+            return True
+
+        if limit is not None and self._used(state, resource) + amount > limit:
+            return False
+        self._set_used(state, resource, self._used(state, resource) + amount)
+        return True
+
+    async def enforce(self, tenant_id: str, resource: str, amount: int = 1) -> None:
+        """사용량 증가, 한도 초과 시 QuotaExceededError"""
+        if not await self.consume(tenant_id, resource, amount):
+            state = self._tenants[tenant_id]
+            raise QuotaExceededError(resource, self._limit(state, resource))
+
+    async def release(self, tenant_id: str, resource: str, amount: int = 1) -> None:
+        """사용량 감소 (사용자 삭제, 생성 실패 롤백 등)"""
+        state = self._tenants.get(tenant_id)
+        if state is None:
+            return
+        if self.redis is not None:
+            value = await self._release_script(keys=[self._key(tenant_id, resource)], args=[amount])
+            self._set_used(state, resource, int(value))
+            return
+        self._set_used(state, resource, max(self._used(state, resource) - amount, 0))
+
+    def _limit(self, state: _TenantQuota, resource: str) -> Optional[int]:
+        try:
+            field, _ = RESOURCES[resource]
+        except KeyError:
+            raise ValueError(f"Unknown quota resource: {resource}")
+        limit = getattr(state.limits, field)
+        return None if limit is None or limit < 0 else limit
+
+    def _used(self, state: _TenantQuota, resource: str) -> int:
+        if resource == "api_calls":
+            today = _today()
+            if state.day != today:
+                state.day = today
+                state.api_calls = 0
+        return getattr(state, resource)
+
+    def _set_used(self, state: _TenantQuota, resource: str, value: int) -> None:
+        setattr(state, resource, value)
+
+    def _key(self, tenant_id: str, resource: str) -> str:
+        if RESOURCES[resource][1]:
+            return f"{self.key_prefix}:{tenant_id}:{resource}:{_today()}"
+        return f"{self.key_prefix}:{tenant_id}:{resource}"
+
+    def _ttl(self, resource: str) -> int:
+        # 일 단위 카운터는 이틀 뒤 만료
+        return 2 * 86400 if RESOURCES[resource][1] else 0
+
+    # =========================================================================
+    # 적재 / 재동기화
+    # =========================================================================
+
+    async def ensure(self, tenant_id: str) -> _TenantQuota:
+        """테넌트 상태 반환 (없으면 적재, 동시 요청은 1회만 적재)"""
+        state = self._tenants.get(tenant_id)
+        if state is not None:
+            return state
+
+        # 별도 태스크로 적재 (처음 요청한 쪽이 취소되어도 대기 중인 요청은 결과를 받음)
+        return await self._seeding.do(tenant_id, lambda: self.seed(tenant_id))
+
+    async def seed(self, tenant_id: str) -> _TenantQuota:
+        """DB에서 한도/사용량 적재"""
+        limits = await self._load_limits(tenant_id)
+        counts = await self.counts_loader(tenant_id) if self.counts_loader else {}
+
+        state = self._tenants.get(tenant_id)
+        if state is None:
+            state = self._tenants[tenant_id] = _TenantQuota(limits)
+        else:
+            state.limits = limits
+            state.seeded_at = time.monotonic()
+
+        for resource in ("users", "storage_mb"):
+            if resource in counts:
+                setattr(state, resource, int(counts[resource]))
+
+        if self.redis is not None:
+            await self._sync_redis(tenant_id, state, counts)
+        return state
+
+    async def _load_limits(self, tenant_id: str) -> QuotaLimits:
+        if self.db is None:
+            state = self._tenants.get(tenant_id)
+            return state.limits if state else QuotaLimits()
+
+        from sqlalchemy import select
+        from mt_paas.core.models import Subscription
+
+        async with self.db.get_central_session() as session:
+            result = await session.execute(
+                select(Subscription)
+                .where(Subscription.tenant_id == tenant_id)
+                .where(Subscription.is_active == True)
+                .order_by(Subscription.created_at.desc())
+                .limit(1)
+            )
+            subscription = result.scalar_one_or_none()
+        if subscription is None:
+            return QuotaLimits()
+        return QuotaLimits.from_subscription(subscription)
+
+    async def _sync_redis(self, tenant_id: str, state: _TenantQuota, counts: Dict[str, int]) -> None:
+        """DB 사용량을 Redis에 반영하고, Redis의 일 단위 카운터를 메모리에 반영"""
+        pipe = self.redis.pipeline()
+        for resource in ("users", "storage_mb"):
+            if resource in counts:
+                pipe.set(self._key(tenant_id, resource), int(counts[resource]))
+        pipe.get(self._key(tenant_id, "api_calls"))
+        results = await pipe.execute()
+        state.api_calls = int(results[-1] or 0)
+        state.day = _today()
+
+    async def reconcile(self) -> None:
+        """적재된 모든 테넌트를 DB 값으로 재동기화"""
+        for tenant_id in list(self._tenants):
+            try:
+                await self.seed(tenant_id)
+            except Exception as e:
+                logger.warning(f"Quota reconcile failed for {tenant_id}: {e}")
+
+    async def start(self) -> None:
+        """주기적 재동기화 시작"""
+        if self._task is None and self.reconcile_interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """주기적 재동기화 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            await self.reconcile()
+
+    # =========================================================================
+    # 생명주기 연동
+    # =========================================================================
+
+    def bind_lifecycle(self, lifecycle: Any) -> None:
+        """
+        TenantLifecycle 이벤트에 연결
+
+        활성화/정지 시 한도를 다시 적재하고, 삭제 시 상태를 제거합니다.
+        """
+        from mt_paas.core.lifecycle import LifecycleEvent
+
+        async def reload(tenant: Any, **kwargs) -> None:
+            if tenant.id in self._tenants:
+                await self.seed(tenant.id)
+
+        def forget(tenant_id: str, **kwargs) -> None:
+            self.forget_tenant(tenant_id)
+
+        lifecycle.on(LifecycleEvent.AFTER_ACTIVATE, reload)
+        lifecycle.on(LifecycleEvent.AFTER_SUSPEND, reload)
+        lifecycle.on(LifecycleEvent.AFTER_DELETE, forget)
+
+
+def counts_from_handler(handler: Any) -> Callable[[str], Awaitable[Dict[str, int]]]:
+    """
+    표준 API v2 핸들러의 list_users total로 사용자 수를 적재하는 counts_loader
+
+    create_standard_router_v2(handler, quota=quota)는 counts_loader가 없는 QuotaEngine에
+    자동으로 연결합니다.
+    """
+    from mt_paas.standard_api.models_v2 import UserFilters
+
+    async def load(tenant_id: str) -> Dict[str, int]:
+        try:
+            response = await handler.list_users(tenant_id, UserFilters(limit=1))
+        except TenantNotFoundError:
+            return {}
+        return {"users": response.total}
+
+    return load
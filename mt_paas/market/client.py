@@ -4,8 +4,9 @@ Service Market 클라이언트
 서비스들의 표준 API를 호출하는 클라이언트
 """
 
+import json
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 from dataclasses import dataclass
 import httpx
 
@@ -21,6 +22,32 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# 표준 사용량 필드 단위 (그 외 서비스별 숫자 필드는 "count")
+_USAGE_UNITS = {
+    "active_users": "users",
+    "total_sessions": "sessions",
+    "api_calls": "calls",
+    "ai_tokens": "tokens",
+    "storage_mb": "MB",
+}
+
+
+def _usage_report(service_id: str, data: Dict[str, Any], period: str) -> UsageReport:
+    """표준 API 사용량 응답(UsageResponse) → UsageReport (사용량 필드마다 UsageMetric 1개)"""
+    usage = data.get("usage") or {}
+    metrics = [
+        UsageMetric(name=name, value=value, unit=_USAGE_UNITS.get(name, "count"))
+        for name, value in usage.items()
+        if name != "total_cost" and isinstance(value, (int, float)) and not isinstance(value, bool)
+    ]
+    return UsageReport(
+        tenant_id=data.get("tenant_id", ""),
+        service_id=service_id,
+        period=data.get("period") or period,
+        metrics=metrics,
+        total_cost=usage.get("total_cost"),
+    )
+
 
 @dataclass
 class ServiceEndpoints:
@@ -31,6 +58,7 @@ class ServiceEndpoints:
     deactivate: str = "/mt/tenant/{tenant_id}/deactivate"
     status: str = "/mt/tenant/{tenant_id}/status"
     usage: str = "/mt/tenant/{tenant_id}/usage"
+    usage_export: str = "/mt/usage"
     billing_usage: str = "/mt/tenant/{tenant_id}/billing/usage"
     billing_detail: str = "/mt/tenant/{tenant_id}/billing/detail"
 
@@ -216,6 +244,50 @@ class ServiceClient:
             logger.error(f"Usage check failed: {e}")
             raise
 
+    async def stream_usage(
+        self,
+        period: str,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        전체 테넌트 사용량 스트리밍 조회 (GET /mt/usage, NDJSON)
+
+        테넌트마다 get_tenant_usage를 호출하는 대신 한 번의 요청으로
+        도착하는 대로 UsageResponse(dict)를 하나씩 반환합니다.
+
+        Args:
+            period: 조회 기간 (YYYY-MM)
+            timeout: 줄 사이 읽기 타임아웃 (기본: 클라이언트 timeout)
+
+        Raises:
+            RuntimeError: 서비스가 스트리밍 도중 오류 줄을 보낸 경우
+
+        Example:
+            async for usage in client.stream_usage("2026-01"):
+                print(usage["tenant_id"], usage["usage"]["api_calls"])
+        """
+        client = await self._get_client()
+        url = self._url(self.endpoints.usage_export)
+
+        try:
+            async with client.stream(
+                "GET",
+                url,
+                params={"period": period},
+                timeout=timeout or self.timeout
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    data = json.loads(line)
+                    if data.get("success") is False:
+                        raise RuntimeError(f"Usage export aborted: {data.get('message')}")
+                    yield data
+        except Exception as e:
+            logger.error(f"Usage export failed: {e}")
+            raise
+
     # =========================================================================
     # 빌링 API (3개)
     # =========================================================================
@@ -374,6 +446,16 @@ class ServiceMarketClient:
             preserve_data=deactivation.preserve_data,
         )
 
+    async def stream_service_usage(
+        self,
+        service_id: str,
+        period: str
+    ) -> AsyncIterator[UsageReport]:
+        """서비스의 전체 테넌트 사용량 스트리밍 조회 (월말 정산용)"""
+        client = self.get_service(service_id)
+        async for data in client.stream_usage(period):
+            yield _usage_report(service_id, data, period)
+
     async def get_all_usage(
         self,
         tenant_id: str,
@@ -384,13 +466,7 @@ class ServiceMarketClient:
         for service_id, client in self._services.items():
             try:
                 data = await client.get_tenant_usage(tenant_id, period)
-                results[service_id] = UsageReport(
-                    tenant_id=tenant_id,
-                    service_id=service_id,
-                    period=period,
-                    metrics=[],
-                    total_cost=data.get("usage", {}).get("total_cost")
-                )
+                results[service_id] = _usage_report(service_id, {"tenant_id": tenant_id, **data}, period)
             except Exception as e:
                 logger.warning(f"Usage fetch failed for {service_id}: {e}")
         return results
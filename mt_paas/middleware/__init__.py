@@ -3,10 +3,55 @@
 
 테넌트 컨텍스트 관리 미들웨어
 """
-from .tenant import TenantMiddleware, get_current_tenant, TenantContext
+from .tenant import TenantMiddleware, get_current_tenant, TenantContext, extract_tenant_id
+from .cache import TenantLookupCache
+from .known_tenants import KnownTenantFilter
+from .directory import SharedTenantDirectory, DirectoryRefresher, DirectoryEntry, write_directory
+from .rate_limit import RateLimitMiddleware, MemoryRateLimiter, RedisRateLimiter
+from .concurrency import ConcurrencyLimitMiddleware, FairScheduler, ConcurrencyLimitExceeded
+from .admission import AdmissionControlMiddleware, AdmissionController, AdmissionRejected
+from .metrics import MetricsMiddleware, RequestMetrics, create_metrics_router
+from .cpu import CPUAccountingMiddleware, CPUAccount, get_cpu_account, measure_cpu, run_in_threadpool
+from .cpu import instrument_threadpool
+from .memory import MemoryProfilingMiddleware, MemoryProfiler, create_memory_debug_router
+from .jwt_tenant import JWTTenantExtractor
+from .session import TenantDB, tenant_db, get_request_db, get_request_session
 
 __all__ = [
     "TenantMiddleware",
     "get_current_tenant",
     "TenantContext",
+    "extract_tenant_id",
+    "TenantLookupCache",
+    "KnownTenantFilter",
+    "SharedTenantDirectory",
+    "DirectoryRefresher",
+    "DirectoryEntry",
+    "write_directory",
+    "RateLimitMiddleware",
+    "MemoryRateLimiter",
+    "RedisRateLimiter",
+    "ConcurrencyLimitMiddleware",
+    "FairScheduler",
+    "ConcurrencyLimitExceeded",
+    "AdmissionControlMiddleware",
+    "AdmissionController",
+    "AdmissionRejected",
+    "MetricsMiddleware",
+    "RequestMetrics",
+    "create_metrics_router",
+    "CPUAccountingMiddleware",
+    "CPUAccount",
+    "get_cpu_account",
+    "measure_cpu",
+    "run_in_threadpool",
+    "instrument_threadpool",
+    "MemoryProfilingMiddleware",
+    "MemoryProfiler",
+    "create_memory_debug_router",
+    "JWTTenantExtractor",
+    "TenantDB",
+    "tenant_db",
+    "get_request_db",
+    "get_request_session",
 ]
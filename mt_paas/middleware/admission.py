@@ -0,0 +1,268 @@
+"""
+표준 API 전역 승인 제어 (부하 차단)
+
+과부하 시 표준 API(/mt/...) 요청을 모두 받아 결국 전부 타임아웃되는 대신,
+동시 처리 수를 제한하고 대기열 지연이 목표를 계속 넘으면 새 요청을 바로 503으로 거절합니다.
+
+CoDel 방식:
+- 요청이 대기열에서 슬롯을 받을 때까지 기다린 시간(sojourn)을 측정
+- sojourn이 target_delay를 interval 동안 계속 넘으면 "차단" 상태 → 새 요청 즉시 503
+- sojourn이 target_delay 아래로 내려가거나 대기열이 비면 차단 해제
+
+헬스체크와 라이프사이클 호출(activate/deactivate, auto-provision)은 우선 경로로,
+한도/대기열과 무관하게 항상 바로 처리되며 in_flight(일반 슬롯)에 포함되지 않습니다.
+"""
+
+import asyncio
+import math
+import re
+from collections import deque
+from time import monotonic
+from typing import Optional, Any, Dict, Deque, List, Tuple
+
+from starlette.responses import JSONResponse
+
+# 항상 승인하는 경로 (헬스체크, 라이프사이클)
+DEFAULT_PRIORITY_PATHS = [
+    r"^/mt/health$",
+    r"^/mt/tenant/[^/]+/(activate|deactivate)$",
+    r"^/api/tenant/webhook/",
+]
+
+
+class AdmissionRejected(Exception):
+    """과부하로 요청 거절"""
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(f"Service overloaded ({reason})")
+
+
+class AdmissionController:
+    """
+    CoDel 방식 승인 제어기
+
+    Example:
+        controller = AdmissionController(max_in_flight=128, target_delay=0.05)
+
+        async with controller.slot():
+            ...  # 요청 처리
+
+        controller.stats()
+        # {"in_flight": 128, "queued": 40, "dropping": True, "shed": 12, ...}
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 256,
+        target_delay: float = 0.05,
+        interval: float = 0.5,
+        max_queue: int = 1024,
+        max_wait: float = 5.0,
+    ):
+        """
+        Args:
+            max_in_flight: 동시 처리 수 (우선 경로 제외)
+            target_delay: 허용 대기열 지연 (초)
+            interval: 지연이 target_delay를 이 시간 동안 계속 넘으면 차단 시작 (초)
+            max_queue: 최대 대기 요청 수
+            max_wait: 대기 최대 시간 (초, 넘으면 503)
+        """
+        self.max_in_flight = max_in_flight
+        self.target_delay = target_delay
+        self.interval = interval
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self.in_flight = 0
+        # 우선 경로 처리 중 수 (max_in_flight와 별도)
+        self.priority_in_flight = 0
+        self._queue: Deque[Tuple[asyncio.Future, float]] = deque()
+
+        # CoDel 상태
+        self.dropping = False
+        self._first_above: Optional[float] = None
+        self.last_sojourn = 0.0
+
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+
+    # =========================================================================
+    # 승인/반환
+    # =========================================================================
+
+    async def acquire(self, priority: bool = False) -> None:
+        """슬롯 획득 (과부하 시 AdmissionRejected, 우선 요청은 한도와 무관하게 바로 승인)"""
+        if priority:
+            self.priority_in_flight += 1
+            self.admitted += 1
+            return
+
+        if self.in_flight < self.max_in_flight and not self._queue:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        # 슬롯이 오래 반환되지 않아도 감지되도록 맨 앞 대기 요청의 대기 시간도 반영
+        if self._queue:
+            now = monotonic()
+            head_wait = now - self._queue[0][1]
+            if head_wait > self.target_delay:
+                self._observe(head_wait, now)
+
+        if self.dropping:
+            self.shed += 1
+            raise AdmissionRejected("queue delay above target")
+        if len(self._queue) >= self.max_queue:
+            self.shed += 1
+            raise AdmissionRejected("queue full")
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (future, monotonic())
+        self._queue.append(entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # 타임아웃과 동시에 슬롯이 배정된 경우 반환
+                self.release()
+            else:
+                future.cancel()
+                try:
+                    self._queue.remove(entry)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.timed_out += 1
+            # 최대 대기 시간을 넘긴 것 자체가 지연 초과 신호
+            self._observe(monotonic() - entry[1], monotonic())
+            raise AdmissionRejected("wait timeout")
+        self.admitted += 1
+
+    def release(self, priority: bool = False) -> None:
+        """슬롯 반환 후 대기 요청에 배정 (acquire와 같은 priority로 호출)"""
+        if priority:
+            if self.priority_in_flight > 0:
+                self.priority_in_flight -= 1
+            return
+        if self.in_flight > 0:
+            self.in_flight -= 1
+        queue = self._queue
+        while queue and self.in_flight < self.max_in_flight:
+            future, enqueued = queue.popleft()
+            if future.done():
+                continue
+            now = monotonic()
+            self._observe(now - enqueued, now)
+            self.in_flight += 1
+            future.set_result(None)
+        if not queue:
+            self.dropping = False
+            self._first_above = None
+
+    def slot(self, priority: bool = False) -> "_AdmissionSlot":
+        """async with 용 슬롯"""
+        return _AdmissionSlot(self, priority)
+
+    def _observe(self, sojourn: float, now: float) -> None:
+        """대기 시간 반영 (CoDel 상태 갱신)"""
+        self.last_sojourn = sojourn
+        if sojourn <= self.target_delay:
+            self._first_above = None
+            self.dropping = False
+        elif self._first_above is None:
+            self._first_above = now + self.interval
+        elif now >= self._first_above:
+            self.dropping = True
+
+    def stats(self) -> Dict[str, Any]:
+        """처리 중 수/대기열/차단 상태"""
+        return {
+            "in_flight": self.in_flight,
+            "priority_in_flight": self.priority_in_flight,
+            "queued": len(self._queue),
+            "dropping": self.dropping,
+            "last_sojourn_ms": round(self.last_sojourn * 1000, 3),
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timed_out": self.timed_out,
+        }
+
+
+class _AdmissionSlot:
+    __slots__ = ("controller", "priority")
+
+    def __init__(self, controller: AdmissionController, priority: bool):
+        self.controller = controller
+        self.priority = priority
+
+    async def __aenter__(self) -> None:
+        await self.controller.acquire(self.priority)
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.controller.release(self.priority)
+
+
+class AdmissionControlMiddleware:
+    """
+    표준 API 승인 제어 미들웨어 (순수 ASGI)
+
+    테넌트 조회 전에 거절해야 과부하 중 DB 부담이 늘지 않으므로
+    가장 바깥(마지막으로 add_middleware)에 둡니다.
+
+    Example:
+        app.add_middleware(TenantMiddleware, tenant_lookup=my_lookup)
+        app.add_middleware(AdmissionControlMiddleware, max_in_flight=128)
+    """
+
+    def __init__(
+        self,
+        app,
+        controller: Optional[AdmissionController] = None,
+        path_prefixes: Optional[List[str]] = None,
+        priority_paths: Optional[List[str]] = None,
+        retry_after: int = 1,
+        **controller_options,
+    ):
+        """
+        Args:
+            app: ASGI 앱
+            controller: 공유할 AdmissionController (없으면 controller_options로 생성)
+            path_prefixes: 승인 제어 대상 경로 prefix (기본: 표준 API /mt/, /api/tenant/)
+            priority_paths: 항상 승인할 경로 정규식 (기본: 헬스체크, 라이프사이클)
+            retry_after: 503 응답의 Retry-After (초)
+        """
+        self.app = app
+        self.controller = controller or AdmissionController(**controller_options)
+        self._prefixes = tuple(path_prefixes or ["/mt/", "/api/tenant/"])
+        self._priority = [re.compile(p) for p in (priority_paths or DEFAULT_PRIORITY_PATHS)]
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self._prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        priority = any(pattern.match(path) for pattern in self._priority)
+        controller = self.controller
+        try:
+            await controller.acquire(priority)
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "success": False,
+                    "error": "OVERLOADED",
+                    "message": str(e),
+                },
+                headers={"Retry-After": str(max(math.ceil(self.retry_after), 1))},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(priority)
@@ -0,0 +1,129 @@
+"""
+테넌트 조회 캐시
+
+TenantMiddleware의 tenant_lookup 결과를 TTL/최대 크기 제한으로 캐시합니다.
+없는 테넌트(조회 결과 None)도 짧은 TTL로 캐시하여, 잘못된 서브도메인이나
+임의 테넌트 ID 요청이 매번 중앙 DB까지 가지 않도록 합니다.
+"""
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Awaitable, Tuple
+
+from mt_paas.core.loader import SingleFlight
+
+# 캐시 미스 표시
+_MISS = object()
+
+
+class TenantLookupCache:
+    """
+    테넌트 조회 결과 LRU + TTL 캐시
+
+    Example:
+        cache = TenantLookupCache(ttl=60, negative_ttl=10)
+        cache.bind_lifecycle(lifecycle)
+
+        app.add_middleware(
+            TenantMiddleware,
+            tenant_lookup=my_lookup,
+            lookup_cache=cache,
+        )
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        negative_ttl: float = 10,
+        max_size: int = 10000,
+    ):
+        """
+        Args:
+            ttl: 조회 성공 결과 유지 시간 (초, 0이면 없는 테넌트 결과만 캐시)
+            negative_ttl: 없는/비활성 테넌트 결과 유지 시간 (초, 0이면 캐시 안 함)
+            max_size: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+
+        # {tenant_id: (만료 시각, 조회 결과)}
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight = SingleFlight()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, tenant_id: str) -> Any:
+        """캐시된 조회 결과 (None 포함), 없거나 만료되면 _MISS"""
+        entry = self._entries.get(tenant_id)
+        if entry is None:
+            return _MISS
+        if entry[0] <= monotonic():
+            del self._entries[tenant_id]
+            return _MISS
+        self._entries.move_to_end(tenant_id)
+        return entry[1]
+
+    def set(self, tenant_id: str, value: Any) -> None:
+        """조회 결과 저장 (None이면 negative_ttl 적용)"""
+        ttl = self.ttl if value is not None else self.negative_ttl
+        if ttl <= 0:
+            self._entries.pop(tenant_id, None)
+            return
+        self._entries[tenant_id] = (monotonic() + ttl, value)
+        self._entries.move_to_end(tenant_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def lookup(
+        self,
+        tenant_id: str,
+        loader: Callable[[str], Awaitable[Any]],
+    ) -> Any:
+        """
+        캐시를 거친 조회
+
+        캐시에 없으면 loader를 호출하고 결과를 저장합니다.
+        같은 테넌트에 대한 동시 미스는 loader를 한 번만 호출합니다.
+        loader는 별도 태스크로 실행되므로 처음 요청한 쪽이 취소(연결 종료)되어도
+        함께 기다리던 요청은 결과를 받습니다.
+        loader가 예외를 던지면 캐시하지 않습니다.
+        """
+        value = self.get(tenant_id)
+        if value is not _MISS:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        return await self._inflight.do(
+            tenant_id,
+            lambda: loader(tenant_id),
+            on_result=lambda value: self.set(tenant_id, value),
+        )
+
+    def invalidate(self, tenant_id: str) -> None:
+        """테넌트 항목 제거 (진행 중인 조회 결과도 저장하지 않음)"""
+        self._entries.pop(tenant_id, None)
+        self._inflight.forget(tenant_id)
+
+    def clear(self) -> None:
+        """전체 항목 제거"""
+        self._entries.clear()
+        self._inflight.clear()
+
+    # =========================================================================
+    # 생명주기 연동
+    # =========================================================================
+
+    def bind_lifecycle(self, lifecycle: Any) -> None:
+        """
+        TenantLifecycle 이벤트에 연결
+
+        생성/프로비저닝/활성화/정지/삭제 후 해당 테넌트 항목을 무효화합니다.
+        (생성 직후에는 이전에 캐시된 "없는 테넌트" 결과가 제거됩니다)
+        """
+        lifecycle.on_change(self.invalidate)
@@ -0,0 +1,287 @@
+"""
+테넌트별 동시 처리 제한 (가중 공정 스케줄링)
+
+긴 RAG/LLM 요청을 보내는 테넌트 하나가 모든 워커 슬롯을 차지하지 않도록,
+테넌트마다 동시 처리 수(in-flight)를 요금제별로 제한하고 전체 슬롯이 모자랄 때는
+요금제 가중치에 비례해 공정하게 슬롯을 나눕니다.
+
+- 테넌트 한도/전체 한도를 넘는 요청은 테넌트별 대기열에서 기다림
+- 대기 시간이 max_wait를 넘거나 대기열이 가득 차면 503
+- 슬롯이 비면 (처리 중 수 / 가중치)가 가장 작은 테넌트의 대기 요청부터 처리
+"""
+
+import asyncio
+from collections import deque
+from time import monotonic
+from typing import Optional, Any, Dict, Deque
+
+from starlette.responses import JSONResponse
+
+from .tenant import _current_tenant
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """대기 시간 초과 또는 대기열 초과"""
+    def __init__(self, tenant_id: str, reason: str):
+        self.tenant_id = tenant_id
+        self.reason = reason
+        super().__init__(f"Concurrency limit exceeded for {tenant_id} ({reason})")
+
+
+class _TenantSlots:
+    """테넌트 1개의 처리 중 수/대기열/통계"""
+    __slots__ = (
+        "limit", "in_flight", "waiters",
+        "max_queue_depth", "waited", "wait_seconds", "max_wait_seconds", "rejected",
+    )
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.max_queue_depth = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.rejected = 0
+
+
+class FairScheduler:
+    """
+    테넌트별 가중 공정 동시 처리 스케줄러
+
+    요금제별 한도(by_plan)는 테넌트 동시 처리 상한이자 공정 분배 가중치입니다.
+
+    Example:
+        scheduler = FairScheduler(max_concurrency=64)
+
+        async with scheduler.slot("hallym_univ", "premium"):
+            ...  # 요청 처리
+
+        scheduler.stats()["hallym_univ"]
+        # {"in_flight": 3, "queued": 0, "max_queue_depth": 5, "avg_wait_ms": 12.4, ...}
+    """
+
+    DEFAULT_BY_PLAN = {
+        "free": 2,
+        "basic": 4,
+        "standard": 8,
+        "premium": 16,
+        "enterprise": 32,
+    }
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        by_plan: Optional[Dict[str, int]] = None,
+        default_limit: int = 4,
+        max_wait: float = 10.0,
+        max_queue_per_tenant: int = 100,
+    ):
+        """
+        Args:
+            max_concurrency: 전체 동시 처리 수
+            by_plan: 요금제별 테넌트 동시 처리 수 (가중치로도 사용)
+            default_limit: by_plan에 없는 요금제의 동시 처리 수
+            max_wait: 대기 최대 시간 (초)
+            max_queue_per_tenant: 테넌트별 최대 대기 요청 수
+        """
+        self.max_concurrency = max_concurrency
+        self.by_plan = by_plan or dict(self.DEFAULT_BY_PLAN)
+        self.default_limit = default_limit
+        self.max_wait = max_wait
+        self.max_queue_per_tenant = max_queue_per_tenant
+
+        self.in_flight = 0
+        self._tenants: Dict[str, _TenantSlots] = {}
+        # 대기 요청이 있는 테넌트
+        self._waiting: Dict[str, _TenantSlots] = {}
+
+    # =========================================================================
+    # 슬롯 획득/반환
+    # =========================================================================
+
+    async def acquire(self, tenant_id: str, plan: str = "basic") -> None:
+        """슬롯 획득 (대기 초과 시 ConcurrencyLimitExceeded)"""
+        limit = self.by_plan.get(plan, self.default_limit)
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            tenant = self._tenants[tenant_id] = _TenantSlots(limit)
+        else:
+            tenant.limit = limit
+
+        # 대기 중인 요청이 없고 여유가 있으면 바로 처리
+        if not tenant.waiters and tenant.in_flight < limit and self.in_flight < self.max_concurrency:
+            tenant.in_flight += 1
+            self.in_flight += 1
+            return
+
+        if len(tenant.waiters) >= self.max_queue_per_tenant:
+            tenant.rejected += 1
+            raise ConcurrencyLimitExceeded(tenant_id, "queue full")
+
+        future = asyncio.get_running_loop().create_future()
+        tenant.waiters.append(future)
+        self._waiting[tenant_id] = tenant
+        if len(tenant.waiters) > tenant.max_queue_depth:
+            tenant.max_queue_depth = len(tenant.waiters)
+
+        started = monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # 타임아웃과 동시에 슬롯이 배정된 경우 반환
+                self.release(tenant_id)
+            else:
+                future.cancel()
+                self._discard_waiter(tenant_id, tenant, future)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            tenant.rejected += 1
+            raise ConcurrencyLimitExceeded(tenant_id, "wait timeout")
+        finally:
+            waited = monotonic() - started
+            tenant.waited += 1
+            tenant.wait_seconds += waited
+            if waited > tenant.max_wait_seconds:
+                tenant.max_wait_seconds = waited
+
+    def release(self, tenant_id: str) -> None:
+        """슬롯 반환 후 대기 요청에 배정"""
+        tenant = self._tenants.get(tenant_id)
+        if tenant is not None and tenant.in_flight > 0:
+            tenant.in_flight -= 1
+            self.in_flight -= 1
+        self._dispatch()
+
+    def slot(self, tenant_id: str, plan: str = "basic") -> "_Slot":
+        """async with 용 슬롯"""
+        return _Slot(self, tenant_id, plan)
+
+    def _dispatch(self) -> None:
+        """빈 슬롯을 (처리 중 수 / 가중치)가 가장 작은 테넌트 대기 요청에 배정"""
+        waiting = self._waiting
+        while waiting and self.in_flight < self.max_concurrency:
+            best_id = None
+            best_share = None
+            for tenant_id, tenant in waiting.items():
+                if tenant.in_flight >= tenant.limit:
+                    continue
+                share = tenant.in_flight / tenant.limit
+                if best_share is None or share < best_share:
+                    best_id, best_share = tenant_id, share
+            if best_id is None:
+                return
+
+            tenant = waiting[best_id]
+            future = tenant.waiters.popleft()
+            if not tenant.waiters:
+                del waiting[best_id]
+            if future.done():
+                continue
+            tenant.in_flight += 1
+            self.in_flight += 1
+            future.set_result(None)
+
+    def _discard_waiter(self, tenant_id: str, tenant: _TenantSlots, future: asyncio.Future) -> None:
+        try:
+            tenant.waiters.remove(future)
+        except ValueError:
+            pass
+        if not tenant.waiters:
+            self._waiting.pop(tenant_id, None)
+
+    # =========================================================================
+    # 통계
+    # =========================================================================
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """테넌트별 처리 중 수/대기열 깊이/대기 시간"""
+        return {
+            tenant_id: {
+                "limit": tenant.limit,
+                "in_flight": tenant.in_flight,
+                "queued": len(tenant.waiters),
+                "max_queue_depth": tenant.max_queue_depth,
+                "waited": tenant.waited,
+                "avg_wait_ms": round(tenant.wait_seconds / tenant.waited * 1000, 3) if tenant.waited else 0.0,
+                "max_wait_ms": round(tenant.max_wait_seconds * 1000, 3),
+                "rejected": tenant.rejected,
+            }
+            for tenant_id, tenant in self._tenants.items()
+        }
+
+    def forget_tenant(self, tenant_id: str) -> None:
+        """처리 중/대기 요청이 없는 테넌트 통계 제거"""
+        tenant = self._tenants.get(tenant_id)
+        if tenant is not None and not tenant.in_flight and not tenant.waiters:
+            del self._tenants[tenant_id]
+
+
+class _Slot:
+    __slots__ = ("scheduler", "tenant_id", "plan")
+
+    def __init__(self, scheduler: FairScheduler, tenant_id: str, plan: str):
+        self.scheduler = scheduler
+        self.tenant_id = tenant_id
+        self.plan = plan
+
+    async def __aenter__(self) -> None:
+        await self.scheduler.acquire(self.tenant_id, self.plan)
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.scheduler.release(self.tenant_id)
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    테넌트별 동시 처리 제한 미들웨어 (순수 ASGI)
+
+    TenantMiddleware 안쪽에서 실행되어야 하므로 TenantMiddleware보다 먼저 추가합니다.
+
+    Example:
+        scheduler = FairScheduler(max_concurrency=64)
+        app.add_middleware(ConcurrencyLimitMiddleware, scheduler=scheduler)
+        app.add_middleware(TenantMiddleware, tenant_lookup=my_lookup)
+    """
+
+    def __init__(self, app, scheduler: Optional[FairScheduler] = None, **scheduler_options):
+        """
+        Args:
+            app: ASGI 앱
+            scheduler: 공유할 FairScheduler (없으면 scheduler_options로 생성)
+        """
+        self.app = app
+        self.scheduler = scheduler or FairScheduler(**scheduler_options)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = _current_tenant.get()
+        if context is None:
+            await self.app(scope, receive, send)
+            return
+
+        scheduler = self.scheduler
+        try:
+            await scheduler.acquire(context.tenant_id, context.plan)
+        except ConcurrencyLimitExceeded as e:
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "success": False,
+                    "error": "CONCURRENCY_LIMITED",
+                    "message": str(e),
+                },
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            scheduler.release(context.tenant_id)
@@ -0,0 +1,195 @@
+"""
+테넌트별 CPU 시간 계측
+
+요청을 처리하는 코루틴이 실제로 실행된 구간(스텝)마다 스레드 CPU 시간(thread_time)
+차이를 재서 현재 테넌트에 귀속합니다. 이벤트 루프에서 다른 요청과 번갈아 실행되어도
+자기 스텝만 합산되므로, 핸들러 전후 시각 차이와 달리 다른 요청의 CPU가 섞이지 않습니다.
+
+- 스레드 풀 작업(FastAPI 동기 엔드포인트/의존성, starlette run_in_threadpool 등
+  anyio.to_thread.run_sync를 거치는 작업)은 instrument_threadpool()로 작업 스레드의
+  CPU 시간도 합산 (CPUAccountingMiddleware가 설치, 계측 중이 아닌 호출은 그대로 통과)
+- 직접 만든 스레드/ThreadPoolExecutor, loop.run_in_executor 작업은 포함되지 않음
+- 요청이 끝나면 UsageRecorder에 "cpu_ms", RequestMetrics에 테넌트별 CPU 초로 반영
+- 요청에서 따로 만든 태스크(asyncio.create_task)는 포함되지 않음
+"""
+
+import functools
+import threading
+import types
+
+import anyio.to_thread
+from contextvars import ContextVar
+from time import thread_time
+from typing import Optional, Any, Callable, TypeVar
+
+from starlette.concurrency import run_in_threadpool as _starlette_run_in_threadpool
+
+from .tenant import _current_tenant
+
+T = TypeVar("T")
+
+
+class CPUAccount:
+    """요청 1건의 CPU 시간 (초)"""
+    __slots__ = ("tenant_id", "loop_seconds", "thread_seconds", "_lock")
+
+    def __init__(self, tenant_id: str):
+        self.tenant_id = tenant_id
+        # 이벤트 루프 스레드에서 사용한 시간
+        self.loop_seconds = 0.0
+        # 스레드 풀 작업에서 사용한 시간 (여러 스레드에서 더할 수 있으므로 락)
+        self.thread_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def seconds(self) -> float:
+        return self.loop_seconds + self.thread_seconds
+
+    def add_thread_time(self, seconds: float) -> None:
+        with self._lock:
+            self.thread_seconds += seconds
+
+
+_cpu_account: ContextVar[Optional[CPUAccount]] = ContextVar("cpu_account", default=None)
+
+
+def get_cpu_account() -> Optional[CPUAccount]:
+    """현재 요청의 CPU 계정 (계측 중이 아니면 None)"""
+    return _cpu_account.get()
+
+
+@types.coroutine
+def measure_cpu(coro, account: CPUAccount):
+    """
+    코루틴을 스텝 단위로 실행하며 각 스텝의 스레드 CPU 시간을 account에 합산
+
+    Example:
+        account = CPUAccount("hallym_univ")
+        result = await measure_cpu(handle(request), account)
+    """
+    value = None
+    error = None
+    clock = thread_time
+    while True:
+        started = clock()
+        try:
+            if error is None:
+                yielded = coro.send(value)
+            else:
+                yielded = coro.throw(error)
+        except StopIteration as e:
+            account.loop_seconds += clock() - started
+            return e.value
+        except BaseException:
+            account.loop_seconds += clock() - started
+            raise
+        account.loop_seconds += clock() - started
+
+        value = error = None
+        try:
+            value = yield yielded
+        except GeneratorExit:
+            coro.close()
+            raise
+        except BaseException as e:
+            error = e
+
+
+def _timed(func: Callable[..., T], account: CPUAccount) -> Callable[..., T]:
+    """작업 스레드에서 func 실행 시간(thread_time)을 account에 합산하는 래퍼"""
+    @functools.wraps(func)
+    def timed(*args: Any, **kwargs: Any) -> T:
+        started = thread_time()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            account.add_thread_time(thread_time() - started)
+
+    return timed
+
+
+_original_run_sync: Optional[Callable[..., Any]] = None
+
+
+def instrument_threadpool() -> None:
+    """
+    anyio.to_thread.run_sync를 감싸 스레드 풀 작업의 CPU 시간을 현재 요청에 합산
+
+    FastAPI/Starlette가 동기 엔드포인트와 의존성을 실행하는 경로입니다.
+    프로세스 전역 패치이며 여러 번 호출해도 한 번만 적용됩니다.
+    """
+    global _original_run_sync
+    if _original_run_sync is not None:
+        return
+    original = _original_run_sync = anyio.to_thread.run_sync
+
+    async def run_sync(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        account = _cpu_account.get()
+        if account is not None:
+            func = _timed(func, account)
+        return await original(func, *args, **kwargs)
+
+    anyio.to_thread.run_sync = run_sync
+
+
+async def run_in_threadpool(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    스레드 풀에서 실행하고 작업 스레드의 CPU 시간을 현재 요청에 합산
+
+    starlette.concurrency.run_in_threadpool과 같은 방식으로 사용합니다.
+    instrument_threadpool()이 적용되어 있으면 starlette 것과 동일합니다.
+
+    Example:
+        text = await run_in_threadpool(extract_pdf_text, data)
+    """
+    account = _cpu_account.get()
+    if account is None or _original_run_sync is not None:
+        return await _starlette_run_in_threadpool(func, *args, **kwargs)
+    return await _starlette_run_in_threadpool(_timed(func, account), *args, **kwargs)
+
+
+class CPUAccountingMiddleware:
+    """
+    테넌트별 CPU 시간 계측 미들웨어 (순수 ASGI)
+
+    TenantMiddleware 안쪽에서 실행되어야 하므로 TenantMiddleware보다 먼저 추가합니다.
+    생성 시 instrument_threadpool()을 적용하여 동기 엔드포인트의 CPU 시간도 합산합니다.
+
+    Example:
+        app.add_middleware(CPUAccountingMiddleware, recorder=mt.usage, metrics=mt.metrics)
+        app.add_middleware(TenantMiddleware, tenant_lookup=my_lookup)
+    """
+
+    def __init__(self, app, recorder: Optional[Any] = None, metrics: Optional[Any] = None):
+        """
+        Args:
+            app: ASGI 앱
+            recorder: 요청마다 "cpu_ms"를 기록할 UsageRecorder
+            metrics: 테넌트별 CPU 시간을 노출할 RequestMetrics
+        """
+        self.app = app
+        self.recorder = recorder
+        self.metrics = metrics
+        instrument_threadpool()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = _current_tenant.get()
+        if context is None:
+            await self.app(scope, receive, send)
+            return
+
+        account = CPUAccount(context.tenant_id)
+        token = _cpu_account.set(account)
+        try:
+            await measure_cpu(self.app(scope, receive, send), account)
+        finally:
+            _cpu_account.reset(token)
+            seconds = account.seconds
+            if self.recorder is not None:
+                self.recorder.record(context.tenant_id, "cpu_ms", seconds * 1000)
+            if self.metrics is not None:
+                self.metrics.observe_cpu(context.tenant_id, seconds)
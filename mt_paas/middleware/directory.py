@@ -0,0 +1,419 @@
+"""
+워커 공유 테넌트 디렉터리 (메모리 맵 파일)
+
+uvicorn 워커마다 테넌트 캐시를 따로 두면 워커 수만큼 메모리와 워밍업 쿼리가 늘어납니다.
+테넌트 ID → 상태/요금제/기능 비트셋/설정을 고정 크기 해시 테이블 파일 하나에 기록하고,
+모든 워커가 같은 파일을 mmap해서 읽습니다 (페이지 캐시 1벌 공유).
+
+- 쓰기: 갱신 담당 1개 프로세스가 새 파일을 만든 뒤 os.replace로 원자 교체
+- 읽기: 락 없이 mmap에서 바로 조회 (복사 없이 memoryview 비교/unpack)
+- 교체 감지: check_interval마다 파일 inode/mtime 확인 후 새 파일을 다시 매핑
+  (이전 매핑은 참조가 사라질 때 해제되므로 읽는 도중에 교체되어도 안전)
+- 갱신 담당 선출: 잠금 파일 flock (담당 워커가 죽으면 다른 워커가 이어받음)
+
+파일 형식 (little-endian):
+    헤더 40B   magic(8) generation(Q) count(I) slots(I) feature_words(I) meta_off(I) meta_len(I) strings_off(I)
+    슬롯       key(Q) id_off(I) id_len(H) status(B) plan(B) config_off(I) config_len(I) features(Q × feature_words)
+    문자열     테넌트 ID, 설정 JSON
+    메타 JSON  {"statuses": [...], "plans": [...], "features": [...], "built_at": ...}
+"""
+
+import asyncio
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from hashlib import blake2b
+from typing import Optional, Any, Dict, Iterable, NamedTuple, Callable, Awaitable
+
+from .tenant import TenantContext
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MTDIR\x00\x00\x01"
+_HEADER = struct.Struct("<8sQIIIIII")
+_SLOT_BASE = "<QIHBBII"
+
+
+class DirectoryEntry(NamedTuple):
+    """테넌트 디렉터리 항목"""
+    tenant_id: str
+    status: str
+    plan: str = "basic"
+    features: Optional[Dict[str, bool]] = None
+    config: Optional[Dict[str, Any]] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status == "active"
+
+    def to_context(self) -> TenantContext:
+        """TenantContext로 변환"""
+        return TenantContext(
+            tenant_id=self.tenant_id,
+            plan=self.plan,
+            features=self.features,
+            config=self.config,
+        )
+
+
+def _key(tenant_id: bytes) -> int:
+    key = int.from_bytes(blake2b(tenant_id, digest_size=8).digest(), "little")
+    return key or 1
+
+
+def write_directory(path: str, entries: Iterable[DirectoryEntry], generation: Optional[int] = None) -> int:
+    """
+    디렉터리 파일 작성 (같은 디렉터리의 임시 파일에 쓴 뒤 원자 교체)
+
+    Returns:
+        기록한 세대 번호
+    """
+    entries = list(entries)
+    statuses: Dict[str, int] = {}
+    plans: Dict[str, int] = {}
+    features: Dict[str, int] = {}
+    for entry in entries:
+        statuses.setdefault(entry.status, len(statuses))
+        plans.setdefault(entry.plan, len(plans))
+        for name in entry.features or {}:
+            features.setdefault(name, len(features))
+    if len(statuses) > 255 or len(plans) > 255:
+        raise ValueError("Too many distinct statuses/plans for tenant directory")
+
+    feature_words = max(1, (len(features) + 63) // 64)
+    slot = struct.Struct(_SLOT_BASE + "Q" * feature_words)
+    slot_count = 8
+    while slot_count < len(entries) * 2:
+        slot_count *= 2
+    mask = slot_count - 1
+
+    slots_off = _HEADER.size
+    strings_off = slots_off + slot_count * slot.size
+    table = bytearray(strings_off)
+    strings = bytearray()
+
+    for entry in entries:
+        tenant_id = entry.tenant_id.encode("utf-8")
+        id_off = strings_off + len(strings)
+        strings += tenant_id
+        config_off, config_len = 0, 0
+        if entry.config:
+            blob = json.dumps(entry.config, separators=(",", ":")).encode("utf-8")
+            config_off, config_len = strings_off + len(strings), len(blob)
+            strings += blob
+
+        words = [0] * feature_words
+        for name, enabled in (entry.features or {}).items():
+            if enabled:
+                bit = features[name]
+                words[bit >> 6] |= 1 << (bit & 63)
+
+        key = _key(tenant_id)
+        index = key & mask
+        while struct.unpack_from("<Q", table, slots_off + index * slot.size)[0]:
+            index = (index + 1) & mask
+        slot.pack_into(
+            table, slots_off + index * slot.size,
+            key, id_off, len(tenant_id), statuses[entry.status], plans[entry.plan],
+            config_off, config_len, *words,
+        )
+
+    if generation is None:
+        generation = time.time_ns()
+    meta = json.dumps({
+        "statuses": list(statuses),
+        "plans": list(plans),
+        "features": list(features),
+        "built_at": time.time(),
+    }).encode("utf-8")
+    meta_off = strings_off + len(strings)
+    _HEADER.pack_into(
+        table, 0, MAGIC, generation, len(entries), slot_count, feature_words, meta_off, len(meta), strings_off,
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(table)
+        f.write(strings)
+        f.write(meta)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return generation
+
+
+class _Mapping:
+    """매핑된 디렉터리 파일 1개 (교체 시 통째로 바꿔 끼움)"""
+    __slots__ = (
+        "view", "generation", "count", "mask", "slot", "slots_off",
+        "statuses", "plans", "features", "stat_key", "_configs",
+    )
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm)
+        magic, generation, count, slot_count, feature_words, meta_off, meta_len, _ = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a tenant directory file: {path}")
+        meta = json.loads(bytes(view[meta_off:meta_off + meta_len]))
+
+        self.view = view
+        self.generation = generation
+        self.count = count
+        self.mask = slot_count - 1
+        self.slot = struct.Struct(_SLOT_BASE + "Q" * feature_words)
+        self.slots_off = _HEADER.size
+        self.statuses = meta["statuses"]
+        self.plans = meta["plans"]
+        self.features = meta["features"]
+        self.stat_key = (stat.st_ino, stat.st_mtime_ns)
+        # {config_off: 설정} - 조회된 테넌트만 1회 디코딩 (매핑 교체 시 함께 버림)
+        self._configs: Dict[int, Dict[str, Any]] = {}
+
+    def get(self, tenant_id: str) -> Optional[DirectoryEntry]:
+        raw = tenant_id.encode("utf-8")
+        key = _key(raw)
+        view, slot, base = self.view, self.slot, self.slots_off
+        index = key & self.mask
+        while True:
+            fields = slot.unpack_from(view, base + index * slot.size)
+            if not fields[0]:
+                return None
+            if fields[0] == key:
+                id_off, id_len = fields[1], fields[2]
+                if id_len == len(raw) and view[id_off:id_off + id_len] == raw:
+                    return self._decode(tenant_id, fields)
+            index = (index + 1) & self.mask
+
+    def _decode(self, tenant_id: str, fields: tuple) -> DirectoryEntry:
+        config_off, config_len = fields[5], fields[6]
+        if config_len:
+            config = self._configs.get(config_off)
+            if config is None:
+                config = self._configs[config_off] = json.loads(bytes(self.view[config_off:config_off + config_len]))
+        else:
+            config = {}
+        features = {}
+        for word_index, word in enumerate(fields[7:]):
+            while word:
+                low = word & -word
+                features[self.features[(word_index << 6) + low.bit_length() - 1]] = True
+                word ^= low
+        return DirectoryEntry(
+            tenant_id=tenant_id,
+            status=self.statuses[fields[3]],
+            plan=self.plans[fields[4]],
+            features=features,
+            config=config,
+        )
+
+
+class SharedTenantDirectory:
+    """
+    공유 테넌트 디렉터리 읽기
+
+    Example:
+        directory = SharedTenantDirectory("/dev/shm/mt_paas_tenants.dir")
+
+        entry = directory.get("hallym_univ")
+        if entry and entry.is_active:
+            entry.plan, entry.features
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        """
+        Args:
+            path: 디렉터리 파일 경로 (/dev/shm 아래면 디스크 I/O 없음)
+            check_interval: 파일 교체 확인 간격 (초)
+        """
+        self.path = path
+        self.check_interval = check_interval
+        self._mapping: Optional[_Mapping] = None
+        self._next_check = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """매핑된 파일이 있는지"""
+        self._maybe_reload()
+        return self._mapping is not None
+
+    @property
+    def generation(self) -> int:
+        """현재 매핑의 세대 번호 (없으면 0)"""
+        return self._mapping.generation if self._mapping is not None else 0
+
+    def __len__(self) -> int:
+        return self._mapping.count if self._mapping is not None else 0
+
+    def get(self, tenant_id: str) -> Optional[DirectoryEntry]:
+        """테넌트 항목 조회 (없거나 파일이 아직 없으면 None)"""
+        self._maybe_reload()
+        mapping = self._mapping
+        if mapping is None:
+            return None
+        return mapping.get(tenant_id)
+
+    def reload(self) -> bool:
+        """파일이 교체되었으면 다시 매핑 (교체 여부 반환)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        mapping = self._mapping
+        if mapping is not None and mapping.stat_key == (stat.st_ino, stat.st_mtime_ns):
+            return False
+        try:
+            self._mapping = _Mapping(self.path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Tenant directory reload failed: {e}")
+            return False
+        return True
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.check_interval
+            self.reload()
+
+
+class DirectoryRefresher:
+    """
+    디렉터리 파일 갱신기
+
+    모든 워커에서 start()를 호출해도 잠금 파일(flock)을 잡은 1개 워커만 갱신합니다.
+    다른 워커에서는 request_refresh()가 표시 파일만 건드리고, 담당 워커가 이를 보고 갱신합니다.
+
+    Example:
+        refresher = DirectoryRefresher(path, loader=load_entries, interval=60)
+        refresher.bind_lifecycle(lifecycle)
+        await refresher.start()
+    """
+
+    def __init__(
+        self,
+        path: str,
+        loader: Callable[[], Awaitable[Iterable[DirectoryEntry]]],
+        interval: float = 60,
+        poll_interval: float = 1.0,
+    ):
+        """
+        Args:
+            path: 디렉터리 파일 경로
+            loader: 전체 디렉터리 항목을 반환하는 비동기 함수
+            interval: 주기적 전체 갱신 간격 (초)
+            poll_interval: 갱신 요청 확인/담당 선출 재시도 간격 (초)
+        """
+        self.path = path
+        self.loader = loader
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self.lock_path = path + ".lock"
+        self.dirty_path = path + ".dirty"
+
+        self._lock_fd: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_build = 0.0
+        self.last_build_seconds = 0.0
+
+    @property
+    def is_leader(self) -> bool:
+        """이 프로세스가 갱신 담당인지"""
+        return self._lock_fd is not None
+
+    def try_acquire(self) -> bool:
+        """갱신 담당 잠금 시도 (비차단)"""
+        if self._lock_fd is not None:
+            return True
+        import fcntl
+
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def release(self) -> None:
+        """갱신 담당 잠금 해제"""
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def refresh(self) -> int:
+        """전체 항목을 읽어 파일 교체 (세대 번호 반환)"""
+        started = time.perf_counter()
+        # 읽는 동안 들어온 갱신 요청은 다음 차례에 다시 반영되도록 시작 시각 기준
+        requested_before = time.time()
+        entries = list(await self.loader())
+        generation = await asyncio.to_thread(write_directory, self.path, entries)
+        self._last_build = requested_before
+        self.last_build_seconds = time.perf_counter() - started
+        logger.info(f"Tenant directory refreshed: {len(entries)} tenants in {self.last_build_seconds:.3f}s")
+        return generation
+
+    def request_refresh(self) -> None:
+        """담당 워커에게 갱신 요청 (표시 파일 mtime 갱신)"""
+        with open(self.dirty_path, "a"):
+            os.utime(self.dirty_path, None)
+
+    def _refresh_due(self) -> bool:
+        if time.time() - self._last_build >= self.interval:
+            return True
+        try:
+            return os.stat(self.dirty_path).st_mtime > self._last_build
+        except FileNotFoundError:
+            return False
+
+    async def start(self) -> None:
+        """갱신 루프 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """갱신 루프 중지 및 담당 잠금 해제"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.release()
+
+    async def _run(self) -> None:
+        while True:
+            if self.try_acquire() and self._refresh_due():
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    logger.warning(f"Tenant directory refresh failed: {e}")
+                    self._last_build = time.time()
+            await asyncio.sleep(self.poll_interval)
+
+    def bind_lifecycle(self, lifecycle: Any) -> None:
+        """
+        TenantLifecycle 이벤트에 연결
+
+        생성/활성화/정지/삭제 후 갱신을 요청합니다.
+        """
+        from mt_paas.core.lifecycle import LifecycleEvent
+
+        def on_change(**kwargs) -> None:
+            self.request_refresh()
+
+        for event in (
+            LifecycleEvent.AFTER_CREATE,
+            LifecycleEvent.AFTER_PROVISION,
+            LifecycleEvent.AFTER_ACTIVATE,
+            LifecycleEvent.AFTER_SUSPEND,
+            LifecycleEvent.AFTER_DELETE,
+        ):
+            lifecycle.on(event, on_change)
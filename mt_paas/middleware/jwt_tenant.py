@@ -0,0 +1,118 @@
+"""
+JWT 클레임 기반 테넌트 식별
+
+Authorization: Bearer 토큰의 서명을 검증하고 테넌트 클레임(기본: tenant_id)을 읽습니다.
+검증된 토큰은 토큰 해시(sha256)를 키로 exp까지 캐시하여, 같은 토큰으로 반복되는
+요청은 서명 검증을 건너뜁니다.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
+
+from jose import jwt, JWTError
+
+logger = logging.getLogger(__name__)
+
+
+class JWTTenantExtractor:
+    """
+    JWT 테넌트 추출기
+
+    Example:
+        extractor = JWTTenantExtractor(secret=os.environ["MT_JWT_SECRET"])
+
+        app.add_middleware(TenantMiddleware, jwt_extractor=extractor)
+
+        # 라우트에서 검증된 클레임 사용
+        claims = request.state.jwt_claims
+    """
+
+    def __init__(
+        self,
+        secret: str,
+        algorithms: Optional[List[str]] = None,
+        claim: str = "tenant_id",
+        audience: Optional[str] = None,
+        issuer: Optional[str] = None,
+        cache_size: int = 10000,
+        no_exp_ttl: float = 300,
+    ):
+        """
+        Args:
+            secret: 서명 검증 키 (HS*: 공유 비밀, RS*/ES*: 공개키)
+            algorithms: 허용 알고리즘 (기본: HS256)
+            claim: 테넌트 ID 클레임 이름
+            audience: 기대하는 aud (선택)
+            issuer: 기대하는 iss (선택)
+            cache_size: 검증 토큰 캐시 최대 항목 수
+            no_exp_ttl: exp 없는 토큰의 캐시 유지 시간 (초)
+        """
+        self.secret = secret
+        self.algorithms = algorithms or ["HS256"]
+        self.claim = claim
+        self.audience = audience
+        self.issuer = issuer
+        self.cache_size = cache_size
+        self.no_exp_ttl = no_exp_ttl
+
+        # {sha256(token): (만료 시각(epoch), 클레임)}
+        self._cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """토큰 검증 후 클레임 반환 (실패 시 None)"""
+        key = hashlib.sha256(token.encode("latin-1")).digest()
+        now = time.time()
+
+        entry = self._cache.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._cache[key]
+
+        self.misses += 1
+        try:
+            claims = jwt.decode(
+                token,
+                self.secret,
+                algorithms=self.algorithms,
+                audience=self.audience,
+                issuer=self.issuer,
+                options={"verify_aud": self.audience is not None},
+            )
+        except JWTError as e:
+            logger.debug(f"JWT verification failed: {e}")
+            return None
+
+        exp = claims.get("exp")
+        expires_at = float(exp) if exp is not None else now + self.no_exp_ttl
+        if expires_at > now:
+            self._cache[key] = (expires_at, claims)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return claims
+
+    def extract(self, authorization: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Authorization 헤더 값에서 (테넌트 ID, 클레임) 추출
+
+        Bearer 토큰이 아니거나 검증에 실패하면 (None, None)
+        """
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None, None
+        claims = self.verify(token.strip())
+        if claims is None:
+            return None, None
+        tenant_id = claims.get(self.claim)
+        return (str(tenant_id) if tenant_id else None), claims
+
+    def clear(self) -> None:
+        """검증 캐시 초기화 (키 교체 시)"""
+        self._cache.clear()
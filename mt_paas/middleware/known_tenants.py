@@ -0,0 +1,222 @@
+"""
+알려진 테넌트 ID 필터 (Bloom filter)
+
+모든 테넌트 ID를 메모리 Bloom filter에 담아, 존재하지 않는 테넌트 ID
+(스캐너가 보낸 임의 Host 헤더, 잘못 설정된 클라이언트 등)는 DB 조회 없이 거절합니다.
+
+- "없음" 판정은 확실 (false negative 없음), "있음" 판정은 error_rate 확률로 오판
+  → 오판된 ID는 기존처럼 tenant_lookup까지 감
+- 시작 시 전체 ID로 구성, 생성 이벤트마다 추가, refresh_interval마다 재구성
+  (다른 워커/인스턴스에서 생성된 테넌트와 삭제된 테넌트 반영)
+- 구성 전(ready=False)에는 모든 ID를 통과
+- 다른 인스턴스에서 생성된 테넌트는 다음 재구성 전까지 거절되므로, 테넌트 생성이
+  한 곳에서만 일어나거나 refresh_interval 지연을 허용할 때만 켜세요 (기본 비활성)
+"""
+
+import asyncio
+import logging
+import math
+import time
+from hashlib import blake2b
+from struct import Struct
+from typing import Optional, Any, Dict, Iterable, Callable, Awaitable, Set
+
+logger = logging.getLogger(__name__)
+
+
+class _Bits:
+    """비트 배열 + 해시 함수 수"""
+    __slots__ = ("array", "size", "hashes", "capacity", "count", "_unpack")
+
+    def __init__(self, capacity: int, error_rate: float):
+        size = max(64, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.array = bytearray((size + 7) // 8)
+        self.size = size
+        self.hashes = max(1, int(round(size / capacity * math.log(2))))
+        self.capacity = capacity
+        self.count = 0
+        # 다이제스트 1회로 해시 k개 (32비트씩)
+        self._unpack = Struct(f"<{self.hashes}I").unpack
+
+    def _positions(self, key: str):
+        digest = blake2b(key.encode("utf-8"), digest_size=4 * self.hashes).digest()
+        size = self.size
+        return [h % size for h in self._unpack(digest)]
+
+    def add(self, key: str) -> None:
+        array = self.array
+        for position in self._positions(key):
+            array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        array = self.array
+        for position in self._positions(key):
+            if not array[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class KnownTenantFilter:
+    """
+    알려진 테넌트 ID Bloom filter
+
+    Example:
+        known = KnownTenantFilter(loader=load_all_tenant_ids)
+        known.bind_lifecycle(lifecycle)
+        await known.refresh()
+        await known.start()
+
+        app.add_middleware(TenantMiddleware, tenant_lookup=my_lookup, known_tenants=known)
+    """
+
+    def __init__(
+        self,
+        loader: Optional[Callable[[], Awaitable[Iterable[str]]]] = None,
+        error_rate: float = 0.001,
+        headroom: float = 2.0,
+        min_capacity: int = 1024,
+        refresh_interval: float = 300,
+    ):
+        """
+        Args:
+            loader: 전체 테넌트 ID를 반환하는 비동기 함수 (refresh에서 사용)
+            error_rate: 목표 오판(false positive) 확률
+            headroom: 구성 시 용량 = 테넌트 수 × headroom (이후 추가될 테넌트 여유분)
+            min_capacity: 최소 용량
+            refresh_interval: 주기적 재구성 간격 (초, 0이면 안 함)
+        """
+        self.loader = loader
+        self.error_rate = error_rate
+        self.headroom = headroom
+        self.min_capacity = min_capacity
+        self.refresh_interval = refresh_interval
+
+        self._bits: Optional[_Bits] = None
+        # 재구성 중 추가된 ID (새 필터에 반영)
+        self._pending: Optional[Set[str]] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.checks = 0
+        self.rejected = 0
+        self.last_build_seconds = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """구성 완료 여부"""
+        return self._bits is not None
+
+    def __len__(self) -> int:
+        return self._bits.count if self._bits is not None else 0
+
+    def might_contain(self, tenant_id: str) -> bool:
+        """존재할 수 있는 테넌트 ID인지 (False면 확실히 없음)"""
+        bits = self._bits
+        if bits is None:
+            return True
+        self.checks += 1
+        if tenant_id in bits:
+            return True
+        self.rejected += 1
+        return False
+
+    __contains__ = might_contain
+
+    def add(self, tenant_id: str) -> None:
+        """테넌트 ID 추가"""
+        if self._pending is not None:
+            self._pending.add(tenant_id)
+        if self._bits is not None:
+            self._bits.add(tenant_id)
+
+    # =========================================================================
+    # 구성
+    # =========================================================================
+
+    def build(self, tenant_ids: Iterable[str]) -> None:
+        """전체 ID로 새 필터를 구성해 교체"""
+        self._swap(self._build_bits(tenant_ids))
+
+    async def refresh(self) -> None:
+        """loader로 전체 ID를 다시 읽어 재구성 (실패 시 기존 필터 유지)"""
+        if self.loader is None:
+            return
+        self._pending = set()
+        try:
+            tenant_ids = await self.loader()
+            # 수십만 건 구성 중에도 이벤트 루프가 멈추지 않도록 스레드에서 구성
+            self._swap(await asyncio.to_thread(self._build_bits, tenant_ids))
+        except Exception as e:
+            logger.warning(f"Known tenant filter refresh failed: {e}")
+        finally:
+            self._pending = None
+
+    def _build_bits(self, tenant_ids: Iterable[str]) -> _Bits:
+        started = time.perf_counter()
+        ids = tenant_ids if isinstance(tenant_ids, (list, tuple, set)) else list(tenant_ids)
+        bits = _Bits(max(self.min_capacity, int(len(ids) * self.headroom)), self.error_rate)
+        for tenant_id in ids:
+            bits.add(tenant_id)
+        self.last_build_seconds = time.perf_counter() - started
+        return bits
+
+    def _swap(self, bits: _Bits) -> None:
+        # 구성 중 생성된 테넌트 반영 후 교체 (이벤트 루프에서 실행)
+        if self._pending:
+            for tenant_id in self._pending:
+                bits.add(tenant_id)
+        self._bits = bits
+
+    def stats(self) -> Dict[str, Any]:
+        """구성/판정 통계"""
+        bits = self._bits
+        return {
+            "ready": bits is not None,
+            "tenants": bits.count if bits else 0,
+            "capacity": bits.capacity if bits else 0,
+            "bits": bits.size if bits else 0,
+            "hashes": bits.hashes if bits else 0,
+            "memory_bytes": len(bits.array) if bits else 0,
+            "build_ms": round(self.last_build_seconds * 1000, 3),
+            "checks": self.checks,
+            "rejected": self.rejected,
+        }
+
+    async def start(self) -> None:
+        """주기적 재구성 시작"""
+        if self._task is None and self.refresh_interval > 0 and self.loader is not None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """주기적 재구성 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    # =========================================================================
+    # 생명주기 연동
+    # =========================================================================
+
+    def bind_lifecycle(self, lifecycle: Any) -> None:
+        """
+        TenantLifecycle 이벤트에 연결
+
+        생성 시 ID를 추가합니다. Bloom filter는 항목 제거가 불가능하므로
+        삭제된 테넌트는 다음 재구성 때 빠집니다 (그 전까지는 tenant_lookup이 거절).
+        """
+        from mt_paas.core.lifecycle import LifecycleEvent
+
+        def on_create(tenant: Any = None, **kwargs) -> None:
+            if tenant is not None:
+                self.add(tenant.id)
+
+        lifecycle.on(LifecycleEvent.AFTER_CREATE, on_create)
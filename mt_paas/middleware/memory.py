@@ -0,0 +1,276 @@
+"""
+테넌트별 메모리 할당 샘플링
+
+N건 중 1건의 요청만 tracemalloc으로 추적하여, 요청이 할당한 메모리와
+주요 할당 위치(파일:줄)를 현재 테넌트에 귀속합니다. 추적하지 않는 요청에는
+카운터 증가 외의 비용이 없습니다.
+
+- 바이트 수: 요청 코루틴이 실행된 구간(스텝)마다 추적 메모리 증감을 합산하므로
+  같은 이벤트 루프에서 번갈아 실행된 다른 요청의 할당은 섞이지 않음
+- 할당 위치: 추적 구간 동안 할당되어 요청 종료 시점에 남아 있는 메모리 기준
+  (같은 시간에 처리된 다른 요청의 할당이 일부 포함될 수 있음)
+- 동시에 1건만 추적 (추적 중에 샘플 차례가 오면 다음 요청으로 미룸)
+- tracemalloc은 프로세스 전역이라 추적 중에는 같은 프로세스의 모든 요청/스레드 할당이
+  느려짐 → sample_rate와 별도로 min_interval(초)마다 최대 1건만 추적
+"""
+
+import tracemalloc
+import types
+from time import monotonic
+from typing import Optional, Any, Dict, List
+
+from fastapi import APIRouter, Query
+
+from .tenant import _current_tenant
+
+
+class _TenantMemory:
+    """테넌트 1개의 샘플 집계"""
+    __slots__ = ("samples", "net_bytes", "peak_bytes", "max_peak_bytes", "sites")
+
+    def __init__(self):
+        self.samples = 0
+        self.net_bytes = 0
+        self.peak_bytes = 0
+        self.max_peak_bytes = 0
+        # {"file:line": 남아 있던 바이트 합}
+        self.sites: Dict[str, int] = {}
+
+
+class _Sample:
+    """요청 1건의 추적 결과"""
+    __slots__ = ("net", "peak")
+
+    def __init__(self):
+        self.net = 0
+        self.peak = 0
+
+
+@types.coroutine
+def _trace_steps(coro, sample: _Sample):
+    """코루틴을 스텝 단위로 실행하며 스텝별 추적 메모리 증감을 sample에 합산"""
+    get_traced = tracemalloc.get_traced_memory
+    reset_peak = tracemalloc.reset_peak
+    value = None
+    error = None
+    while True:
+        reset_peak()
+        before = get_traced()[0]
+        try:
+            if error is None:
+                yielded = coro.send(value)
+            else:
+                yielded = coro.throw(error)
+        except StopIteration as e:
+            _account(sample, before)
+            return e.value
+        except BaseException:
+            _account(sample, before)
+            raise
+        _account(sample, before)
+
+        value = error = None
+        try:
+            value = yield yielded
+        except GeneratorExit:
+            coro.close()
+            raise
+        except BaseException as e:
+            error = e
+
+
+def _account(sample: _Sample, before: int) -> None:
+    current, peak = tracemalloc.get_traced_memory()
+    step_peak = sample.net + peak - before
+    if step_peak > sample.peak:
+        sample.peak = step_peak
+    sample.net += current - before
+
+
+class MemoryProfiler:
+    """
+    테넌트별 메모리 할당 샘플러
+
+    Example:
+        profiler = MemoryProfiler(sample_rate=100)
+        app.add_middleware(MemoryProfilingMiddleware, profiler=profiler)
+        app.add_middleware(TenantMiddleware, tenant_lookup=my_lookup)
+        app.include_router(create_memory_debug_router(profiler))
+
+        profiler.report()["hallym_univ"]
+        # {"samples": 12, "avg_net_kb": 84.2, "max_peak_kb": 5120.0, "top_sites": [...]}
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 100,
+        frames: int = 1,
+        sites_per_sample: int = 20,
+        max_sites: int = 50,
+        max_tenants: int = 1000,
+        min_interval: float = 1.0,
+    ):
+        """
+        Args:
+            sample_rate: N건 중 1건 추적
+            frames: 할당 위치당 기록할 스택 깊이 (클수록 느림)
+            sites_per_sample: 요청 1건에서 반영할 상위 할당 위치 수
+            max_sites: 테넌트별 유지할 할당 위치 수
+            max_tenants: 집계할 최대 테넌트 수
+            min_interval: 추적 시작 간 최소 간격 (초, 트래픽과 무관한 전역 상한)
+        """
+        self.sample_rate = max(1, sample_rate)
+        self.frames = frames
+        self.sites_per_sample = sites_per_sample
+        self.max_sites = max_sites
+        self.max_tenants = max_tenants
+        self.min_interval = min_interval
+
+        self._counter = 0
+        self._active = False
+        self._last_started: Optional[float] = None
+        self._tenants: Dict[str, _TenantMemory] = {}
+
+    def should_sample(self) -> bool:
+        """이번 요청을 추적할지 (추적 중이거나 min_interval 이내면 다음 요청으로 미룸)"""
+        self._counter += 1
+        if self._active or self._counter < self.sample_rate:
+            return False
+        last = self._last_started
+        return last is None or monotonic() - last >= self.min_interval
+
+    async def trace(self, tenant_id: str, coro) -> Any:
+        """코루틴 1개를 추적 실행하고 결과를 tenant_id에 반영"""
+        self._active = True
+        self._counter = 0
+        self._last_started = monotonic()
+        owns_tracing = not tracemalloc.is_tracing()
+        start_snapshot = None
+        if owns_tracing:
+            tracemalloc.start(self.frames)
+        else:
+            start_snapshot = tracemalloc.take_snapshot()
+
+        sample = _Sample()
+        try:
+            return await _trace_steps(coro, sample)
+        finally:
+            try:
+                snapshot = tracemalloc.take_snapshot()
+                if start_snapshot is None:
+                    stats = [(s.traceback, s.size) for s in snapshot.statistics("lineno")]
+                else:
+                    stats = [
+                        (s.traceback, s.size_diff)
+                        for s in snapshot.compare_to(start_snapshot, "lineno")
+                        if s.size_diff > 0
+                    ]
+            finally:
+                if owns_tracing:
+                    tracemalloc.stop()
+                self._active = False
+            self._record(tenant_id, sample, stats[: self.sites_per_sample])
+
+    def _record(self, tenant_id: str, sample: _Sample, stats: List) -> None:
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            if len(self._tenants) >= self.max_tenants:
+                return
+            tenant = self._tenants[tenant_id] = _TenantMemory()
+
+        tenant.samples += 1
+        tenant.net_bytes += sample.net
+        tenant.peak_bytes += sample.peak
+        if sample.peak > tenant.max_peak_bytes:
+            tenant.max_peak_bytes = sample.peak
+
+        sites = tenant.sites
+        for traceback, size in stats:
+            frame = traceback[0]
+            key = f"{frame.filename}:{frame.lineno}"
+            sites[key] = sites.get(key, 0) + size
+        if len(sites) > self.max_sites:
+            keep = sorted(sites.items(), key=lambda item: item[1], reverse=True)[: self.max_sites]
+            tenant.sites = dict(keep)
+
+    def report(self, tenant_id: Optional[str] = None, top: int = 10) -> Dict[str, Dict[str, Any]]:
+        """테넌트별 샘플 집계 (최대 피크 순)"""
+        tenants = self._tenants
+        if tenant_id is not None:
+            tenants = {tenant_id: tenants[tenant_id]} if tenant_id in tenants else {}
+
+        ordered = sorted(tenants.items(), key=lambda item: item[1].max_peak_bytes, reverse=True)
+        return {
+            tid: {
+                "samples": t.samples,
+                "avg_net_kb": round(t.net_bytes / t.samples / 1024, 1),
+                "avg_peak_kb": round(t.peak_bytes / t.samples / 1024, 1),
+                "max_peak_kb": round(t.max_peak_bytes / 1024, 1),
+                "top_sites": [
+                    {"site": site, "kb": round(size / 1024, 1)}
+                    for site, size in sorted(t.sites.items(), key=lambda item: item[1], reverse=True)[:top]
+                ],
+            }
+            for tid, t in ordered
+        }
+
+    def reset(self) -> None:
+        """집계 초기화"""
+        self._tenants.clear()
+
+
+class MemoryProfilingMiddleware:
+    """
+    테넌트별 메모리 할당 샘플링 미들웨어 (순수 ASGI)
+
+    TenantMiddleware 안쪽에서 실행되어야 하므로 TenantMiddleware보다 먼저 추가합니다.
+    """
+
+    def __init__(self, app, profiler: Optional[MemoryProfiler] = None, **profiler_options):
+        """
+        Args:
+            app: ASGI 앱
+            profiler: 공유할 MemoryProfiler (없으면 profiler_options로 생성)
+        """
+        self.app = app
+        self.profiler = profiler or MemoryProfiler(**profiler_options)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = _current_tenant.get()
+        if context is None or not self.profiler.should_sample():
+            await self.app(scope, receive, send)
+            return
+
+        await self.profiler.trace(context.tenant_id, self.app(scope, receive, send))
+
+
+def create_memory_debug_router(
+    profiler: MemoryProfiler,
+    path: str = "/debug/memory",
+    dependencies: Optional[List[Any]] = None,
+) -> APIRouter:
+    """
+    테넌트별 메모리 샘플 보고서 라우터 생성
+
+    운영 환경에서는 dependencies로 관리자 인증을 지정하세요.
+
+    Example:
+        app.include_router(create_memory_debug_router(mt.memory_profiler, dependencies=[Depends(admin_only)]))
+    """
+    router = APIRouter(tags=["Debug"], dependencies=dependencies or [])
+
+    @router.get(path, include_in_schema=False)
+    async def memory_report(
+        tenant_id: Optional[str] = Query(None),
+        top: int = Query(10, ge=1, le=100),
+    ) -> Dict[str, Any]:
+        return {
+            "sample_rate": profiler.sample_rate,
+            "tenants": profiler.report(tenant_id, top),
+        }
+
+    return router
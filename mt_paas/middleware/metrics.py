@@ -0,0 +1,294 @@
+"""
+테넌트/라우트별 요청 메트릭
+
+요청 수, 상태 코드 계열(2xx/4xx/5xx), 지연 시간 히스토그램을
+테넌트 × 라우트 템플릿 × 메서드 단위로 집계하고 Prometheus 텍스트 형식으로 노출합니다.
+
+- 워커(이벤트 루프)당 1개 집계기, 락 없이 in-place 카운터 갱신
+- 고정 버킷 히스토그램 (버킷 탐색은 bisect)
+- 라벨 카디널리티 제한: 트래픽 순위가 아니라 "먼저 관측된" N개 테넌트만 개별 라벨,
+  나머지는 "other" (한 번 정한 라벨은 reset 전까지 고정 → 카운터가 줄지 않음).
+  트래픽 상위 테넌트 순위가 필요하면 usage.top_users(Space-Saving)를 사용
+- 테넌트별 CPU 시간 (CPUAccountingMiddleware가 observe_cpu로 반영)
+"""
+
+from bisect import bisect_left
+from time import perf_counter
+from typing import Optional, Any, Dict, List, Tuple
+
+from fastapi import APIRouter
+from starlette.responses import Response
+
+from .tenant import _current_tenant
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+# 테넌트 컨텍스트 없는 요청 / 상위 N 밖 테넌트 라벨
+NO_TENANT = "none"
+OTHER_TENANT = "other"
+# 라우팅 전에 응답된 요청 (없는 경로 404, 속도/동시 처리 제한 429/503)
+UNROUTED = "unrouted"
+
+
+class _Series:
+    """(테넌트, 라우트, 메서드) 1개의 카운터"""
+    __slots__ = ("status", "buckets", "sum", "count")
+
+    def __init__(self, bucket_count: int):
+        self.status = [0, 0, 0, 0, 0]
+        # 마지막 칸은 +Inf
+        self.buckets = [0] * (bucket_count + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def merge(self, other: "_Series") -> None:
+        for i, v in enumerate(other.status):
+            self.status[i] += v
+        for i, v in enumerate(other.buckets):
+            self.buckets[i] += v
+        self.sum += other.sum
+        self.count += other.count
+
+
+class RequestMetrics:
+    """
+    요청 메트릭 집계기
+
+    Example:
+        metrics = RequestMetrics(top_tenants=20)
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+        app.include_router(create_metrics_router(metrics))
+    """
+
+    def __init__(
+        self,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+        top_tenants: int = 20,
+        max_tracked_tenants: int = 1000,
+        scheduler: Optional[Any] = None,
+    ):
+        """
+        Args:
+            buckets: 지연 시간 히스토그램 상한 (초, 오름차순)
+            top_tenants: 개별 라벨로 노출할 테넌트 수 - 먼저 관측된 순 (이후 처음 보는 테넌트는 "other")
+            max_tracked_tenants: 라벨 배정을 기억할 최대 테넌트 수
+                (가득 차면 새 테넌트는 기억하지 않고 "other", 개별 라벨 슬롯도 쓰지 않음)
+            scheduler: 함께 노출할 FairScheduler (처리 중 수/대기열)
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.top_tenants = top_tenants
+        self.max_tracked_tenants = max_tracked_tenants
+        self.scheduler = scheduler
+
+        # {tenant: label} - 처음 관측할 때 정하고 바꾸지 않음
+        self._labels: Dict[str, str] = {NO_TENANT: NO_TENANT}
+        self._named = 0
+        # {label: {(route, method): series}}
+        self._series: Dict[str, Dict[Tuple[str, str], _Series]] = {}
+        # 라벨별 CPU 시간 (초)
+        self._cpu: Dict[str, float] = {}
+
+    def _label(self, tenant: str) -> str:
+        label = self._labels.get(tenant)
+        if label is not None:
+            return label
+        if len(self._labels) >= self.max_tracked_tenants:
+            # 기억할 수 없는 테넌트에 개별 라벨을 주면 다음 요청에서 또 슬롯을 씀
+            return OTHER_TENANT
+        if self._named < self.top_tenants and tenant != OTHER_TENANT:
+            label = tenant
+            self._named += 1
+        else:
+            label = OTHER_TENANT
+        self._labels[tenant] = label
+        return label
+
+    def observe(self, tenant: str, route: str, method: str, status_code: int, duration: float) -> None:
+        """요청 1건 반영"""
+        label = self._label(tenant)
+        routes = self._series.get(label)
+        if routes is None:
+            routes = self._series[label] = {}
+
+        key = (route, method)
+        series = routes.get(key)
+        if series is None:
+            series = routes[key] = _Series(len(self.buckets))
+
+        index = status_code // 100 - 1
+        if 0 <= index < 5:
+            series.status[index] += 1
+        series.buckets[bisect_left(self.buckets, duration)] += 1
+        series.sum += duration
+        series.count += 1
+
+    def observe_cpu(self, tenant: str, seconds: float) -> None:
+        """요청 1건의 CPU 시간 반영"""
+        label = self._label(tenant)
+        self._cpu[label] = self._cpu.get(label, 0.0) + seconds
+
+    def cpu_seconds(self) -> Dict[str, float]:
+        """라벨별 누적 CPU 시간 (초)"""
+        return dict(self._cpu)
+
+    def reset(self) -> None:
+        """전체 집계 초기화"""
+        self._series.clear()
+        self._cpu.clear()
+        self._labels = {NO_TENANT: NO_TENANT}
+        self._named = 0
+
+    # =========================================================================
+    # 조회 / 노출
+    # =========================================================================
+
+    def snapshot(self) -> Dict[str, Dict[Tuple[str, str], _Series]]:
+        """라벨(개별 테넌트 / "none" / "other")별 집계 사본"""
+        copied: Dict[str, Dict[Tuple[str, str], _Series]] = {}
+        for label, routes in self._series.items():
+            target = copied[label] = {}
+            for key, series in routes.items():
+                acc = target[key] = _Series(len(self.buckets))
+                acc.merge(series)
+        return copied
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 형식 (exposition format 0.0.4)"""
+        lines: List[str] = [
+            "# HELP mt_http_requests_total HTTP requests by tenant, route and status class",
+            "# TYPE mt_http_requests_total counter",
+        ]
+        snapshot = self.snapshot()
+        for tenant, routes in snapshot.items():
+            for (route, method), series in routes.items():
+                base = f'tenant="{_escape(tenant)}",route="{_escape(route)}",method="{method}"'
+                for status_class, value in zip(_STATUS_CLASSES, series.status):
+                    if value:
+                        lines.append(f'mt_http_requests_total{{{base},status="{status_class}"}} {value}')
+
+        lines.append("# HELP mt_http_request_duration_seconds HTTP request latency by tenant and route")
+        lines.append("# TYPE mt_http_request_duration_seconds histogram")
+        for tenant, routes in snapshot.items():
+            for (route, method), series in routes.items():
+                base = f'tenant="{_escape(tenant)}",route="{_escape(route)}",method="{method}"'
+                cumulative = 0
+                for bound, value in zip(self.buckets, series.buckets):
+                    cumulative += value
+                    lines.append(f'mt_http_request_duration_seconds_bucket{{{base},le="{bound}"}} {cumulative}')
+                lines.append(f'mt_http_request_duration_seconds_bucket{{{base},le="+Inf"}} {series.count}')
+                lines.append(f"mt_http_request_duration_seconds_sum{{{base}}} {series.sum:.6f}")
+                lines.append(f"mt_http_request_duration_seconds_count{{{base}}} {series.count}")
+
+        if self._cpu:
+            lines.extend(self._render_cpu())
+        if self.scheduler is not None:
+            lines.extend(self._render_scheduler())
+        return "\n".join(lines) + "\n"
+
+    def _render_cpu(self) -> List[str]:
+        lines = [
+            "# HELP mt_tenant_cpu_seconds_total CPU time spent handling requests by tenant",
+            "# TYPE mt_tenant_cpu_seconds_total counter",
+        ]
+        for tenant, seconds in self._cpu.items():
+            lines.append(f'mt_tenant_cpu_seconds_total{{tenant="{_escape(tenant)}"}} {seconds:.6f}')
+        return lines
+
+    def _render_scheduler(self) -> List[str]:
+        merged: Dict[str, Dict[str, int]] = {}
+        for tenant, values in self.scheduler.stats().items():
+            acc = merged.setdefault(self._label(tenant), {"in_flight": 0, "queued": 0, "rejected": 0})
+            for field in acc:
+                acc[field] += values[field]
+        lines = []
+        for name, field, kind in (
+            ("mt_tenant_in_flight", "in_flight", "gauge"),
+            ("mt_tenant_queue_depth", "queued", "gauge"),
+            ("mt_tenant_queue_rejected_total", "rejected", "counter"),
+        ):
+            lines.append(f"# TYPE {name} {kind}")
+            for tenant, values in merged.items():
+                lines.append(f'{name}{{tenant="{_escape(tenant)}"}} {values[field]}')
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsMiddleware:
+    """
+    요청 메트릭 미들웨어 (순수 ASGI)
+
+    TenantMiddleware 바로 안쪽에 두면 속도/동시 처리 제한으로 거절된 요청(429/503)도
+    집계됩니다. 라우트 라벨은 경로 템플릿(/mt/tenant/{tenant_id}/stats)을 사용합니다.
+
+    Example:
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+        app.add_middleware(TenantMiddleware, tenant_lookup=my_lookup)
+    """
+
+    def __init__(self, app, metrics: Optional[RequestMetrics] = None, exclude_paths: Optional[List[str]] = None):
+        """
+        Args:
+            app: ASGI 앱
+            metrics: 집계기 (없으면 새로 생성)
+            exclude_paths: 집계 제외 경로 prefix (기본: /metrics)
+        """
+        self.app = app
+        self.metrics = metrics or RequestMetrics()
+        self._exclude_prefixes = tuple(exclude_paths if exclude_paths is not None else ["/metrics"])
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self._exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            context = _current_tenant.get()
+            route = scope.get("route")
+            self.metrics.observe(
+                context.tenant_id if context is not None else NO_TENANT,
+                getattr(route, "path", UNROUTED),
+                scope["method"],
+                status_code,
+                perf_counter() - started,
+            )
+
+
+def create_metrics_router(
+    metrics: RequestMetrics,
+    path: str = "/metrics",
+    dependencies: Optional[List[Any]] = None,
+) -> APIRouter:
+    """
+    Prometheus 수집용 /metrics 라우터 생성
+
+    테넌트 ID가 라벨로 노출되므로 공개 경로라면 dependencies로 인증을 거세요.
+
+    Example:
+        app.include_router(create_metrics_router(mt.metrics, dependencies=[Depends(verify_scraper)]))
+    """
+    router = APIRouter(tags=["Metrics"], dependencies=dependencies or [])
+
+    @router.get(path, include_in_schema=False)
+    async def prometheus_metrics() -> Response:
+        return Response(
+            content=metrics.render_prometheus(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    return router
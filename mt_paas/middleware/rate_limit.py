@@ -0,0 +1,225 @@
+"""
+테넌트별 요청 속도 제한 미들웨어
+
+요금제(TenantContext.plan)별 분당 요청 수(rpm)로 테넌트마다 토큰 버킷을 두고,
+버킷이 비면 429 + Retry-After로 응답합니다.
+
+- 버킷 용량: rpm (최대 1분치 요청까지 몰아서 허용)
+- 충전 속도: rpm / 60 (초당)
+
+TenantMiddleware가 컨텍스트를 설정한 뒤에 실행되어야 하므로,
+앱에는 TenantMiddleware보다 먼저 add_middleware 해야 합니다 (안쪽 미들웨어).
+"""
+
+import inspect
+import math
+from collections import OrderedDict
+from time import monotonic
+from typing import Optional, Any, Dict, Callable
+
+from starlette.responses import JSONResponse
+
+from .tenant import _current_tenant
+
+
+class _Bucket:
+    """테넌트 1개의 토큰 버킷"""
+    __slots__ = ("tokens", "updated", "rpm")
+
+    def __init__(self, rpm: int, now: float):
+        self.tokens = float(rpm)
+        self.updated = now
+        self.rpm = rpm
+
+
+class MemoryRateLimiter:
+    """
+    프로세스 메모리 토큰 버킷
+
+    요청당 딕셔너리 조회 1회와 부동소수 연산만 수행합니다
+    (버킷 객체는 테넌트당 최초 1회만 생성).
+    버킷은 마지막 사용 순으로 유지하고, 1분 넘게 쓰이지 않은 버킷(이미 가득 참 →
+    지워도 판정이 같음)과 max_buckets를 넘는 가장 오래된 버킷을 새 버킷을 만들 때 제거합니다.
+    """
+
+    def __init__(self, max_buckets: int = 10000):
+        """
+        Args:
+            max_buckets: 유지할 최대 버킷 수 (초과 시 가장 오래 사용되지 않은 버킷 제거)
+        """
+        self.max_buckets = max_buckets
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: str, rpm: int) -> float:
+        """
+        토큰 1개 사용
+
+        Returns:
+            0.0이면 허용, 양수면 다음 토큰까지 기다려야 할 시간 (초)
+        """
+        now = monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._evict(now)
+            bucket = self._buckets[key] = _Bucket(rpm, now)
+        elif bucket.rpm != rpm:
+            bucket = self._buckets[key] = _Bucket(rpm, now)
+            self._buckets.move_to_end(key)
+        else:
+            bucket.tokens = min(rpm, bucket.tokens + (now - bucket.updated) * rpm / 60.0)
+            bucket.updated = now
+            self._buckets.move_to_end(key)
+
+        if bucket.tokens >= 1.0:
+            bucket.tokens -= 1.0
+            return 0.0
+        return (1.0 - bucket.tokens) * 60.0 / rpm
+
+    def _evict(self, now: float) -> None:
+        """유휴 버킷(1분 이상 미사용)과 최대 개수 초과분 제거 (앞쪽이 가장 오래된 버킷)"""
+        buckets = self._buckets
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            if now - oldest.updated < 60.0 and len(buckets) < self.max_buckets:
+                break
+            buckets.popitem(last=False)
+
+    def reset(self, key: Optional[str] = None) -> None:
+        """버킷 초기화 (key 없으면 전체)"""
+        if key is None:
+            self._buckets.clear()
+        else:
+            self._buckets.pop(key, None)
+
+
+# Redis 토큰 버킷 스크립트
+# KEYS[1]=버킷 키, ARGV[1]=rpm
+# 반환: 0이면 허용, 양수면 재시도까지 남은 시간 (ms)
+_TOKEN_BUCKET_SCRIPT = """
+local rpm = tonumber(ARGV[1])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = rpm
+    ts = now
+end
+tokens = math.min(rpm, tokens + (now - ts) * rpm / 60000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 60000 / rpm)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], 120000)
+return wait
+"""
+
+
+class RedisRateLimiter:
+    """
+    Redis 공유 토큰 버킷 (워커/인스턴스 간 공유)
+
+    갱신과 판정은 Lua 스크립트 1회 호출로 원자적으로 처리되며,
+    시각은 Redis 서버 시계를 사용합니다.
+    """
+
+    def __init__(self, redis: Any, key_prefix: str = "mt:ratelimit"):
+        """
+        Args:
+            redis: redis.asyncio 클라이언트 또는 Redis URL
+            key_prefix: 버킷 키 prefix
+        """
+        if isinstance(redis, str):
+            import redis.asyncio as aioredis
+            redis = aioredis.from_url(redis)
+        self.redis = redis
+        self.key_prefix = key_prefix
+        self._script = redis.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, rpm: int) -> float:
+        """토큰 1개 사용 (0.0: 허용, 양수: 재시도까지 남은 시간(초))"""
+        wait_ms = await self._script(keys=[f"{self.key_prefix}:{key}"], args=[rpm])
+        return int(wait_ms) / 1000.0
+
+
+class RateLimitMiddleware:
+    """
+    테넌트별 요청 속도 제한 미들웨어 (순수 ASGI)
+
+    Example:
+        from mt_paas.middleware import RateLimitMiddleware, TenantMiddleware
+
+        app.add_middleware(RateLimitMiddleware, by_plan={"free": 30, "premium": 300})
+        app.add_middleware(TenantMiddleware, tenant_lookup=my_lookup)
+    """
+
+    def __init__(
+        self,
+        app,
+        by_plan: Optional[Dict[str, int]] = None,
+        default_rpm: int = 60,
+        limiter: Optional[Any] = None,
+        rpm_resolver: Optional[Callable[[Any], int]] = None,
+    ):
+        """
+        Args:
+            app: ASGI 앱
+            by_plan: 요금제별 분당 요청 수 (0 이하: 무제한)
+            default_rpm: by_plan에 없는 요금제의 분당 요청 수
+            limiter: MemoryRateLimiter(기본) 또는 RedisRateLimiter
+            rpm_resolver: TenantContext → rpm 함수 (지정 시 by_plan 대신 사용)
+        """
+        self.app = app
+        self.by_plan = by_plan or {}
+        self.default_rpm = default_rpm
+        self.limiter = limiter or MemoryRateLimiter()
+        self.rpm_resolver = rpm_resolver
+        self._async_limiter = inspect.iscoroutinefunction(self.limiter.acquire)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = _current_tenant.get()
+        if context is None:
+            await self.app(scope, receive, send)
+            return
+
+        if self.rpm_resolver is not None:
+            rpm = self.rpm_resolver(context)
+        else:
+            rpm = self.by_plan.get(context.plan, self.default_rpm)
+        if rpm <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        if self._async_limiter:
+            wait = await self.limiter.acquire(context.tenant_id, rpm)
+        else:
+            wait = self.limiter.acquire(context.tenant_id, rpm)
+
+        if wait > 0:
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "success": False,
+                    "error": "RATE_LIMITED",
+                    "message": f"Rate limit exceeded ({rpm} requests/min)",
+                },
+                headers={
+                    "Retry-After": str(max(math.ceil(wait), 1)),
+                    "X-RateLimit-Limit": str(rpm),
+                },
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
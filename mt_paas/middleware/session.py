@@ -0,0 +1,130 @@
+"""
+요청 단위 테넌트 DB 세션
+
+요청마다 테넌트 DB 세션을 최대 1개만, 처음 사용할 때 엽니다.
+같은 요청 안의 라우트/의존성/서비스 코드가 모두 같은 세션을 공유하며,
+요청 처리가 끝나면 한 번만 commit(예외 시 rollback)합니다.
+"""
+
+import asyncio
+import inspect
+from contextvars import ContextVar
+from typing import Optional, Any, AsyncIterator
+
+from fastapi import Depends, HTTPException, Request
+
+from .tenant import get_current_tenant
+
+# 현재 요청의 테넌트 DB 핸들
+_request_db: ContextVar[Optional["TenantDB"]] = ContextVar("request_tenant_db", default=None)
+
+# Depends(scope=...) 지원 여부 (지원 시 응답 전송 전에 commit)
+_DEPENDS_HAS_SCOPE = "scope" in inspect.signature(Depends).parameters
+
+
+class TenantDB:
+    """
+    요청 단위 테넌트 DB 핸들
+
+    session()을 처음 호출할 때 db_manager.get_tenant_session()으로 세션을 열고,
+    이후 호출에는 같은 세션을 반환합니다.
+    """
+    __slots__ = ("db_manager", "tenant_id", "_cm", "_session", "_lock")
+
+    def __init__(self, db_manager: Any, tenant_id: str):
+        self.db_manager = db_manager
+        self.tenant_id = tenant_id
+        self._cm = None
+        self._session = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def opened(self) -> bool:
+        """세션이 열렸는지 여부"""
+        return self._session is not None
+
+    async def session(self):
+        """요청 세션 반환 (없으면 열기)"""
+        if self._session is not None:
+            return self._session
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._session is None:
+                cm = self.db_manager.get_tenant_session(self.tenant_id)
+                self._session = await cm.__aenter__()
+                self._cm = cm
+        return self._session
+
+    async def close(self, exc: Optional[BaseException] = None) -> None:
+        """세션 종료 (exc가 없으면 commit, 있으면 rollback)"""
+        cm, self._cm, self._session = self._cm, None, None
+        if cm is None:
+            return
+        if exc is None:
+            await cm.__aexit__(None, None, None)
+        else:
+            await cm.__aexit__(type(exc), exc, exc.__traceback__)
+
+
+def tenant_db(db_manager: Optional[Any] = None) -> Any:
+    """
+    FastAPI 의존성: 요청 단위 테넌트 DB
+
+    db_manager를 생략하면 app.state.db_manager(setup_multi_tenant가 설정)를 사용합니다.
+
+    Example:
+        TenantSession = tenant_db()
+
+        @app.post("/courses")
+        async def create_course(body: CourseIn, db: TenantDB = TenantSession):
+            session = await db.session()
+            session.add(Course(**body.dict()))
+            await course_service.log_creation()   # 내부에서 get_request_session() → 같은 세션
+            return {"ok": True}
+    """
+
+    async def dependency(request: Request) -> AsyncIterator[TenantDB]:
+        ctx = get_current_tenant()
+        if ctx is None:
+            raise HTTPException(status_code=401, detail="Tenant context required")
+
+        # 같은 요청에서 이미 열린 핸들이 있으면 재사용
+        current = _request_db.get()
+        if current is not None and current.tenant_id == ctx.tenant_id:
+            yield current
+            return
+
+        db = TenantDB(db_manager or request.app.state.db_manager, ctx.tenant_id)
+        token = _request_db.set(db)
+        try:
+            yield db
+        except BaseException as e:
+            await db.close(e)
+            raise
+        else:
+            await db.close()
+        finally:
+            _request_db.reset(token)
+
+    if _DEPENDS_HAS_SCOPE:
+        return Depends(dependency, scope="function")
+    return Depends(dependency)
+
+
+def get_request_db() -> Optional[TenantDB]:
+    """현재 요청의 테넌트 DB 핸들 (의존성 밖 서비스 코드용)"""
+    return _request_db.get()
+
+
+async def get_request_session():
+    """
+    현재 요청의 테넌트 DB 세션 (없으면 열기)
+
+    Raises:
+        RuntimeError: tenant_db() 의존성이 없는 요청에서 호출한 경우
+    """
+    db = _request_db.get()
+    if db is None:
+        raise RuntimeError("No request-scoped tenant DB (add tenant_db() dependency to the route)")
+    return await db.session()
@@ -4,12 +4,15 @@
 요청별로 테넌트를 식별하고 컨텍스트에 저장합니다.
 """
 
+import logging
 from contextvars import ContextVar
 from typing import Optional, Callable, Any
 from dataclasses import dataclass
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from urllib.parse import parse_qsl
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
 
 # 현재 요청의 테넌트 컨텍스트
 _current_tenant: ContextVar[Optional["TenantContext"]] = ContextVar(
@@ -57,16 +60,84 @@ def clear_current_tenant() -> None:
     _current_tenant.set(None)
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
+def extract_tenant_id(
+    scope,
+    header_key: bytes = b"x-tenant-id",
+    path_prefix: Optional[str] = "/tenant/",
+    jwt_extractor: Optional[Any] = None,
+) -> Optional[str]:
+    """
+    요청(ASGI scope)에서 테넌트 ID 추출 (TenantMiddleware와 같은 우선순위)
+
+    Args:
+        scope: ASGI HTTP scope
+        header_key: 테넌트 ID 헤더 이름 (소문자 bytes)
+        path_prefix: URL 경로에서 테넌트 ID 추출 시 prefix
+        jwt_extractor: Bearer 토큰 클레임에서 테넌트를 읽는 JWTTenantExtractor
+    """
+    header_value = None
+    authorization = None
+    host = b""
+    for key, value in scope["headers"]:
+        if key == header_key:
+            header_value = value
+        elif key == b"host":
+            host = value
+        elif key == b"authorization":
+            authorization = value
+
+    # 1. 검증된 JWT 클레임에서 추출 (클라이언트가 바꿀 수 없으므로 헤더보다 우선)
+    #    검증된 클레임은 request.state.jwt_claims로 전달
+    if authorization and jwt_extractor is not None:
+        tenant_id, claims = jwt_extractor.extract(authorization.decode("latin-1"))
+        if claims is not None:
+            scope.setdefault("state", {})["jwt_claims"] = claims
+        if tenant_id:
+            return tenant_id
+
+    # 2. 헤더에서 추출
+    if header_value:
+        return header_value.decode("latin-1")
+
+    # 3. URL 경로에서 추출 (예: /tenant/hallym_univ/...)
+    path = scope["path"]
+    if path_prefix and path.startswith(path_prefix):
+        return path[len(path_prefix):].split("/", 1)[0]
+
+    # 4. 쿼리 파라미터에서 추출
+    query_string = scope.get("query_string", b"")
+    if b"tenant_id" in query_string:
+        tenant_id = None
+        for key, value in parse_qsl(query_string.decode("latin-1"), keep_blank_values=True):
+            if key == "tenant_id":
+                tenant_id = value
+        if tenant_id:
+            return tenant_id
+
+    # 5. 서브도메인에서 추출
+    if b"." in host:
+        subdomain = host.decode("latin-1").split(".")[0]
+        # localhost, www 등은 제외
+        if subdomain not in ["localhost", "www", "api", "127"]:
+            return subdomain
+
+    return None
+
+
+class TenantMiddleware:
     """
-    테넌트 식별 미들웨어
+    테넌트 식별 미들웨어 (순수 ASGI)
 
     요청에서 테넌트를 식별하여 컨텍스트에 저장합니다.
+    BaseHTTPMiddleware를 거치지 않으므로 요청마다 태스크/스트림 래핑이 없고,
+    스트리밍 응답과 컨텍스트 변수가 그대로 앱까지 전달됩니다.
 
     식별 방법 (우선순위):
-    1. X-Tenant-ID 헤더
-    2. URL 경로 (/tenant/{tenant_id}/...)
-    3. 서브도메인 ({tenant_id}.service.com)
+    1. JWT 클레임 (Authorization: Bearer, jwt_extractor 지정 시 - 다른 X-Tenant-ID 헤더는 무시)
+    2. X-Tenant-ID 헤더
+    3. URL 경로 (/tenant/{tenant_id}/...)
+    4. 쿼리 파라미터 (?tenant_id=...)
+    5. 서브도메인 ({tenant_id}.service.com)
 
     Example:
         from fastapi import FastAPI
@@ -88,6 +159,11 @@ class TenantMiddleware(BaseHTTPMiddleware):
         path_prefix: str = "/tenant/",
         exclude_paths: list = None,
         require_tenant: bool = False,
+        usage_recorder: Optional[Any] = None,
+        quota: Optional[Any] = None,
+        lookup_cache: Optional[Any] = None,
+        jwt_extractor: Optional[Any] = None,
+        known_tenants: Optional[Any] = None,
     ):
         """
         Args:
@@ -97,8 +173,13 @@ class TenantMiddleware(BaseHTTPMiddleware):
             path_prefix: URL 경로에서 테넌트 ID 추출 시 prefix
             exclude_paths: 테넌트 검증 제외 경로
             require_tenant: True일 경우 테넌트 없으면 401 에러
+            usage_recorder: 테넌트 요청마다 api_calls를 기록할 UsageRecorder
+            quota: 일일 API 호출 한도를 집행할 QuotaEngine (초과 시 429)
+            lookup_cache: tenant_lookup 결과 캐시 (TenantLookupCache)
+            jwt_extractor: Bearer 토큰 클레임에서 테넌트를 읽는 JWTTenantExtractor
+            known_tenants: 없는 테넌트 ID를 조회 없이 거절할 KnownTenantFilter
         """
-        super().__init__(app)
+        self.app = app
         self.tenant_lookup = tenant_lookup
         self.header_name = header_name
         self.path_prefix = path_prefix
@@ -110,70 +191,94 @@ class TenantMiddleware(BaseHTTPMiddleware):
             "/mt/health",
         ]
         self.require_tenant = require_tenant
+        self.usage_recorder = usage_recorder
+        self.quota = quota
+        self.lookup_cache = lookup_cache
+        self.jwt_extractor = jwt_extractor
+        self.known_tenants = known_tenants
+
+        # 미리 계산해 둔 매칭 값 (ASGI 헤더 이름은 소문자 bytes)
+        self._exclude_prefixes = tuple(self.exclude_paths)
+        self._header_key = header_name.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next) -> Response:
         # 제외 경로 확인
-        path = request.url.path
-        if any(path.startswith(exc) for exc in self.exclude_paths):
-            return await call_next(request)
+        if scope["path"].startswith(self._exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
 
         # 테넌트 ID 추출
-        tenant_id = await self._extract_tenant_id(request)
+        tenant_id = self._extract_tenant_id(scope)
 
+        token = None
         if tenant_id:
             # 테넌트 컨텍스트 생성
-            context = await self._create_context(tenant_id)
+            try:
+                context = await self._create_context(tenant_id)
+            except Exception as e:
+                # 조회 실패(DB 장애 등)는 없는 테넌트와 구분하여 일시 오류로 응답
+                logger.warning(f"Tenant lookup failed for {tenant_id}: {e}")
+                response = JSONResponse(
+                    status_code=503,
+                    content={
+                        "success": False,
+                        "error": "SERVICE_UNAVAILABLE",
+                        "message": "Tenant lookup failed",
+                    },
+                )
+                await response(scope, receive, send)
+                return
             if context:
-                set_current_tenant(context)
+                if self.quota is not None and not await self.quota.consume(context.tenant_id, "api_calls"):
+                    response = JSONResponse(
+                        status_code=429,
+                        content={
+                            "success": False,
+                            "error": "QUOTA_EXCEEDED",
+                            "message": "api_calls quota exceeded",
+                        },
+                    )
+                    await response(scope, receive, send)
+                    return
+                token = _current_tenant.set(context)
+                if self.usage_recorder is not None and self.usage_recorder.active:
+                    self.usage_recorder.record(context.tenant_id, "api_calls")
         elif self.require_tenant:
-            raise HTTPException(
+            response = JSONResponse(
                 status_code=401,
-                detail="Tenant identification required"
+                content={"detail": "Tenant identification required"},
             )
+            await response(scope, receive, send)
+            return
 
         try:
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send)
         finally:
             # 요청 완료 후 컨텍스트 정리
-            clear_current_tenant()
+            if token is not None:
+                _current_tenant.reset(token)
 
-    async def _extract_tenant_id(self, request: Request) -> Optional[str]:
-        """요청에서 테넌트 ID 추출"""
-
-        # 1. 헤더에서 추출
-        tenant_id = request.headers.get(self.header_name)
-        if tenant_id:
-            return tenant_id
-
-        # 2. URL 경로에서 추출 (예: /tenant/hallym_univ/...)
-        path = request.url.path
-        if self.path_prefix and path.startswith(self.path_prefix):
-            parts = path[len(self.path_prefix):].split("/")
-            if parts:
-                return parts[0]
-
-        # 3. 쿼리 파라미터에서 추출
-        tenant_id = request.query_params.get("tenant_id")
-        if tenant_id:
-            return tenant_id
-
-        # 4. 서브도메인에서 추출
-        host = request.headers.get("host", "")
-        if "." in host:
-            subdomain = host.split(".")[0]
-            # localhost, www 등은 제외
-            if subdomain not in ["localhost", "www", "api", "127"]:
-                return subdomain
-
-        return None
+    def _extract_tenant_id(self, scope) -> Optional[str]:
+        """요청(ASGI scope)에서 테넌트 ID 추출"""
+        return extract_tenant_id(scope, self._header_key, self.path_prefix, self.jwt_extractor)
 
     async def _create_context(self, tenant_id: str) -> Optional[TenantContext]:
         """테넌트 컨텍스트 생성"""
 
+        # 확실히 없는 테넌트 ID는 조회하지 않음
+        if self.known_tenants is not None and not self.known_tenants.might_contain(tenant_id):
+            return None
+
         if self.tenant_lookup:
             # 커스텀 조회 함수 사용
-            tenant_info = await self.tenant_lookup(tenant_id)
+            if self.lookup_cache is not None:
+                tenant_info = await self.lookup_cache.lookup(tenant_id, self.tenant_lookup)
+            else:
+                tenant_info = await self.tenant_lookup(tenant_id)
             if tenant_info:
                 return TenantContext(
                     tenant_id=tenant_id,
@@ -188,7 +293,6 @@ class TenantMiddleware(BaseHTTPMiddleware):
 
 
 # FastAPI Dependency로 사용
-from fastapi import Depends
 
 def require_tenant() -> TenantContext:
     """
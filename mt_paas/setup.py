@@ -2,14 +2,27 @@
 FastAPI 앱에 멀티테넌트 기능을 한 번에 설정하는 헬퍼 함수
 """
 import logging
-from typing import Optional, List, Callable
+from typing import Optional, List, Callable, Any
 from fastapi import FastAPI
 
 from mt_paas.core.manager import TenantManager
 from mt_paas.core.database import DatabaseManager
 from mt_paas.core.lifecycle import TenantLifecycle
+from mt_paas.core.quota import QuotaEngine
+from mt_paas.core.loader import TenantLoader
 from mt_paas.middleware.tenant import TenantMiddleware, TenantContext
+from mt_paas.middleware.cache import TenantLookupCache
+from mt_paas.middleware.known_tenants import KnownTenantFilter
+from mt_paas.middleware.directory import SharedTenantDirectory, DirectoryRefresher, DirectoryEntry
+from mt_paas.middleware.rate_limit import RateLimitMiddleware, MemoryRateLimiter, RedisRateLimiter
+from mt_paas.middleware.concurrency import ConcurrencyLimitMiddleware, FairScheduler
+from mt_paas.middleware.admission import AdmissionControlMiddleware, AdmissionController
+from mt_paas.middleware.cpu import CPUAccountingMiddleware
+from mt_paas.middleware.memory import MemoryProfilingMiddleware, MemoryProfiler, create_memory_debug_router
+from mt_paas.middleware.metrics import MetricsMiddleware, RequestMetrics, create_metrics_router
+from mt_paas.middleware.jwt_tenant import JWTTenantExtractor
 from mt_paas.config import MTPaaSConfig, get_config
+from mt_paas.usage import UsageRecorder, UsageReporter, set_usage_recorder
 
 logger = logging.getLogger(__name__)
 
@@ -37,23 +50,114 @@ class MTPaaS:
         app: FastAPI,
         config: MTPaaSConfig,
         db_manager: DatabaseManager,
+        quota_counts_loader: Optional[Callable] = None,
     ):
         self.app = app
         self.config = config
         self.db = db_manager
-        self.manager = TenantManager(db_manager)
+        self.manager = TenantManager()
+        self.manager.db = db_manager
+        self.tenant_loader = TenantLoader(db_manager)
         self.lifecycle = TenantLifecycle(db_manager)
+        self.quota = QuotaEngine(db_manager, counts_loader=quota_counts_loader)
+        self.quota.bind_lifecycle(self.lifecycle)
+        self.directory: Optional[SharedTenantDirectory] = None
+        self.directory_refresher: Optional[DirectoryRefresher] = None
+        if config.tenant_cache.shared_directory:
+            self.directory = SharedTenantDirectory(config.tenant_cache.shared_directory_path)
+            self.directory_refresher = DirectoryRefresher(
+                config.tenant_cache.shared_directory_path,
+                loader=self._load_directory_entries,
+                interval=config.tenant_cache.shared_directory_refresh_seconds,
+            )
+            self.directory_refresher.bind_lifecycle(self.lifecycle)
+        self.tenant_cache: Optional[TenantLookupCache] = None
+        if config.tenant_cache.enabled:
+            # 공유 디렉터리를 쓰면 있는 테넌트는 디렉터리가 답하므로
+            # 디렉터리에 없어 DB까지 간 "없는 테넌트" 결과만 워커별로 캐시
+            self.tenant_cache = TenantLookupCache(
+                ttl=0 if self.directory is not None else config.tenant_cache.ttl_seconds,
+                negative_ttl=config.tenant_cache.negative_ttl_seconds,
+                max_size=config.tenant_cache.max_size,
+            )
+            self.tenant_cache.bind_lifecycle(self.lifecycle)
+        self.known_tenants: Optional[KnownTenantFilter] = None
+        if config.tenant_cache.known_ids_filter:
+            self.known_tenants = KnownTenantFilter(
+                loader=self._load_tenant_ids,
+                error_rate=config.tenant_cache.known_ids_error_rate,
+                refresh_interval=config.tenant_cache.known_ids_refresh_seconds,
+            )
+            self.known_tenants.bind_lifecycle(self.lifecycle)
+        self.rate_limiter: Optional[Any] = None
+        self.scheduler: Optional[FairScheduler] = None
+        self.admission: Optional[AdmissionController] = None
+        self.memory_profiler: Optional[MemoryProfiler] = None
+        self.metrics = RequestMetrics()
+        self.jwt_extractor: Optional[JWTTenantExtractor] = None
+        if config.jwt_secret:
+            self.jwt_extractor = JWTTenantExtractor(
+                secret=config.jwt_secret,
+                algorithms=[config.jwt_algorithm],
+                claim=config.jwt_tenant_claim,
+            )
+        self.usage = UsageRecorder()
+        # LLMMeter/@metered()가 기본으로 쓰는 전역 기록기를 같은 기록기로 지정
+        set_usage_recorder(self.usage)
+        self.usage_reporter: Optional[UsageReporter] = UsageReporter.from_config(
+            self.usage, config
+        )
+        # 보고기가 없으면 drain될 일이 없으므로 이벤트를 쌓지 않음
+        self.usage.buffer = self.usage_reporter is not None
 
     async def init(self) -> None:
         """초기화 (DB 연결 등)"""
         await self.db.init_central_db()
+        await self.quota.start()
+        if self.known_tenants:
+            await self.known_tenants.refresh()
+            await self.known_tenants.start()
+        if self.directory_refresher:
+            await self.directory_refresher.start()
+        if self.usage_reporter:
+            await self.usage_reporter.start()
         logger.info("MT-PaaS initialized")
 
     async def close(self) -> None:
         """리소스 정리"""
+        if self.usage_reporter:
+            await self.usage_reporter.stop()
+        if self.known_tenants:
+            await self.known_tenants.stop()
+        if self.directory_refresher:
+            await self.directory_refresher.stop()
+        await self.quota.stop()
         await self.db.close()
         logger.info("MT-PaaS closed")
 
+    async def _load_directory_entries(self) -> List[DirectoryEntry]:
+        """중앙 DB의 전체 테넌트 + 활성 구독 (공유 디렉터리 구성용)"""
+        rows = await self.tenant_loader.load_all()
+        return [
+            DirectoryEntry(
+                tenant_id=tenant.id,
+                status=getattr(tenant.status, "value", tenant.status),
+                plan=subscription.plan.value if subscription else "basic",
+                features=subscription.features if subscription else {},
+                config=tenant.config or {},
+            )
+            for tenant, subscription in rows.values()
+        ]
+
+    async def _load_tenant_ids(self) -> List[str]:
+        """중앙 DB의 전체 테넌트 ID (KnownTenantFilter 구성용)"""
+        from sqlalchemy import select
+        from mt_paas.core.models import Tenant
+
+        async with self.db.get_central_session() as session:
+            result = await session.execute(select(Tenant.id))
+            return list(result.scalars())
+
 
 def setup_multi_tenant(
     app: FastAPI,
@@ -63,6 +167,11 @@ def setup_multi_tenant(
     tenant_lookup: Optional[Callable[[str], TenantContext]] = None,
     exclude_paths: Optional[List[str]] = None,
     require_tenant: bool = False,
+    enforce_quota: bool = False,
+    metrics_path: Optional[str] = None,
+    metrics_dependencies: Optional[List[Any]] = None,
+    memory_debug_dependencies: Optional[List[Any]] = None,
+    quota_counts_loader: Optional[Callable] = None,
 ) -> MTPaaS:
     """
     FastAPI 앱에 멀티테넌트 기능을 설정합니다.
@@ -75,6 +184,14 @@ def setup_multi_tenant(
         tenant_lookup: 커스텀 테넌트 조회 함수
         exclude_paths: 테넌트 검증 제외 경로
         require_tenant: True면 테넌트 필수
+        enforce_quota: True면 구독의 일일 API 호출 한도 초과 시 429 응답
+        metrics_path: Prometheus 메트릭 노출 경로 (기본 None: 노출 안 함).
+            테넌트 ID가 라벨로 드러나므로 내부망에서만 열거나 metrics_dependencies로 인증
+        metrics_dependencies: /metrics 라우트에 걸 의존성 (예: [Depends(verify_scraper)])
+        memory_debug_dependencies: 메모리 보고서 라우트(memory_profiling.debug_path)에 걸 의존성.
+            debug_path를 설정해도 이 값이 없으면 보고서를 노출하지 않음
+        quota_counts_loader: 테넌트 현재 사용량 조회 함수 (async, {"users": n, "storage_mb": n}).
+            없으면 mt.quota를 create_standard_router_v2에 넘길 때 handler.list_users로 적재
 
     Returns:
         MTPaaS: MT-PaaS 통합 객체
@@ -114,7 +231,7 @@ def setup_multi_tenant(
     db_manager = DatabaseManager(db_url)
 
     # MTPaaS 객체 생성
-    mt = MTPaaS(app, cfg, db_manager)
+    mt = MTPaaS(app, cfg, db_manager, quota_counts_loader=quota_counts_loader)
 
     # 기본 제외 경로
     default_exclude = [
@@ -125,6 +242,62 @@ def setup_multi_tenant(
         "/mt/health",
         "/favicon.ico",
     ]
+    if metrics_path:
+        default_exclude.append(metrics_path)
+
+    # 테넌트별 메모리 할당 샘플링 (가장 안쪽, 선택)
+    if cfg.memory_profiling.enabled:
+        mt.memory_profiler = MemoryProfiler(
+            sample_rate=cfg.memory_profiling.sample_rate,
+            frames=cfg.memory_profiling.frames,
+            min_interval=cfg.memory_profiling.min_interval_seconds,
+        )
+        app.add_middleware(MemoryProfilingMiddleware, profiler=mt.memory_profiler)
+        # 할당 위치(파일:줄)가 드러나므로 인증 의존성을 지정했을 때만 노출
+        debug_path = cfg.memory_profiling.debug_path
+        if debug_path and memory_debug_dependencies:
+            app.include_router(create_memory_debug_router(
+                mt.memory_profiler, debug_path, dependencies=memory_debug_dependencies,
+            ))
+            default_exclude.append(debug_path)
+
+    # 테넌트별 CPU 시간 계측 (핸들러 실행만 측정, 선택)
+    if cfg.cpu_accounting:
+        app.add_middleware(CPUAccountingMiddleware, recorder=mt.usage, metrics=mt.metrics)
+
+    # 테넌트별 동시 처리 제한
+    if cfg.concurrency.enabled:
+        mt.scheduler = FairScheduler(
+            max_concurrency=cfg.concurrency.max_concurrency,
+            by_plan=cfg.concurrency.by_plan,
+            default_limit=cfg.concurrency.default_limit,
+            max_wait=cfg.concurrency.max_wait_seconds,
+            max_queue_per_tenant=cfg.concurrency.max_queue_per_tenant,
+        )
+        app.add_middleware(ConcurrencyLimitMiddleware, scheduler=mt.scheduler)
+        mt.metrics.scheduler = mt.scheduler
+
+    # 요금제별 속도 제한 (TenantMiddleware 안쪽에서 실행되도록 먼저 추가)
+    if cfg.rate_limit.enabled:
+        if cfg.rate_limit.backend == "redis":
+            mt.rate_limiter = RedisRateLimiter(cfg.redis.url)
+        else:
+            mt.rate_limiter = MemoryRateLimiter(max_buckets=cfg.rate_limit.max_buckets)
+        app.add_middleware(
+            RateLimitMiddleware,
+            by_plan=cfg.rate_limit.by_plan,
+            default_rpm=cfg.rate_limit.default_rpm,
+            limiter=mt.rate_limiter,
+        )
+
+    # 테넌트/라우트별 요청 메트릭 (제한으로 거절된 요청도 집계되도록 TenantMiddleware 바로 안쪽)
+    app.add_middleware(
+        MetricsMiddleware,
+        metrics=mt.metrics,
+        exclude_paths=[metrics_path] if metrics_path else [],
+    )
+    if metrics_path:
+        app.include_router(create_metrics_router(mt.metrics, metrics_path, dependencies=metrics_dependencies))
 
     # 미들웨어 추가
     app.add_middleware(
@@ -133,8 +306,25 @@ def setup_multi_tenant(
         header_name=tenant_header_name,
         exclude_paths=exclude_paths or default_exclude,
         require_tenant=require_tenant,
+        usage_recorder=mt.usage,
+        quota=mt.quota if enforce_quota else None,
+        lookup_cache=mt.tenant_cache,
+        jwt_extractor=mt.jwt_extractor,
+        # 커스텀 조회 함수는 중앙 DB 밖의 테넌트를 다룰 수 있으므로 기본 조회에만 적용
+        known_tenants=mt.known_tenants if tenant_lookup is None else None,
     )
 
+    # 표준 API 승인 제어 (테넌트 조회 전에 거절하도록 가장 바깥)
+    if cfg.admission.enabled:
+        mt.admission = AdmissionController(
+            max_in_flight=cfg.admission.max_in_flight,
+            target_delay=cfg.admission.target_delay_ms / 1000,
+            interval=cfg.admission.interval_ms / 1000,
+            max_queue=cfg.admission.max_queue,
+            max_wait=cfg.admission.max_wait_seconds,
+        )
+        app.add_middleware(AdmissionControlMiddleware, controller=mt.admission)
+
     # 앱 상태에 저장 (다른 곳에서 접근 가능하도록)
     app.state.mt_paas = mt
     app.state.tenant_manager = mt.manager
@@ -145,31 +335,31 @@ def setup_multi_tenant(
 
 
 def _create_default_lookup(mt: MTPaaS) -> Callable:
-    """기본 테넌트 조회 함수 생성"""
+    """
+    기본 테넌트 조회 함수 생성
 
-    async def lookup(tenant_id: str) -> Optional[TenantContext]:
-        try:
-            tenant = await mt.manager.get_tenant(tenant_id)
-            if tenant and tenant.is_active:
-                # 구독 정보 조회
-                async with mt.db.get_central_session() as session:
-                    from sqlalchemy import select
-                    from mt_paas.core.models import Subscription
-                    result = await session.execute(
-                        select(Subscription)
-                        .where(Subscription.tenant_id == tenant_id)
-                        .where(Subscription.is_active == True)
-                    )
-                    subscription = result.scalar_one_or_none()
+    공유 디렉터리에 없는 테넌트(갱신 전에 생성된 테넌트 등)만 중앙 DB에서 조회하며,
+    동시 조회는 TenantLoader로 배치 병합합니다.
+    """
 
+    async def lookup(tenant_id: str) -> Optional[TenantContext]:
+        # 공유 디렉터리에 있는 테넌트는 DB 조회 없이 판정
+        if mt.directory is not None:
+            entry = mt.directory.get(tenant_id)
+            if entry is not None:
+                return entry.to_context() if entry.is_active else None
+
+        # DB 오류는 그대로 전달 ("없는 테넌트"로 캐시되지 않도록, TenantMiddleware가 503 응답)
+        row = await mt.tenant_loader.load(tenant_id)
+        if row:
+            tenant, subscription = row
+            if tenant.is_active:
                 return TenantContext(
                     tenant_id=tenant.id,
                     plan=subscription.plan.value if subscription else "basic",
                     features=subscription.features if subscription else {},
                     config=tenant.config or {},
                 )
-        except Exception as e:
-            logger.debug(f"Tenant lookup failed for {tenant_id}: {e}")
         return None
 
     return lookup
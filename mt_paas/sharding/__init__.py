@@ -0,0 +1,18 @@
+"""
+샤딩 모듈
+
+테넌트 ID를 일관 해시로 워커 프로세스에 고정 배정하는 디스패처
+
+사용법:
+    from mt_paas.sharding import TenantDispatcher, HashRing
+
+    dispatcher = TenantDispatcher({"worker-0": "/run/mt_paas/worker-0.sock"})
+"""
+from .ring import HashRing
+from .dispatcher import TenantDispatcher, create_dispatcher
+
+__all__ = [
+    "HashRing",
+    "TenantDispatcher",
+    "create_dispatcher",
+]
@@ -0,0 +1,358 @@
+"""
+테넌트 고정 배정 디스패처
+
+여러 워커 프로세스 앞에서 요청을 받아, 테넌트 ID를 일관 해시로 항상 같은 워커에 전달합니다.
+워커마다 일부 테넌트만 처리하므로 워커별 캐시(테넌트 조회, 엔진, 집계)의 적중률이 올라갑니다.
+
+- 워커 주소: Unix 소켓 경로 (uvicorn --uds) 또는 http://host:port
+- 테넌트 식별은 TenantMiddleware와 같은 순서 (헤더, JWT, 경로, 쿼리, 서브도메인)
+- 테넌트 없는 요청은 워커에 순서대로 분산
+- 연결 실패한 워커는 retry_down 동안 제외하고 링의 다음 워커로 전달
+- 워커를 추가하면 약 1/N의 테넌트만 새 워커로 이동
+
+실행 예:
+    # 워커 (각각 별도 프로세스)
+    uvicorn app:app --uds /run/mt_paas/worker-0.sock
+    uvicorn app:app --uds /run/mt_paas/worker-1.sock
+
+    # 디스패처 (MT_SHARDING_WORKERS에 워커 주소를 쉼표로 지정)
+    uvicorn mt_paas.sharding:create_dispatcher --factory --port 11000
+"""
+
+import itertools
+import logging
+from time import monotonic
+from typing import Optional, Any, Dict
+from urllib.parse import quote
+
+import httpx
+from starlette.responses import JSONResponse
+
+from mt_paas.middleware.tenant import extract_tenant_id
+from .ring import HashRing
+
+logger = logging.getLogger(__name__)
+
+# 프록시가 전달하지 않는 헤더 (hop-by-hop)
+_HOP_BY_HOP = frozenset({
+    b"connection",
+    b"keep-alive",
+    b"proxy-authenticate",
+    b"proxy-authorization",
+    b"te",
+    b"trailer",
+    b"transfer-encoding",
+    b"upgrade",
+})
+
+
+class _Worker:
+    """워커 1개의 연결과 통계"""
+    __slots__ = ("name", "address", "client", "requests", "errors", "down_until")
+
+    def __init__(self, name: str, address: str, client: httpx.AsyncClient):
+        self.name = name
+        self.address = address
+        self.client = client
+        self.requests = 0
+        self.errors = 0
+        self.down_until = 0.0
+
+
+class TenantDispatcher:
+    """
+    테넌트 고정 배정 디스패처 (ASGI 앱)
+
+    Example:
+        dispatcher = TenantDispatcher({
+            "worker-0": "/run/mt_paas/worker-0.sock",
+            "worker-1": "/run/mt_paas/worker-1.sock",
+        })
+
+        # 실행 중 워커 추가 (약 1/3의 테넌트만 이동)
+        dispatcher.add_worker("worker-2", "/run/mt_paas/worker-2.sock")
+    """
+
+    def __init__(
+        self,
+        workers: Optional[Dict[str, str]] = None,
+        vnodes: int = 160,
+        header_name: str = "X-Tenant-ID",
+        path_prefix: str = "/tenant/",
+        jwt_extractor: Optional[Any] = None,
+        timeout: float = 60.0,
+        retry_down: float = 5.0,
+    ):
+        """
+        Args:
+            workers: {워커 이름: 주소} (주소는 Unix 소켓 경로 또는 http://host:port)
+            vnodes: 워커당 가상 노드 수
+            header_name: 테넌트 ID 헤더 이름
+            path_prefix: URL 경로에서 테넌트 ID 추출 시 prefix
+            jwt_extractor: Bearer 토큰 클레임에서 테넌트를 읽는 JWTTenantExtractor
+            timeout: 워커 응답 타임아웃 (초)
+            retry_down: 연결 실패한 워커를 제외할 시간 (초)
+        """
+        self.ring = HashRing(vnodes=vnodes)
+        self.path_prefix = path_prefix
+        self.jwt_extractor = jwt_extractor
+        self.timeout = timeout
+        self.retry_down = retry_down
+
+        self._header_key = header_name.lower().encode("latin-1")
+        self._workers: Dict[str, _Worker] = {}
+        self._round_robin = itertools.count()
+
+        for name, address in (workers or {}).items():
+            self.add_worker(name, address)
+
+    @classmethod
+    def from_config(cls, config: Any) -> "TenantDispatcher":
+        """MTPaaSConfig로 생성 (워커 이름은 주소)"""
+        from mt_paas.middleware.jwt_tenant import JWTTenantExtractor
+
+        sharding = config.sharding
+        jwt_extractor = None
+        if config.jwt_secret:
+            jwt_extractor = JWTTenantExtractor(
+                secret=config.jwt_secret,
+                algorithms=[config.jwt_algorithm],
+                claim=config.jwt_tenant_claim,
+            )
+        return cls(
+            workers={address: address for address in sharding.workers},
+            vnodes=sharding.virtual_nodes,
+            jwt_extractor=jwt_extractor,
+            timeout=sharding.timeout_seconds,
+            retry_down=sharding.retry_down_seconds,
+        )
+
+    # =========================================================================
+    # 워커 관리
+    # =========================================================================
+
+    def add_worker(
+        self,
+        name: str,
+        address: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """
+        워커 추가 (링에 추가되어 일부 테넌트가 이 워커로 이동)
+
+        Args:
+            name: 워커 이름 (링 위치 결정, 재시작 후에도 같은 이름 사용)
+            address: Unix 소켓 경로 또는 http://host:port
+            transport: 직접 지정할 httpx 전송 계층 (address 대신)
+        """
+        if transport is None and address is None:
+            raise ValueError("address or transport is required")
+        if name in self._workers:
+            raise ValueError(f"Worker already exists: {name}")
+
+        if address and address.startswith(("http://", "https://")):
+            client = httpx.AsyncClient(base_url=address, timeout=self.timeout)
+        else:
+            client = httpx.AsyncClient(
+                base_url="http://worker",
+                transport=transport or httpx.AsyncHTTPTransport(uds=address),
+                timeout=self.timeout,
+            )
+
+        self._workers[name] = _Worker(name, address or name, client)
+        self.ring.add(name)
+
+    async def remove_worker(self, name: str) -> None:
+        """워커 제거 (그 워커의 테넌트는 링의 다음 워커로 이동)"""
+        worker = self._workers.pop(name, None)
+        self.ring.remove(name)
+        if worker is not None:
+            await worker.client.aclose()
+
+    async def set_workers(self, workers: Dict[str, str]) -> None:
+        """워커 목록 교체 (새 워커 추가, 빠진 워커 제거, 그대로인 워커는 유지)"""
+        for name in [n for n in self._workers if n not in workers]:
+            await self.remove_worker(name)
+        for name, address in workers.items():
+            current = self._workers.get(name)
+            if current is None or current.address != address:
+                if current is not None:
+                    await self.remove_worker(name)
+                self.add_worker(name, address)
+
+    def route(self, tenant_id: Optional[str]) -> Optional[str]:
+        """요청을 처리할 워커 이름 (장애 워커 제외)"""
+        now = monotonic()
+        down = {name for name, w in self._workers.items() if w.down_until > now}
+
+        if tenant_id:
+            return self.ring.get(tenant_id, skip=down)
+
+        live = [name for name in self._workers if name not in down]
+        if not live:
+            return None
+        return live[next(self._round_robin) % len(live)]
+
+    async def close(self) -> None:
+        """모든 워커 연결 종료"""
+        for worker in self._workers.values():
+            await worker.client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """워커별 요청/오류 수"""
+        now = monotonic()
+        return {
+            name: {
+                "address": w.address,
+                "requests": w.requests,
+                "errors": w.errors,
+                "down": w.down_until > now,
+            }
+            for name, w in self._workers.items()
+        }
+
+    # =========================================================================
+    # ASGI
+    # =========================================================================
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            await send({"type": "websocket.close", "code": 1011})
+            return
+
+        tenant_id = extract_tenant_id(scope, self._header_key, self.path_prefix, self.jwt_extractor)
+        request_body = _RequestBody(scope, receive)
+
+        while True:
+            name = self.route(tenant_id)
+            if name is None:
+                await self._error(scope, receive, send, 503, "NO_WORKER", "No worker available")
+                return
+
+            worker = self._workers[name]
+            worker.requests += 1
+            try:
+                await self._forward(scope, send, worker, request_body)
+                return
+            except httpx.ConnectError as e:
+                worker.errors += 1
+                worker.down_until = monotonic() + self.retry_down
+                logger.warning(f"Worker {name} unreachable: {e}")
+                # 본문을 읽기 시작했으면 다른 워커로 다시 보낼 수 없음
+                if request_body.started:
+                    await self._error(scope, receive, send, 502, "BAD_GATEWAY", "Worker unreachable")
+                    return
+            except _ResponseStarted:
+                worker.errors += 1
+                raise
+            except httpx.TimeoutException:
+                worker.errors += 1
+                await self._error(scope, receive, send, 504, "GATEWAY_TIMEOUT", "Worker timed out")
+                return
+            except httpx.HTTPError as e:
+                worker.errors += 1
+                logger.warning(f"Worker {name} request failed: {e}")
+                await self._error(scope, receive, send, 502, "BAD_GATEWAY", "Worker request failed")
+                return
+
+    async def _forward(self, scope, send, worker: _Worker, request_body: "_RequestBody") -> None:
+        headers = [(k, v) for k, v in scope["headers"] if k not in _HOP_BY_HOP]
+        client = scope.get("client")
+        if client:
+            forwarded_for = client[0]
+            for key, value in headers:
+                if key == b"x-forwarded-for":
+                    forwarded_for = f"{value.decode('latin-1')}, {client[0]}"
+            headers = [(k, v) for k, v in headers if k != b"x-forwarded-for"]
+            headers.append((b"x-forwarded-for", forwarded_for.encode("latin-1")))
+        headers.append((b"x-forwarded-proto", scope.get("scheme", "http").encode("latin-1")))
+
+        raw_path = scope.get("raw_path") or quote(scope["path"]).encode("latin-1")
+        target = raw_path.decode("latin-1")
+        if scope.get("query_string"):
+            target += "?" + scope["query_string"].decode("latin-1")
+
+        request = worker.client.build_request(
+            scope["method"],
+            target,
+            headers=headers,
+            content=request_body if request_body.has_body else None,
+        )
+        response = await worker.client.send(request, stream=True)
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [(k, v) for k, v in response.headers.raw if k.lower() not in _HOP_BY_HOP],
+            })
+            try:
+                async for chunk in response.aiter_raw():
+                    if chunk:
+                        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            except Exception as e:
+                # 응답을 보내기 시작했으므로 오류 응답으로 바꿀 수 없음
+                raise _ResponseStarted() from e
+        finally:
+            await response.aclose()
+
+    async def _error(self, scope, receive, send, status: int, error: str, message: str) -> None:
+        response = JSONResponse(
+            status_code=status,
+            content={"success": False, "error": error, "message": message},
+        )
+        await response(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+class _ResponseStarted(Exception):
+    """응답 전송 중 실패 (재시도/오류 응답 불가)"""
+
+
+class _RequestBody:
+    """ASGI 요청 본문을 httpx 스트림으로 전달 (읽기 시작 여부 기록)"""
+
+    def __init__(self, scope, receive):
+        self.receive = receive
+        self.started = False
+        self.has_body = any(
+            key in (b"content-length", b"transfer-encoding") for key, _ in scope["headers"]
+        )
+
+    async def __aiter__(self):
+        self.started = True
+        while True:
+            message = await self.receive()
+            if message["type"] == "http.disconnect":
+                return
+            body = message.get("body", b"")
+            if body:
+                yield body
+            if not message.get("more_body", False):
+                return
+
+
+def create_dispatcher(config: Optional[Any] = None) -> TenantDispatcher:
+    """
+    설정(환경변수)으로 디스패처 생성
+
+    uvicorn mt_paas.sharding:create_dispatcher --factory --port 11000
+    """
+    from mt_paas.config import get_config
+
+    cfg = config or get_config()
+    if not cfg.sharding.workers:
+        raise ValueError("MT_SHARDING_WORKERS is empty")
+    return TenantDispatcher.from_config(cfg)
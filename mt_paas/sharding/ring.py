@@ -0,0 +1,91 @@
+"""
+일관 해시 링 (consistent hashing)
+
+테넌트 ID를 워커에 고정 배정합니다. 워커마다 가상 노드를 링에 여러 개 두어
+분포를 고르게 하고, 워커를 추가/제거해도 그 워커의 몫(약 1/N)만 옮겨집니다.
+"""
+
+from bisect import bisect_right
+from hashlib import blake2b
+from typing import Optional, Dict, List, Iterable, Container
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    일관 해시 링
+
+    Example:
+        ring = HashRing(["worker-0", "worker-1", "worker-2"])
+        ring.get("hallym_univ")      # "worker-1" (항상 같은 워커)
+
+        ring.add("worker-3")         # 약 1/4의 테넌트만 worker-3으로 이동
+    """
+
+    def __init__(self, nodes: Optional[Iterable[str]] = None, vnodes: int = 160):
+        """
+        Args:
+            nodes: 초기 노드 이름
+            vnodes: 노드당 가상 노드 수 (클수록 분포가 고름)
+        """
+        self.vnodes = vnodes
+        self._weights: Dict[str, int] = {}
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        for node in nodes or []:
+            self._weights[node] = 1
+        self._rebuild()
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._weights)
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._weights
+
+    def add(self, node: str, weight: int = 1) -> None:
+        """노드 추가 (weight배 가상 노드)"""
+        self._weights[node] = max(1, weight)
+        self._rebuild()
+
+    def remove(self, node: str) -> None:
+        """노드 제거 (그 노드의 키는 링의 다음 노드로 이동)"""
+        if self._weights.pop(node, None) is not None:
+            self._rebuild()
+
+    def get(self, key: str, skip: Optional[Container[str]] = None) -> Optional[str]:
+        """
+        key를 담당하는 노드
+
+        Args:
+            key: 테넌트 ID
+            skip: 건너뛸 노드 (장애 노드) - 링을 따라 다음 노드 반환
+        """
+        points = self._points
+        if not points:
+            return None
+        index = bisect_right(points, _hash(key))
+        if not skip:
+            return self._owners[index % len(points)]
+
+        owners = self._owners
+        for offset in range(len(points)):
+            owner = owners[(index + offset) % len(points)]
+            if owner not in skip:
+                return owner
+        return None
+
+    def _rebuild(self) -> None:
+        ring = sorted(
+            (_hash(f"{node}#{i}"), node)
+            for node, weight in self._weights.items()
+            for i in range(self.vnodes * weight)
+        )
+        self._points = [point for point, _ in ring]
+        self._owners = [node for _, node in ring]
@@ -43,6 +43,9 @@ MT PaaS 표준 API 헬퍼
 
 # v1 - 기존 API (생명주기만)
 from .router import create_standard_router
+from .auth import APIKeyVerifier
+from .batch import BatchExecutor
+from .cache import ResponseCache
 from .handler import StandardAPIHandler, TenantExistsError, TenantNotFoundError
 from .models import (
     HealthResponse,
@@ -56,6 +59,10 @@ from .models import (
     ErrorResponse,
     ErrorCodes,
     ContactInfo,
+    BatchItem,
+    BatchRequest,
+    BatchItemResult,
+    BatchResponse,
 )
 
 # v2 - 확장 API (대시보드/사용자관리/리소스/설정)
@@ -111,6 +118,8 @@ from .models_v2 import (
 __all__ = [
     # v1 - 기존
     "create_standard_router",
+    "APIKeyVerifier",
+    "BatchExecutor",
     "StandardAPIHandler",
     "TenantExistsError",
     "TenantNotFoundError",
@@ -125,9 +134,14 @@ __all__ = [
     "ErrorResponse",
     "ErrorCodes",
     "ContactInfo",
+    "BatchItem",
+    "BatchRequest",
+    "BatchItemResult",
+    "BatchResponse",
     # v2 - 확장
     "create_standard_router_v2",
     "create_service_market_compat_router",
+    "ResponseCache",
     "StandardAPIHandlerV2",
     "UserExistsError",
     "UserNotFoundError",
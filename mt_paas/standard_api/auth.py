@@ -0,0 +1,277 @@
+"""
+표준 API 키 검증
+
+키를 요청마다 환경변수에서 읽어 문자열로 비교하는 대신, 한 번 읽어 해시로 보관하고
+등록된 모든 키와 상수 시간 비교(hmac.compare_digest)합니다.
+
+- 키 출처: 환경변수(쉼표로 여러 개), 파일(한 줄에 하나), 콜백
+- 교체: rotate()로 새 키를 추가하고 기존 키는 유예 기간 뒤 만료 (두 키가 함께 유효한 구간)
+- 파일/콜백은 reload_interval마다 다시 읽음 (파일은 수정 시각이 바뀐 경우만)
+- 키별 요청 수 집계 (키 원문 대신 해시 앞 8자리 key_id로 구분)
+
+키 파일 형식:
+    # 주석
+    mk_live_new                                  # 만료 없음
+    mk_live_old  2026-11-01T00:00:00Z            # 이 시각까지 유효
+    sha256:9f86d081884c7d65...                   # 원문 대신 SHA-256 해시
+"""
+
+import hashlib
+import hmac
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional, Any, Dict, List, Iterable, Callable, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# 키 항목: 원문 또는 (원문, 만료 시각)
+KeySpec = Union[str, Tuple[str, Optional[float]]]
+
+
+class _Key:
+    """등록된 키 1개 (해시만 보관)"""
+    __slots__ = ("digest", "key_id", "not_after")
+
+    def __init__(self, digest: bytes, not_after: Optional[float] = None):
+        self.digest = digest
+        self.key_id = digest.hex()[:8]
+        self.not_after = not_after
+
+    def is_valid(self, now: float) -> bool:
+        return self.not_after is None or now < self.not_after
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.sha256(key.encode("utf-8")).digest()
+
+
+def _parse_time(value: Any) -> Optional[float]:
+    """만료 시각 (epoch 초, datetime, ISO 문자열)"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _to_key(spec: KeySpec) -> Optional[_Key]:
+    if isinstance(spec, tuple):
+        raw, not_after = spec
+    else:
+        raw, not_after = spec, None
+    raw = raw.strip()
+    if not raw:
+        return None
+    if raw.startswith("sha256:"):
+        digest = bytes.fromhex(raw[len("sha256:"):])
+    else:
+        digest = _digest(raw)
+    return _Key(digest, _parse_time(not_after))
+
+
+class APIKeyVerifier:
+    """
+    API 키 검증기
+
+    Example:
+        verifier = APIKeyVerifier(env="MARKET_API_KEY", path="/etc/mt_paas/api_keys")
+        router = create_standard_router_v2(handler, api_key_verifier=verifier)
+
+        # 키 교체: 새 키 추가, 기존 키는 1시간 뒤 만료
+        verifier.rotate("mk_live_new", grace_seconds=3600)
+
+        verifier.stats()
+        # {"keys": {"3f2a9c1e": {"requests": 1204, "expires_at": None}}, "rejected": 3}
+    """
+
+    def __init__(
+        self,
+        keys: Optional[Iterable[KeySpec]] = None,
+        env: Optional[str] = "MARKET_API_KEY",
+        path: Optional[str] = None,
+        loader: Optional[Callable[[], Iterable[KeySpec]]] = None,
+        reload_interval: float = 30,
+    ):
+        """
+        Args:
+            keys: 직접 등록할 키 (원문 또는 (원문, 만료 시각))
+            env: 키를 읽을 환경변수 (쉼표로 여러 개)
+            path: 키 파일 경로
+            loader: 키 목록을 반환하는 함수
+            reload_interval: 파일/loader 재확인 간격 (초, 0이면 안 함)
+        """
+        self.env = env
+        self.path = path
+        self.loader = loader
+        self.reload_interval = reload_interval
+
+        self._static: List[_Key] = [k for k in map(_to_key, keys or []) if k is not None]
+        # rotate()로 추가/만료 지정한 키 (다시 읽어도 유지)
+        self._rotated: Dict[bytes, Optional[float]] = {}
+        self._keys: List[_Key] = []
+        # 출처별 마지막으로 읽기에 성공한 키 (그 출처를 읽지 못할 때만 사용)
+        self._source_keys: Dict[str, List[Optional[_Key]]] = {}
+        self._loaded = False
+        self._checked_at = 0.0
+        self._file_mtime: Optional[int] = None
+
+        self.counts: Dict[str, int] = {}
+        self.rejected = 0
+
+    @property
+    def configured(self) -> bool:
+        """유효한 키가 1개 이상 있는지"""
+        self._ensure_loaded()
+        now = time.time()
+        return any(key.is_valid(now) for key in self._keys)
+
+    # =========================================================================
+    # 검증
+    # =========================================================================
+
+    def verify(self, api_key: Optional[str]) -> Optional[str]:
+        """
+        키 검증
+
+        Returns:
+            일치한 키의 key_id (불일치/만료면 None)
+        """
+        self._ensure_loaded()
+        if not api_key:
+            self.rejected += 1
+            return None
+
+        digest = _digest(api_key)
+        matched = None
+        # 어느 키와 일치했는지 시간 차이로 드러나지 않도록 모든 키와 비교
+        for key in self._keys:
+            if hmac.compare_digest(digest, key.digest):
+                matched = key
+
+        if matched is None or not matched.is_valid(time.time()):
+            self.rejected += 1
+            return None
+        self.counts[matched.key_id] = self.counts.get(matched.key_id, 0) + 1
+        return matched.key_id
+
+    # =========================================================================
+    # 로드/교체
+    # =========================================================================
+
+    def reload(self) -> None:
+        """
+        모든 출처에서 키를 다시 읽음
+
+        출처에서 빠진 키는 제거됩니다. 읽기에 실패한 출처는 그 출처에서
+        마지막으로 읽은 키만 유지합니다 (다른 출처의 이전 키는 되살리지 않음).
+        """
+        keys: Dict[bytes, _Key] = {}
+
+        def add(key: Optional[_Key]) -> None:
+            if key is not None:
+                keys[key.digest] = _Key(key.digest, key.not_after)
+
+        for key in self._static:
+            add(key)
+        sources = []
+        if self.env:
+            sources.append(("env", lambda: os.getenv(self.env, "").split(",")))
+        if self.path:
+            sources.append(("file", self._read_file))
+        if self.loader is not None:
+            sources.append(("loader", self.loader))
+        for name, source in sources:
+            # 출처 단위로 모두 읽은 뒤 반영 (일부 항목만 반영되지 않도록)
+            try:
+                loaded = self._source_keys[name] = [_to_key(spec) for spec in source()]
+            except Exception as e:
+                logger.warning(f"API key reload from {name} failed, keeping its previous keys: {e}")
+                loaded = self._source_keys.get(name, [])
+            for key in loaded:
+                add(key)
+
+        for digest, not_after in self._rotated.items():
+            key = keys.get(digest)
+            if key is None:
+                keys[digest] = _Key(digest, not_after)
+            elif not_after is not None:
+                key.not_after = not_after if key.not_after is None else min(key.not_after, not_after)
+
+        self._keys = list(keys.values())
+        self._loaded = True
+        self._checked_at = time.monotonic()
+
+    def rotate(self, new_key: str, grace_seconds: float = 3600) -> str:
+        """
+        새 키를 추가하고 기존 키는 grace_seconds 뒤 만료
+
+        Returns:
+            새 키의 key_id
+        """
+        self._ensure_loaded()
+        expires_at = time.time() + grace_seconds
+        for key in self._keys:
+            if key.not_after is None or key.not_after > expires_at:
+                self._rotated[key.digest] = expires_at
+        digest = _digest(new_key)
+        self._rotated[digest] = None
+        self.reload()
+        return digest.hex()[:8]
+
+    def revoke(self, key_id: str) -> None:
+        """key_id의 키를 즉시 만료"""
+        self._ensure_loaded()
+        now = time.time()
+        for key in self._keys:
+            if key.key_id == key_id:
+                self._rotated[key.digest] = now
+        self.reload()
+
+    def stats(self) -> Dict[str, Any]:
+        """키별 요청 수, 만료 시각, 거절 수"""
+        self._ensure_loaded()
+        return {
+            "keys": {
+                key.key_id: {
+                    "requests": self.counts.get(key.key_id, 0),
+                    "expires_at": key.not_after,
+                }
+                for key in self._keys
+            },
+            "rejected": self.rejected,
+        }
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.reload()
+            return
+        if self.reload_interval <= 0 or (self.path is None and self.loader is None):
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        if self.loader is None:
+            # 파일만 있으면 수정된 경우에만 다시 읽음
+            try:
+                if os.stat(self.path).st_mtime_ns == self._file_mtime:
+                    return
+            except OSError:
+                return
+        self.reload()
+
+    def _read_file(self) -> List[KeySpec]:
+        specs: List[KeySpec] = []
+        self._file_mtime = os.stat(self.path).st_mtime_ns
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                parts = line.split()
+                specs.append((parts[0], parts[1] if len(parts) > 1 else None))
+        return specs
@@ -0,0 +1,205 @@
+"""
+표준 API 배치 실행
+
+POST {prefix}/batch로 받은 하위 요청들을 HTTP 왕복 없이 같은 앱의 라우터로 바로 실행합니다.
+하위 요청마다 라우팅, 파라미터 검증, API 키 인증, 에러 처리, 응답 캐시가 개별 요청과 똑같이 적용되지만,
+앱 미들웨어(테넌트 식별, 속도 제한, 쿼터, 승인 제어, 메트릭 등)는 배치 요청 1건으로 한 번만 거치고
+하위 요청에는 적용되지 않습니다. 그래서 읽기(GET)만 허용합니다.
+
+- 조회만 허용: GET (쓰기는 개별 요청으로 보내야 미들웨어의 제한/집계를 거침)
+- 표준 경로만 허용: {prefix}/tenant/... 와 {prefix}/health
+  (NDJSON 스트리밍 내보내기는 결과에 통째로 버퍼링되므로 제외 → 개별 요청으로)
+- 하위 요청은 배치 요청의 테넌트 컨텍스트를 물려받지 않음 (경로의 tenant_id 기준)
+- 워커 전체에서 동시에 실행하는 하위 요청 수를 세마포어로 제한
+- 결과는 요청 순서대로, 하위 요청별 상태 코드 포함
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import AsyncExitStack
+from typing import Optional, Any, List, Callable
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from mt_paas.middleware.tenant import clear_current_tenant
+
+from .models import BatchItem, BatchRequest, BatchItemResult, BatchResponse, ErrorCodes
+
+logger = logging.getLogger(__name__)
+
+# 하위 요청은 앱 미들웨어를 거치지 않으므로 읽기만 허용
+_ALLOWED_METHODS = frozenset({"GET"})
+
+# 스트리밍 응답 경로 (배치에서는 전체를 메모리에 모아야 하므로 제외)
+_STREAMING_SUFFIXES = ("/users/export", "/resources/export")
+
+# 하위 요청에 전달하지 않는 배치 요청 헤더
+_DROP_HEADERS = frozenset({
+    b"content-length",
+    b"content-type",
+    b"transfer-encoding",
+    b"if-none-match",
+    b"if-modified-since",
+})
+
+
+def _error(status: int, error: str, message: str) -> BatchItemResult:
+    return BatchItemResult(status=status, body={"success": False, "error": error, "message": message})
+
+
+class BatchExecutor:
+    """
+    배치 하위 요청 실행기
+
+    Example:
+        executor = BatchExecutor(prefix="/mt", concurrency=16)
+        results = await executor.run(request, [BatchItem(path="/mt/tenant/t1/status")])
+    """
+
+    def __init__(self, prefix: str = "/mt", concurrency: int = 16, max_items: int = 1000):
+        """
+        Args:
+            prefix: 표준 API 경로 prefix
+            concurrency: 동시에 실행할 하위 요청 수 (워커 전체)
+            max_items: 배치 1건의 최대 하위 요청 수
+        """
+        self.prefix = prefix.rstrip("/")
+        self.concurrency = concurrency
+        self.max_items = max_items
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def check(self, item: BatchItem) -> Optional[str]:
+        """허용되지 않는 하위 요청이면 사유 반환"""
+        if item.method.upper() not in _ALLOWED_METHODS:
+            return f"Method not allowed in batch: {item.method}"
+        path = item.path.split("?", 1)[0]
+        if "//" in path or "/../" in path or path.endswith("/.."):
+            return f"Invalid path: {item.path}"
+        if path != f"{self.prefix}/health" and not path.startswith(f"{self.prefix}/tenant/"):
+            return f"Path not allowed in batch: {item.path}"
+        if path.rstrip("/").endswith(_STREAMING_SUFFIXES):
+            return f"Streaming endpoint not allowed in batch: {item.path}"
+        return None
+
+    async def run(self, request: Request, items: List[BatchItem]) -> List[BatchItemResult]:
+        """하위 요청을 동시에 실행하고 요청 순서대로 결과 반환"""
+        parent = request.scope
+        router = parent.get("router") or request.app.router
+        headers = [(k, v) for k, v in parent["headers"] if k not in _DROP_HEADERS]
+        return list(await asyncio.gather(*(self._run_one(parent, router, headers, item) for item in items)))
+
+    async def _run_one(self, parent: dict, router: Any, headers: list, item: BatchItem) -> BatchItemResult:
+        reason = self.check(item)
+        if reason is not None:
+            return _error(400, ErrorCodes.INVALID_REQUEST, reason)
+
+        path, _, query = item.path.partition("?")
+        query_parts = [query] if query else []
+        if item.params:
+            query_parts.append(urlencode(item.params, doseq=True))
+
+        root_path = parent.get("root_path", "")
+        full_path = root_path + path
+        scope = {
+            "type": "http",
+            "asgi": parent.get("asgi", {"version": "3.0"}),
+            "http_version": parent.get("http_version", "1.1"),
+            "method": item.method.upper(),
+            "scheme": parent.get("scheme", "http"),
+            "server": parent.get("server"),
+            "client": parent.get("client"),
+            "root_path": root_path,
+            "path": full_path,
+            "raw_path": full_path.encode("utf-8"),
+            "query_string": "&".join(query_parts).encode("latin-1"),
+            "headers": headers,
+            "app": parent.get("app"),
+            "router": router,
+            "state": dict(parent.get("state", {})),
+        }
+        if "starlette.exception_handlers" in parent:
+            scope["starlette.exception_handlers"] = parent["starlette.exception_handlers"]
+
+        body_sent = False
+
+        async def receive() -> dict:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # 하위 요청은 끊기지 않음 (응답이 끝날 때까지 대기)
+            await asyncio.get_running_loop().create_future()
+
+        status = 500
+        content_type = b""
+        chunks: List[bytes] = []
+
+        async def send(message: dict) -> None:
+            nonlocal status, content_type
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for key, value in message.get("headers", []):
+                    if key.lower() == b"content-type":
+                        content_type = value
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        # gather가 하위 요청마다 컨텍스트를 복사하므로 여기서 지워도 배치 요청에는 영향 없음
+        clear_current_tenant()
+
+        async with self._semaphore:
+            try:
+                # 앱 미들웨어가 요청마다 만드는 정리 스택 (업로드 파일 등)
+                async with AsyncExitStack() as stack:
+                    scope["fastapi_middleware_astack"] = stack
+                    await router(scope, receive, send)
+            except StarletteHTTPException as e:
+                # 라우팅 단계 오류 (404/405)는 앱 수준 에러 처리로 넘어가므로 직접 변환
+                return BatchItemResult(status=e.status_code, body={"detail": e.detail})
+            except Exception as e:
+                logger.warning(f"Batch sub-request {item.method} {item.path} failed: {e}")
+                return _error(500, ErrorCodes.INTERNAL_ERROR, str(e))
+
+        raw = b"".join(chunks)
+        if not raw:
+            return BatchItemResult(status=status)
+        if content_type.startswith(b"application/json"):
+            return BatchItemResult(status=status, body=json.loads(raw))
+        return BatchItemResult(status=status, body=raw.decode("utf-8", errors="replace"))
+
+
+def add_batch_route(
+    router: APIRouter,
+    executor: BatchExecutor,
+    verify_api_key: Callable,
+) -> None:
+    """표준 API 라우터에 POST /batch 추가"""
+
+    @router.post(
+        "/batch",
+        response_model=BatchResponse,
+        summary="배치 요청",
+        description=(
+            "여러 표준 API 조회(GET) 요청을 한 번에 실행하고 요청 순서대로 결과를 반환합니다. "
+            "하위 요청에는 앱 미들웨어(속도 제한, 쿼터, 메트릭 등)가 따로 적용되지 않습니다."
+        )
+    )
+    async def batch(
+        http_request: Request,
+        request: BatchRequest,
+        api_key: str = Depends(verify_api_key)
+    ) -> BatchResponse:
+        """배치 요청 실행"""
+        if len(request.requests) > executor.max_items:
+            raise HTTPException(
+                status_code=413,
+                detail={
+                    "success": False,
+                    "error": ErrorCodes.INVALID_REQUEST,
+                    "message": f"Too many requests in batch (max {executor.max_items})"
+                }
+            )
+        return BatchResponse(results=await executor.run(http_request, request.requests))
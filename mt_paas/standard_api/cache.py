@@ -0,0 +1,195 @@
+"""
+표준 API 응답 캐시 (ETag)
+
+마켓 대시보드가 반복 조회하는 v2 읽기 API(통계, 비용, 활성 사용자, 리소스, 설정)의
+직렬화된 응답을 테넌트 + 쿼리 파라미터별로 짧게 캐시합니다.
+
+- 엔드포인트별 TTL
+- 응답 본문 해시로 ETag 생성, If-None-Match가 일치하면 304 (본문 전송 없음)
+- 같은 키의 동시 미스는 핸들러를 한 번만 호출
+- 설정 변경, 사용자 생성/수정/삭제, 활성화/비활성화, 생명주기 이벤트 시 테넌트 단위 무효화
+"""
+
+from collections import OrderedDict
+from hashlib import blake2b
+from time import monotonic
+from typing import Optional, Any, Dict, Set, Tuple, Callable, Awaitable
+
+from mt_paas.core.loader import SingleFlight
+
+# 엔드포인트별 기본 TTL (초)
+DEFAULT_TTLS: Dict[str, float] = {
+    "stats": 30,
+    "costs": 60,
+    "top_users": 30,
+    "resources": 15,
+    "settings": 60,
+}
+
+CacheKey = Tuple[str, str, Tuple[Any, ...]]
+
+
+class CachedResponse:
+    """직렬화된 응답 1개"""
+    __slots__ = ("body", "etag", "expires_at", "ttl")
+
+    def __init__(self, body: bytes, ttl: float):
+        self.body = body
+        self.etag = '"' + blake2b(body, digest_size=16).hexdigest() + '"'
+        self.ttl = ttl
+        self.expires_at = monotonic() + ttl
+
+    @property
+    def max_age(self) -> int:
+        """남은 유효 시간 (Cache-Control max-age)"""
+        return max(0, int(self.expires_at - monotonic()))
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """If-None-Match 헤더와 ETag 일치 여부 (약한 비교)"""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*" or tag.removeprefix("W/") == self.etag:
+                return True
+        return False
+
+
+class ResponseCache:
+    """
+    표준 API v2 응답 캐시
+
+    Example:
+        cache = ResponseCache(ttls={"stats": 60})
+        cache.bind_lifecycle(mt.lifecycle)
+
+        router = create_standard_router_v2(handler, response_cache=cache)
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 10000):
+        """
+        Args:
+            ttls: 엔드포인트별 TTL (기본값에 덮어씀, 0이면 해당 엔드포인트 캐시 안 함)
+            max_entries: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+        """
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._by_tenant: Dict[str, Set[CacheKey]] = {}
+        # 무효화 세대 (계산 중 무효화되면 결과를 저장하지 않음)
+        self._generations: Dict[str, int] = {}
+        self._inflight = SingleFlight()
+
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def enabled(self, endpoint: str) -> bool:
+        return self.ttls.get(endpoint, 0) > 0
+
+    def get(self, endpoint: str, tenant_id: str, params: Tuple[Any, ...] = ()) -> Optional[CachedResponse]:
+        """캐시된 응답 (없거나 만료되면 None)"""
+        key = (endpoint, tenant_id, params)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= monotonic():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def get_or_compute(
+        self,
+        endpoint: str,
+        tenant_id: str,
+        params: Tuple[Any, ...],
+        compute: Callable[[], Awaitable[bytes]],
+    ) -> CachedResponse:
+        """
+        캐시를 거친 응답
+
+        캐시에 없으면 compute(직렬화된 본문 반환)를 호출하고 저장합니다.
+        compute는 별도 태스크로 실행되므로 처음 요청한 쪽이 취소(연결 종료)되어도
+        함께 기다리던 요청은 결과를 받습니다.
+        compute가 예외를 던지면 캐시하지 않습니다.
+        """
+        entry = self.get(endpoint, tenant_id, params)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        key = (endpoint, tenant_id, params)
+        generation = self._generations.get(tenant_id, 0)
+        return await self._inflight.do(
+            key,
+            lambda: self._compute(endpoint, compute),
+            on_result=lambda entry: self._finish(key, generation, entry),
+        )
+
+    async def _compute(self, endpoint: str, compute: Callable[[], Awaitable[bytes]]) -> CachedResponse:
+        return CachedResponse(await compute(), self.ttls.get(endpoint, 0))
+
+    def _finish(self, key: CacheKey, generation: int, entry: CachedResponse) -> None:
+        """계산 완료 시 결과 저장 (계산 중 무효화되었으면 저장하지 않음)"""
+        if self._generations.get(key[1], 0) == generation:
+            self._store(key, entry)
+
+    def invalidate(self, tenant_id: str) -> None:
+        """테넌트의 모든 캐시 응답 제거 (진행 중인 계산 결과도 저장하지 않음)"""
+        self._generations[tenant_id] = self._generations.get(tenant_id, 0) + 1
+        for key in self._by_tenant.pop(tenant_id, set()):
+            self._entries.pop(key, None)
+        for key in self._inflight:
+            if key[1] == tenant_id:
+                self._inflight.forget(key)
+
+    def clear(self) -> None:
+        """전체 항목 제거"""
+        for tenant_id in list(self._by_tenant):
+            self.invalidate(tenant_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """항목 수/적중/304 응답 수"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+    def _store(self, key: CacheKey, entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._by_tenant.setdefault(key[1], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            self._unindex(old_key)
+
+    def _discard(self, key: CacheKey) -> None:
+        self._entries.pop(key, None)
+        self._unindex(key)
+
+    def _unindex(self, key: CacheKey) -> None:
+        keys = self._by_tenant.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_tenant[key[1]]
+
+    # =========================================================================
+    # 생명주기 연동
+    # =========================================================================
+
+    def bind_lifecycle(self, lifecycle: Any) -> None:
+        """
+        TenantLifecycle 이벤트에 연결
+
+        생성/프로비저닝/활성화/정지/삭제 후 해당 테넌트 응답을 무효화합니다.
+        """
+        lifecycle.on_change(self.invalidate)
@@ -0,0 +1,159 @@
+"""
+표준 API 대량 내보내기 (NDJSON 스트리밍)
+
+월말 정산, 사용자/리소스 백업처럼 데이터를 한 번에 가져갈 때, 페이지나 테넌트마다
+요청하는 대신 한 줄에 JSON 객체 하나씩(application/x-ndjson) 만들어지는 대로 내려보냅니다.
+핸들러의 비동기 제너레이터를 그대로 흘려보내므로 서버 메모리는 항목 수와 무관합니다.
+
+- 첫 항목을 만들기 전의 오류는 일반 에러 응답 (400/404/500/501)
+- 스트리밍 도중 오류가 나면 마지막 줄에 {"success": false, ...} 를 쓰고 종료
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from .handler import StandardAPIHandler, TenantNotFoundError
+from .models import ErrorCodes
+from .models_v2 import UserFilters, UserRole, UserStatus, ResourceFilters, ResourceType
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _line(item: Any) -> bytes:
+    if isinstance(item, BaseModel):
+        return item.model_dump_json(by_alias=True).encode("utf-8") + b"\n"
+    return json.dumps(item, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+
+def _detail(error: str, message: Any) -> dict:
+    return {"success": False, "error": error, "message": str(message)}
+
+
+async def ndjson_response(items: AsyncIterator[Any]) -> StreamingResponse:
+    """
+    비동기 이터레이터를 NDJSON 스트리밍 응답으로 변환
+
+    첫 항목을 미리 꺼내, 시작 전 오류는 상태 코드로 돌려줍니다.
+    """
+    try:
+        first = await items.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except NotImplementedError as e:
+        raise HTTPException(status_code=501, detail=_detail(ErrorCodes.INTERNAL_ERROR, e))
+    except TenantNotFoundError as e:
+        raise HTTPException(status_code=404, detail=_detail(ErrorCodes.TENANT_NOT_FOUND, e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=_detail(ErrorCodes.INTERNAL_ERROR, e))
+
+    async def body() -> AsyncIterator[bytes]:
+        if first is None:
+            return
+        try:
+            yield _line(first)
+            async for item in items:
+                yield _line(item)
+        except Exception as e:
+            # 상태 코드를 이미 보냈으므로 마지막 줄로 중단을 알림
+            logger.warning(f"NDJSON export aborted: {e}")
+            yield _line(_detail(ErrorCodes.INTERNAL_ERROR, e))
+        finally:
+            await items.aclose()
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def add_usage_export_route(
+    router: APIRouter,
+    handler: StandardAPIHandler,
+    verify_api_key: Callable,
+    concurrency: int = 8,
+) -> None:
+    """표준 API 라우터에 GET /usage (전체 테넌트 사용량 NDJSON) 추가"""
+
+    @router.get(
+        "/usage",
+        response_class=StreamingResponse,
+        responses={
+            200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "UsageResponse 한 줄씩"},
+            501: {"description": "Bulk export not implemented"},
+        },
+        summary="전체 사용량 내보내기",
+        description="기간 내 모든 테넌트의 사용량을 NDJSON(UsageResponse 한 줄씩)으로 스트리밍합니다."
+    )
+    async def export_usage(
+        period: str = Query(..., description="조회 기간 (YYYY-MM)", example="2026-01"),
+        api_key: str = Depends(verify_api_key)
+    ) -> StreamingResponse:
+        """전체 사용량 내보내기"""
+        try:
+            datetime.strptime(period, "%Y-%m")
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=_detail(ErrorCodes.INVALID_REQUEST, "period must be in YYYY-MM format")
+            )
+        return await ndjson_response(handler.export_usage(period, concurrency))
+
+
+def add_tenant_export_routes(
+    router: APIRouter,
+    handler: Any,
+    verify_api_key: Callable,
+) -> None:
+    """
+    v2 라우터에 GET /tenant/{tenant_id}/users/export, /resources/export 추가
+
+    /tenant/{tenant_id}/users/{user_id}보다 먼저 등록해야 합니다.
+    """
+
+    @router.get(
+        "/tenant/{tenant_id}/users/export",
+        response_class=StreamingResponse,
+        responses={
+            200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "UserInfo 한 줄씩"},
+            404: {"description": "Tenant not found"},
+        },
+        summary="사용자 내보내기",
+        description="테넌트의 모든 사용자를 NDJSON(UserInfo 한 줄씩)으로 스트리밍합니다."
+    )
+    async def export_users(
+        tenant_id: str,
+        role: Optional[UserRole] = Query(default=None, description="역할 필터"),
+        status: Optional[UserStatus] = Query(default=None, description="상태 필터"),
+        search: Optional[str] = Query(default=None, description="검색어"),
+        api_key: str = Depends(verify_api_key)
+    ) -> StreamingResponse:
+        """사용자 내보내기"""
+        filters = UserFilters(role=role, status=status, search=search)
+        return await ndjson_response(handler.export_users(tenant_id, filters))
+
+    @router.get(
+        "/tenant/{tenant_id}/resources/export",
+        response_class=StreamingResponse,
+        responses={
+            200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "ResourceItem 한 줄씩"},
+            404: {"description": "Tenant not found"},
+        },
+        summary="리소스 내보내기",
+        description="테넌트의 모든 리소스를 NDJSON(ResourceItem 한 줄씩)으로 스트리밍합니다."
+    )
+    async def export_resources(
+        tenant_id: str,
+        type: Optional[ResourceType] = Query(default=None, description="리소스 타입"),
+        search: Optional[str] = Query(default=None, description="검색어"),
+        api_key: str = Depends(verify_api_key)
+    ) -> StreamingResponse:
+        """리소스 내보내기"""
+        filters = ResourceFilters(type=type, search=search)
+        return await ndjson_response(handler.export_resources(tenant_id, filters))
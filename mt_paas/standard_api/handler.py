@@ -4,8 +4,9 @@
 서비스 업체는 이 클래스를 상속받아 비즈니스 로직을 구현합니다.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, List, AsyncIterator
 from .models import (
     ActivateRequest,
     ActivateResponse,
@@ -228,6 +229,81 @@ class StandardAPIHandler(ABC):
         """
         pass
 
+    # =========================================================================
+    # Bulk Export (선택)
+    # =========================================================================
+
+    async def list_tenant_ids(self) -> List[str]:
+        """
+        전체 테넌트 ID 목록 (선택적 오버라이드)
+
+        export_usage 기본 구현이 사용합니다.
+        구현하지 않으면 GET /mt/usage는 501을 반환합니다.
+        """
+        raise NotImplementedError("list_tenant_ids is not implemented")
+
+    async def export_usage(
+        self,
+        period: str,
+        concurrency: int = 8
+    ) -> AsyncIterator[UsageResponse]:
+        """
+        전체 테넌트 사용량 (GET /mt/usage 스트리밍 응답)
+
+        기본 구현은 list_tenant_ids()의 테넌트마다 get_tenant_usage를
+        최대 concurrency개씩 동시에 호출하고, 끝나는 순서대로 반환합니다.
+        조회 중 삭제된 테넌트(TenantNotFoundError)는 건너뜁니다.
+        다른 예외가 나면 그때까지 끝난 결과를 모두 반환한 뒤 그 예외를 다시 던집니다.
+
+        한 번의 집계 쿼리로 구할 수 있으면 오버라이드하세요.
+
+        Example:
+            async def export_usage(self, period, concurrency=8):
+                rows = await self.db.fetch(
+                    "SELECT tenant_id, COUNT(DISTINCT user_id) AS active_users, ... "
+                    "FROM usage_log WHERE period = $1 GROUP BY tenant_id",
+                    period
+                )
+                for row in rows:
+                    yield UsageResponse(
+                        tenant_id=row["tenant_id"],
+                        period=period,
+                        usage=UsageData(active_users=row["active_users"], ...)
+                    )
+        """
+        tenant_ids = iter(await self.list_tenant_ids())
+        pending = set()
+
+        def fill() -> None:
+            for tenant_id in tenant_ids:
+                pending.add(asyncio.ensure_future(self.get_tenant_usage(tenant_id, period)))
+                if len(pending) >= concurrency:
+                    return
+
+        fill()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+                results, errors = [], []
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        results.append(task.result())
+                    elif not isinstance(error, TenantNotFoundError):
+                        errors.append(error)
+                if not errors:
+                    fill()
+                # 같이 끝난 테넌트 결과는 버리지 않고 먼저 보낸 뒤 실패를 알림
+                for result in results:
+                    yield result
+                if errors:
+                    raise errors[0]
+        finally:
+            # 소비자가 중간에 멈추면 (연결 종료 등) 남은 조회 취소
+            for task in pending:
+                task.cancel()
+
     # =========================================================================
     # Optional Hooks
     # =========================================================================
@@ -5,7 +5,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Any, AsyncIterator
 from .handler import StandardAPIHandler, TenantExistsError, TenantNotFoundError
 from .models_v2 import (
     # 기존 모델
@@ -30,6 +30,7 @@ from .models_v2 import (
     # 신규 모델 - Resources
     ResourceFilters,
     ResourcesResponse,
+    ResourceItem,
     # 신규 모델 - Settings
     SettingsResponse,
     UpdateSettingsRequest,
@@ -67,6 +68,10 @@ class StandardAPIHandlerV2(StandardAPIHandler):
             ...
     """
 
+    # 상위 사용자 추적기 (mt_paas.usage.TopUsersTracker, 선택)
+    # 지정하면 get_top_users 기본 구현이 추적기에서 바로 조회합니다.
+    top_users_tracker: Optional[Any] = None
+
     # =========================================================================
     # Dashboard API (신규)
     # =========================================================================
@@ -153,7 +158,8 @@ class StandardAPIHandlerV2(StandardAPIHandler):
         """
         활성 사용자 목록 조회 (선택적 구현)
 
-        기본 구현은 빈 목록을 반환합니다.
+        기본 구현은 top_users_tracker가 지정되어 있으면 추적기에서 상위 사용자를
+        반환하고 (O(K)), 없으면 빈 목록을 반환합니다.
 
         Args:
             tenant_id: 테넌트 ID
@@ -163,6 +169,9 @@ class StandardAPIHandlerV2(StandardAPIHandler):
         Returns:
             TopUsersResponse: 활성 사용자 목록
         """
+        if self.top_users_tracker is not None:
+            return self.top_users_tracker.top_users_response(tenant_id, period, limit)
+
         return TopUsersResponse(
             tenant_id=tenant_id,
             period=period,
@@ -345,6 +354,44 @@ class StandardAPIHandlerV2(StandardAPIHandler):
         """
         pass
 
+    async def export_users(
+        self,
+        tenant_id: str,
+        filters: UserFilters
+    ) -> AsyncIterator[UserInfo]:
+        """
+        테넌트 사용자 전체 내보내기 (GET .../users/export 스트리밍 응답)
+
+        filters의 limit/offset은 무시합니다.
+        기본 구현은 list_users를 최대 페이지 크기로 반복 호출하며, 빈 페이지를 받거나
+        total까지 읽으면 끝냅니다 (서비스가 페이지 크기를 더 작게 제한해도 이어서 읽음).
+        페이지마다 OFFSET 조회와 total 집계가 반복되므로, DB 서버 측 커서로 한 번에 읽도록 오버라이드하면 페이지마다 total을 다시 세지 않고,
+        메모리도 사용자 수와 무관하게 일정합니다.
+
+        Example:
+            async def export_users(self, tenant_id, filters):
+                async with self.get_tenant_session(tenant_id) as session:
+                    query = select(User).order_by(User.id)
+                    if filters.role:
+                        query = query.where(User.role == filters.role)
+
+                    result = await session.stream_scalars(
+                        query.execution_options(yield_per=1000)
+                    )
+                    async for user in result:
+                        yield self._to_user_info(user)
+        """
+        page = filters.model_copy(update={"limit": 100, "offset": 0})
+        while True:
+            response = await self.list_users(tenant_id, page)
+            for user in response.users:
+                yield user
+            if not response.users:
+                return
+            page.offset += len(response.users)
+            if page.offset >= response.total:
+                return
+
     # =========================================================================
     # Resource API (신규)
     # =========================================================================
@@ -374,6 +421,29 @@ class StandardAPIHandlerV2(StandardAPIHandler):
             items=[]
         )
 
+    async def export_resources(
+        self,
+        tenant_id: str,
+        filters: ResourceFilters
+    ) -> AsyncIterator[ResourceItem]:
+        """
+        테넌트 리소스 전체 내보내기 (GET .../resources/export 스트리밍 응답)
+
+        filters의 limit/offset은 무시합니다.
+        기본 구현은 list_resources를 최대 페이지 크기로 반복 호출합니다 (종료 조건은 export_users와 같음).
+        export_users와 같이 서버 측 커서로 오버라이드하는 것을 권장합니다.
+        """
+        page = filters.model_copy(update={"limit": 100, "offset": 0})
+        while True:
+            response = await self.list_resources(tenant_id, page)
+            for item in response.items:
+                yield item
+            if not response.items:
+                return
+            page.offset += len(response.items)
+            if page.offset >= response.total:
+                return
+
     # =========================================================================
     # Settings API (신규)
     # =========================================================================
@@ -193,6 +193,43 @@ class UsageResponse(BaseModel):
         }
 
 
+# =============================================================================
+# Batch
+# =============================================================================
+
+class BatchItem(BaseModel):
+    """배치 하위 요청"""
+    method: str = Field(default="GET", description="HTTP 메서드 (GET만 허용)")
+    path: str = Field(..., description="표준 API 경로 (예: /mt/tenant/hallym_univ/status)")
+    params: Optional[Dict[str, Any]] = Field(default=None, description="쿼리 파라미터")
+
+
+class BatchRequest(BaseModel):
+    """배치 요청"""
+    requests: List[BatchItem] = Field(..., description="하위 요청 목록 (순서대로 결과 반환)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "requests": [
+                    {"method": "GET", "path": "/mt/tenant/hallym_univ/status"},
+                    {"method": "GET", "path": "/mt/tenant/kangwon_univ/usage", "params": {"period": "2026-01"}}
+                ]
+            }
+        }
+
+
+class BatchItemResult(BaseModel):
+    """배치 하위 요청 결과"""
+    status: int = Field(..., description="HTTP 상태 코드")
+    body: Optional[Any] = Field(default=None, description="응답 본문 (JSON이 아니면 문자열)")
+
+
+class BatchResponse(BaseModel):
+    """배치 응답"""
+    results: List[BatchItemResult] = Field(..., description="요청 순서와 같은 순서의 결과")
+
+
 # =============================================================================
 # Error Response
 # =============================================================================
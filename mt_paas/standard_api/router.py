@@ -4,10 +4,12 @@
 FastAPI 라우터를 자동으로 생성하여 표준 API를 제공합니다.
 """
 
-import os
 from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, Header, HTTPException, Query, Depends
+from .auth import APIKeyVerifier
+from .batch import BatchExecutor, add_batch_route
+from .export import add_usage_export_route
 from .handler import StandardAPIHandler, TenantExistsError, TenantNotFoundError
 from .models import (
     HealthResponse,
@@ -28,6 +30,10 @@ def create_standard_router(
     api_key_header: str = "X-Market-API-Key",
     api_key_env: str = "MARKET_API_KEY",
     require_auth: bool = True,
+    api_key_verifier: Optional[APIKeyVerifier] = None,
+    batch_concurrency: int = 16,
+    batch_max_items: int = 1000,
+    export_concurrency: int = 8,
 ) -> APIRouter:
     """
     표준 API 라우터 생성
@@ -38,6 +44,10 @@ def create_standard_router(
         api_key_header: API 키 헤더 이름
         api_key_env: API 키 환경변수 이름
         require_auth: 인증 필수 여부
+        api_key_verifier: 공유할 APIKeyVerifier (없으면 api_key_env로 생성)
+        batch_concurrency: POST {prefix}/batch 하위 요청 동시 실행 수
+        batch_max_items: 배치 1건의 최대 하위 요청 수
+        export_concurrency: GET {prefix}/usage 기본 구현의 동시 사용량 조회 수
 
     Returns:
         APIRouter: FastAPI 라우터
@@ -60,6 +70,9 @@ def create_standard_router(
     # API Key 검증 의존성
     # =========================================================================
 
+    # 키는 첫 검증 때 한 번 읽어 해시로 보관
+    verifier = api_key_verifier or APIKeyVerifier(env=api_key_env)
+
     async def verify_api_key(
         api_key: Optional[str] = Header(None, alias=api_key_header)
     ) -> str:
@@ -67,8 +80,7 @@ def create_standard_router(
         if not require_auth:
             return "no-auth"
 
-        expected_key = os.getenv(api_key_env)
-        if not expected_key:
+        if not verifier.configured:
             raise HTTPException(
                 status_code=500,
                 detail=f"API key not configured. Set {api_key_env} environment variable."
@@ -80,7 +92,7 @@ def create_standard_router(
                 detail=f"Missing {api_key_header} header"
             )
 
-        if api_key != expected_key:
+        if verifier.verify(api_key) is None:
             raise HTTPException(
                 status_code=401,
                 detail="Invalid API key"
@@ -320,4 +332,16 @@ def create_standard_router(
                 }
             )
 
+    # =========================================================================
+    # Bulk Export
+    # =========================================================================
+
+    add_usage_export_route(router, handler, verify_api_key, export_concurrency)
+
+    # =========================================================================
+    # Batch
+    # =========================================================================
+
+    add_batch_route(router, BatchExecutor(prefix, batch_concurrency, batch_max_items), verify_api_key)
+
     return router
@@ -4,10 +4,13 @@
 기존 라우터 + 대시보드/사용자관리/리소스/설정 API 엔드포인트 확장
 """
 
-import os
 from datetime import datetime
-from typing import Optional
-from fastapi import APIRouter, Header, HTTPException, Query, Depends, Path
+from typing import Optional, Any, Callable, Awaitable
+from fastapi import APIRouter, Header, HTTPException, Query, Depends, Path, Request, Response
+from .auth import APIKeyVerifier
+from .batch import BatchExecutor, add_batch_route
+from .cache import ResponseCache
+from .export import add_usage_export_route, add_tenant_export_routes
 from .handler import TenantNotFoundError
 from .handler_v2 import (
     StandardAPIHandlerV2,
@@ -58,6 +61,12 @@ def create_standard_router_v2(
     api_key_header: str = "X-Market-API-Key",
     api_key_env: str = "MARKET_API_KEY",
     require_auth: bool = True,
+    quota: Optional[Any] = None,
+    api_key_verifier: Optional[APIKeyVerifier] = None,
+    response_cache: Optional[ResponseCache] = None,
+    batch_concurrency: int = 16,
+    batch_max_items: int = 1000,
+    export_concurrency: int = 8,
 ) -> APIRouter:
     """
     표준 API v2 라우터 생성
@@ -68,6 +77,12 @@ def create_standard_router_v2(
         api_key_header: API 키 헤더 이름
         api_key_env: API 키 환경변수 이름
         require_auth: 인증 필수 여부
+        quota: 사용자 수 한도를 집행할 QuotaEngine (선택, counts_loader가 없으면 handler.list_users로 사용자 수 적재)
+        api_key_verifier: 공유할 APIKeyVerifier (없으면 api_key_env로 생성)
+        response_cache: 대시보드 읽기 API 응답 캐시 (ETag/304, 선택)
+        batch_concurrency: POST {prefix}/batch 하위 요청 동시 실행 수
+        batch_max_items: 배치 1건의 최대 하위 요청 수
+        export_concurrency: GET {prefix}/usage 기본 구현의 동시 사용량 조회 수
 
     Returns:
         APIRouter: FastAPI 라우터
@@ -86,10 +101,18 @@ def create_standard_router_v2(
 
     router = APIRouter(prefix=prefix, tags=["MT Standard API v2"])
 
+    # 사용자 수 한도는 현재 사용자 수를 알아야 집행 가능 (재시작 후 0부터 세지 않도록)
+    if quota is not None and quota.counts_loader is None:
+        from mt_paas.core.quota import counts_from_handler
+        quota.counts_loader = counts_from_handler(handler)
+
     # =========================================================================
     # API Key 검증 의존성
     # =========================================================================
 
+    # 키는 첫 검증 때 한 번 읽어 해시로 보관
+    verifier = api_key_verifier or APIKeyVerifier(env=api_key_env)
+
     async def verify_api_key(
         api_key: Optional[str] = Header(None, alias=api_key_header)
     ) -> str:
@@ -97,8 +120,7 @@ def create_standard_router_v2(
         if not require_auth:
             return "no-auth"
 
-        expected_key = os.getenv(api_key_env)
-        if not expected_key:
+        if not verifier.configured:
             raise HTTPException(
                 status_code=500,
                 detail=f"API key not configured. Set {api_key_env} environment variable."
@@ -110,7 +132,7 @@ def create_standard_router_v2(
                 detail=f"Missing {api_key_header} header"
             )
 
-        if api_key != expected_key:
+        if verifier.verify(api_key) is None:
             raise HTTPException(
                 status_code=401,
                 detail="Invalid API key"
@@ -118,6 +140,39 @@ def create_standard_router_v2(
 
         return api_key
 
+    # =========================================================================
+    # 응답 캐시 (ETag/304)
+    # =========================================================================
+
+    async def cached(
+        request: Request,
+        endpoint: str,
+        tenant_id: str,
+        params: tuple,
+        model: Any,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """response_cache가 있으면 직렬화된 응답을 캐시하고 If-None-Match에 304로 응답"""
+        if response_cache is None or not response_cache.enabled(endpoint):
+            return await compute()
+
+        async def render() -> bytes:
+            result = await compute()
+            if not isinstance(result, model):
+                result = model.model_validate(result)
+            return result.model_dump_json(by_alias=True).encode("utf-8")
+
+        entry = await response_cache.get_or_compute(endpoint, tenant_id, params, render)
+        headers = {"ETag": entry.etag, "Cache-Control": f"private, max-age={entry.max_age}"}
+        if entry.matches(request.headers.get("if-none-match")):
+            response_cache.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def invalidate(tenant_id: str) -> None:
+        if response_cache is not None:
+            response_cache.invalidate(tenant_id)
+
     # =========================================================================
     # Health Check
     # =========================================================================
@@ -170,6 +225,7 @@ def create_standard_router_v2(
         try:
             await handler.before_activate(request)
             response = await handler.activate_tenant(request)
+            invalidate(tenant_id)
             await handler.after_activate(response)
             return response
 
@@ -197,6 +253,7 @@ def create_standard_router_v2(
         try:
             await handler.before_deactivate(tenant_id, request)
             response = await handler.deactivate_tenant(tenant_id, request)
+            invalidate(tenant_id)
             await handler.after_deactivate(response)
             return response
 
@@ -261,13 +318,17 @@ def create_standard_router_v2(
         description="Service Market 대시보드용 테넌트 통계 조회"
     )
     async def get_tenant_stats(
+        request: Request,
         tenant_id: str,
         period: str = Query(default="30d", description="조회 기간 (7d, 30d, 90d)", example="30d"),
         api_key: str = Depends(verify_api_key)
     ) -> StatsResponse:
         """대시보드 통계 조회"""
         try:
-            return await handler.get_tenant_stats(tenant_id, period)
+            return await cached(
+                request, "stats", tenant_id, (period,), StatsResponse,
+                lambda: handler.get_tenant_stats(tenant_id, period),
+            )
         except TenantNotFoundError as e:
             raise HTTPException(status_code=404, detail=_error_detail(ErrorCodes.TENANT_NOT_FOUND, e))
 
@@ -281,13 +342,17 @@ def create_standard_router_v2(
         description="모델별, 사용자별 비용 분석"
     )
     async def get_tenant_costs(
+        request: Request,
         tenant_id: str,
         period: str = Query(default="30d", description="조회 기간"),
         api_key: str = Depends(verify_api_key)
     ) -> CostsResponse:
         """비용 분석 조회"""
         try:
-            return await handler.get_tenant_costs(tenant_id, period)
+            return await cached(
+                request, "costs", tenant_id, (period,), CostsResponse,
+                lambda: handler.get_tenant_costs(tenant_id, period),
+            )
         except TenantNotFoundError as e:
             raise HTTPException(status_code=404, detail=_error_detail(ErrorCodes.TENANT_NOT_FOUND, e))
 
@@ -300,6 +365,7 @@ def create_standard_router_v2(
         summary="활성 사용자 목록"
     )
     async def get_top_users(
+        request: Request,
         tenant_id: str,
         period: str = Query(default="30d", description="조회 기간"),
         limit: int = Query(default=10, ge=1, le=50, description="최대 개수"),
@@ -307,7 +373,10 @@ def create_standard_router_v2(
     ) -> TopUsersResponse:
         """활성 사용자 목록 조회"""
         try:
-            return await handler.get_top_users(tenant_id, period, limit)
+            return await cached(
+                request, "top_users", tenant_id, (period, limit), TopUsersResponse,
+                lambda: handler.get_top_users(tenant_id, period, limit),
+            )
         except TenantNotFoundError as e:
             raise HTTPException(status_code=404, detail=_error_detail(ErrorCodes.TENANT_NOT_FOUND, e))
 
@@ -346,6 +415,10 @@ def create_standard_router_v2(
         except TenantNotFoundError as e:
             raise HTTPException(status_code=404, detail=_error_detail(ErrorCodes.TENANT_NOT_FOUND, e))
 
+    # .../users/export, .../resources/export (NDJSON)
+    # /users/{user_id}보다 먼저 등록
+    add_tenant_export_routes(router, handler, verify_api_key)
+
     @router.post(
         "/tenant/{tenant_id}/users",
         response_model=CreateUserResponse,
@@ -364,7 +437,17 @@ def create_standard_router_v2(
     ) -> CreateUserResponse:
         """사용자 생성"""
         try:
-            return await handler.create_user(tenant_id, request)
+            if quota is not None:
+                await quota.enforce(tenant_id, "users")
+                try:
+                    response = await handler.create_user(tenant_id, request)
+                except BaseException:
+                    await quota.release(tenant_id, "users")
+                    raise
+            else:
+                response = await handler.create_user(tenant_id, request)
+            invalidate(tenant_id)
+            return response
         except TenantNotFoundError as e:
             raise HTTPException(status_code=404, detail=_error_detail(ErrorCodes.TENANT_NOT_FOUND, e))
         except UserExistsError as e:
@@ -408,10 +491,12 @@ def create_standard_router_v2(
     ) -> UserInfo:
         """사용자 수정"""
         try:
-            return await handler.update_user(tenant_id, user_id, request)
+            response = await handler.update_user(tenant_id, user_id, request)
         except (TenantNotFoundError, UserNotFoundError) as e:
             code = ErrorCodes.TENANT_NOT_FOUND if isinstance(e, TenantNotFoundError) else ErrorCodesV2.USER_NOT_FOUND
             raise HTTPException(status_code=404, detail=_error_detail(code, e))
+        invalidate(tenant_id)
+        return response
 
     @router.delete(
         "/tenant/{tenant_id}/users/{user_id}",
@@ -428,10 +513,14 @@ def create_standard_router_v2(
     ) -> DeleteUserResponse:
         """사용자 삭제"""
         try:
-            return await handler.delete_user(tenant_id, user_id)
+            result = await handler.delete_user(tenant_id, user_id)
         except (TenantNotFoundError, UserNotFoundError) as e:
             code = ErrorCodes.TENANT_NOT_FOUND if isinstance(e, TenantNotFoundError) else ErrorCodesV2.USER_NOT_FOUND
             raise HTTPException(status_code=404, detail=_error_detail(code, e))
+        invalidate(tenant_id)
+        if quota is not None and result.success:
+            await quota.release(tenant_id, "users")
+        return result
 
     # =========================================================================
     # Resource API (신규)
@@ -447,6 +536,7 @@ def create_standard_router_v2(
         description="코스, 토론, 문서 등 서비스별 리소스 조회"
     )
     async def list_resources(
+        request: Request,
         tenant_id: str,
         type: Optional[ResourceType] = Query(default=None, description="리소스 타입"),
         search: Optional[str] = Query(default=None, description="검색어"),
@@ -462,7 +552,10 @@ def create_standard_router_v2(
             offset=offset
         )
         try:
-            return await handler.list_resources(tenant_id, filters)
+            return await cached(
+                request, "resources", tenant_id, (type, search, limit, offset), ResourcesResponse,
+                lambda: handler.list_resources(tenant_id, filters),
+            )
         except TenantNotFoundError as e:
             raise HTTPException(status_code=404, detail=_error_detail(ErrorCodes.TENANT_NOT_FOUND, e))
 
@@ -479,12 +572,16 @@ def create_standard_router_v2(
         summary="테넌트 설정 조회"
     )
     async def get_settings(
+        request: Request,
         tenant_id: str,
         api_key: str = Depends(verify_api_key)
     ) -> SettingsResponse:
         """테넌트 설정 조회"""
         try:
-            return await handler.get_settings(tenant_id)
+            return await cached(
+                request, "settings", tenant_id, (), SettingsResponse,
+                lambda: handler.get_settings(tenant_id),
+            )
         except TenantNotFoundError as e:
             raise HTTPException(status_code=404, detail=_error_detail(ErrorCodes.TENANT_NOT_FOUND, e))
 
@@ -503,11 +600,25 @@ def create_standard_router_v2(
     ) -> SettingsResponse:
         """테넌트 설정 수정"""
         try:
-            return await handler.update_settings(tenant_id, request)
+            response = await handler.update_settings(tenant_id, request)
         except TenantNotFoundError as e:
             raise HTTPException(status_code=404, detail=_error_detail(ErrorCodes.TENANT_NOT_FOUND, e))
         except FeatureDisabledError as e:
             raise HTTPException(status_code=403, detail=_error_detail(ErrorCodesV2.FEATURE_DISABLED, e))
+        invalidate(tenant_id)
+        return response
+
+    # =========================================================================
+    # Bulk Export
+    # =========================================================================
+
+    add_usage_export_route(router, handler, verify_api_key, export_concurrency)
+
+    # =========================================================================
+    # Batch
+    # =========================================================================
+
+    add_batch_route(router, BatchExecutor(prefix, batch_concurrency, batch_max_items), verify_api_key)
 
     return router
 
@@ -520,6 +631,7 @@ def create_service_market_compat_router(
     handler: StandardAPIHandlerV2,
     api_key_header: str = "X-API-Key",
     api_key_env: str = "MARKET_API_KEY",
+    api_key_verifier: Optional[APIKeyVerifier] = None,
 ) -> APIRouter:
     """
     Service Market 기존 경로 호환 라우터 생성
@@ -532,12 +644,12 @@ def create_service_market_compat_router(
     """
 
     router = APIRouter(prefix="/api/tenant", tags=["Service Market Compat"])
+    verifier = api_key_verifier or APIKeyVerifier(env=api_key_env)
 
     async def verify_api_key(
         api_key: Optional[str] = Header(None, alias=api_key_header)
     ) -> str:
-        expected_key = os.getenv(api_key_env)
-        if not expected_key or not api_key or api_key != expected_key:
+        if verifier.verify(api_key) is None:
             raise HTTPException(status_code=401, detail="Invalid API key")
         return api_key
 
@@ -0,0 +1,36 @@
+"""
+사용량 모듈
+
+테넌트별 사용량 기록 및 마켓 보고
+
+사용법:
+    from mt_paas.usage import UsageRecorder, UsageReporter
+
+    recorder = UsageRecorder()
+    recorder.record("hallym_univ", "api_calls")
+"""
+from .recorder import UsageRecorder, UsageEvent, get_usage_recorder, set_usage_recorder
+from .reporter import UsageReporter
+from .top_users import TopUsersTracker
+from .daily_series import DailySeriesStore, SeriesWindow
+from .costs import ModelPrice, ModelPricing, CostAccumulator, CostRollup
+from .metering import LLMMeter, MeteredCall, metered, extract_token_usage
+
+__all__ = [
+    "UsageRecorder",
+    "UsageEvent",
+    "UsageReporter",
+    "TopUsersTracker",
+    "DailySeriesStore",
+    "SeriesWindow",
+    "ModelPrice",
+    "ModelPricing",
+    "CostAccumulator",
+    "CostRollup",
+    "LLMMeter",
+    "MeteredCall",
+    "metered",
+    "extract_token_usage",
+    "get_usage_recorder",
+    "set_usage_recorder",
+]
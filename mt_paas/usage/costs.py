@@ -0,0 +1,431 @@
+"""
+모델별 토큰 비용 집계
+
+모델 단가표(1K 토큰당 입력/출력 단가)로 LLM 호출 비용을 계산하고,
+테넌트 × 일 × 모델 단위로 누적하여 CostsResponse를 바로 만들어 줍니다.
+"""
+
+import heapq
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional, Dict, Any, List, NamedTuple, Callable, Awaitable
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+from mt_paas.standard_api.models_v2 import CostsResponse, ModelCost, UserCost, DailyCost
+from .daily_series import period_range
+from .recorder import UsageEvent, UsageRecorder
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# 단가표
+# =============================================================================
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """모델 단가 (USD / 1K 토큰)"""
+    input_per_1k: float
+    output_per_1k: float
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (input_tokens * self.input_per_1k + output_tokens * self.output_per_1k) / 1000
+
+
+class ModelPricing:
+    """
+    모델 단가표
+
+    모델명이 정확히 일치하지 않으면 가장 긴 접두사로 찾습니다.
+    (예: "gpt-4o-2024-08-06" → "gpt-4o")
+
+    Example:
+        pricing = ModelPricing.from_dict({
+            "gpt-4o": {"input_per_1k": 0.0025, "output_per_1k": 0.01},
+            "claude-3-5-sonnet": {"input_per_1k": 0.003, "output_per_1k": 0.015},
+        })
+        pricing.cost("gpt-4o", 1000, 500)  # 0.0075
+    """
+
+    def __init__(
+        self,
+        prices: Optional[Dict[str, ModelPrice]] = None,
+        default: Optional[ModelPrice] = None,
+    ):
+        self.prices: Dict[str, ModelPrice] = dict(prices or {})
+        self.default = default
+        self._resolved: Dict[str, Optional[ModelPrice]] = {}
+
+    def set_price(self, model: str, input_per_1k: float, output_per_1k: float) -> None:
+        """단가 지정"""
+        self.prices[model] = ModelPrice(input_per_1k, output_per_1k)
+        self._resolved.clear()
+
+    def get(self, model: str) -> Optional[ModelPrice]:
+        """모델 단가 조회 (없으면 default)"""
+        price = self._resolved.get(model)
+        if price is not None or model in self._resolved:
+            return price
+
+        price = self.prices.get(model)
+        if price is None:
+            candidates = [m for m in self.prices if model.startswith(m)]
+            price = self.prices[max(candidates, key=len)] if candidates else self.default
+            if price is None:
+                logger.warning(f"No price configured for model: {model}")
+        self._resolved[model] = price
+        return price
+
+    def cost(self, model: str, input_tokens: int, output_tokens: int) -> float:
+        """호출 비용 (USD)"""
+        price = self.get(model)
+        return price.cost(input_tokens, output_tokens) if price else 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModelPricing":
+        """
+        딕셔너리에서 로드
+
+        {"gpt-4o": {"input_per_1k": ..., "output_per_1k": ...}, "default": {...}}
+        """
+        prices = {}
+        default = None
+        for model, rates in (data or {}).items():
+            price = ModelPrice(
+                input_per_1k=float(rates.get("input_per_1k", 0)),
+                output_per_1k=float(rates.get("output_per_1k", 0)),
+            )
+            if model == "default":
+                default = price
+            else:
+                prices[model] = price
+        return cls(prices, default)
+
+    @classmethod
+    def from_file(cls, path: str, section: Optional[str] = "model_pricing") -> "ModelPricing":
+        """
+        JSON/YAML 파일에서 로드
+
+        Args:
+            path: 파일 경로 (mt_paas_config.yaml 등)
+            section: 단가표가 들어있는 최상위 키 (None이면 파일 전체)
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith((".yaml", ".yml")):
+                if not HAS_YAML:
+                    raise ImportError("PyYAML is required. Install with: pip install pyyaml")
+                data = yaml.safe_load(f) or {}
+            else:
+                data = json.load(f)
+        if section:
+            data = data.get(section, {})
+        return cls.from_dict(data)
+
+    @classmethod
+    def from_env(cls, env: str = "MT_MODEL_PRICING") -> "ModelPricing":
+        """환경변수(JSON 문자열 또는 파일 경로)에서 로드"""
+        value = os.getenv(env)
+        if not value:
+            return cls()
+        if os.path.exists(value):
+            return cls.from_file(value)
+        return cls.from_dict(json.loads(value))
+
+
+# =============================================================================
+# 누적기
+# =============================================================================
+
+class CostRollup(NamedTuple):
+    """일별 모델(× 사용자) 비용 롤업 행 (user_id가 없으면 사용자 미지정 호출)"""
+    tenant_id: str
+    date: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float
+    user_id: Optional[str] = None
+    user_name: Optional[str] = None
+
+
+class _DayCosts:
+    """테넌트 1일치 비용"""
+    __slots__ = ("models", "users")
+
+    def __init__(self):
+        # {model: [input_tokens, output_tokens, cost_usd]}
+        self.models: Dict[str, List[float]] = {}
+        # {user_id: [tokens, cost_usd]}
+        self.users: Dict[str, List[float]] = {}
+
+
+class CostAccumulator:
+    """
+    테넌트 × 모델 비용 누적기
+
+    LLM 호출마다 record()로 토큰을 누적하고, 비용 대시보드 조회 시
+    ModelCost / UserCost / DailyCost 목록을 바로 만듭니다.
+    flush()는 마지막 flush 이후 증분을 롤업 행으로 넘겨 DB에 저장하게 합니다.
+
+    Example:
+        costs = CostAccumulator(ModelPricing.from_env())
+        costs.attach(recorder)
+
+        async def get_tenant_costs(self, tenant_id, period):
+            return costs.costs_response(tenant_id, period)
+
+        # 주기 작업
+        await costs.flush(save_rollups)
+    """
+
+    def __init__(self, pricing: ModelPricing, retention_days: int = 120):
+        """
+        Args:
+            pricing: 모델 단가표
+            retention_days: 메모리에 유지할 일수
+        """
+        self.pricing = pricing
+        self.retention_days = retention_days
+
+        # {tenant_id: {ordinal: _DayCosts}}
+        self._days: Dict[str, Dict[int, _DayCosts]] = {}
+        # 롤업 대기 증분 {(tenant_id, ordinal, model, user_id): [input, output, cost]}
+        self._pending: Dict[tuple, List[float]] = {}
+        self._user_names: Dict[str, str] = {}
+
+    def attach(self, recorder: UsageRecorder) -> None:
+        """사용량 기록기에 연결 (metric="llm_tokens" 이벤트 반영)"""
+        recorder.add_listener(self.observe)
+
+    def observe(self, event: UsageEvent) -> None:
+        """사용량 이벤트 반영 (UsageRecorder 리스너)"""
+        if event.metric != "llm_tokens" or not event.model:
+            return
+        tags = event.tags or {}
+        input_tokens = int(tags.get("input_tokens", event.amount))
+        output_tokens = int(tags.get("output_tokens", 0))
+        day = datetime.utcfromtimestamp(event.timestamp).date() if event.timestamp else None
+        self.record(
+            event.tenant_id,
+            event.model,
+            input_tokens,
+            output_tokens,
+            user_id=event.user_id,
+            day=day,
+            user_name=tags.get("name"),
+        )
+
+    def record(
+        self,
+        tenant_id: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        user_id: Optional[str] = None,
+        day: Optional[date] = None,
+        user_name: Optional[str] = None,
+    ) -> float:
+        """
+        LLM 호출 토큰 누적
+
+        Returns:
+            float: 이번 호출 비용 (USD)
+        """
+        cost = self.pricing.cost(model, input_tokens, output_tokens)
+        ordinal = (day or datetime.utcnow().date()).toordinal()
+        self._add(tenant_id, ordinal, model, input_tokens, output_tokens, cost, user_id)
+
+        key = (tenant_id, ordinal, model, user_id)
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = [input_tokens, output_tokens, cost]
+        else:
+            pending[0] += input_tokens
+            pending[1] += output_tokens
+            pending[2] += cost
+
+        if user_name and user_id:
+            self._user_names[user_id] = user_name
+        return cost
+
+    def _add(
+        self,
+        tenant_id: str,
+        ordinal: int,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cost: float,
+        user_id: Optional[str] = None,
+    ) -> None:
+        days = self._days.get(tenant_id)
+        if days is None:
+            days = self._days[tenant_id] = {}
+        day = days.get(ordinal)
+        if day is None:
+            day = days[ordinal] = _DayCosts()
+            cutoff = ordinal - self.retention_days
+            for old in [o for o in days if o <= cutoff]:
+                del days[old]
+
+        vec = day.models.get(model)
+        if vec is None:
+            day.models[model] = [input_tokens, output_tokens, cost]
+        else:
+            vec[0] += input_tokens
+            vec[1] += output_tokens
+            vec[2] += cost
+
+        if user_id is not None:
+            user = day.users.get(user_id)
+            if user is None:
+                day.users[user_id] = [input_tokens + output_tokens, cost]
+            else:
+                user[0] += input_tokens + output_tokens
+                user[1] += cost
+
+    # =========================================================================
+    # 롤업
+    # =========================================================================
+
+    async def flush(self, sink: Callable[[List[CostRollup]], Awaitable[None]]) -> int:
+        """
+        마지막 flush 이후 증분을 롤업 행으로 전달
+
+        sink가 실패하면 증분은 다음 flush로 이월됩니다.
+
+        Returns:
+            int: 전달한 행 수
+        """
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        rows = [
+            CostRollup(
+                tenant_id, date.fromordinal(ordinal).isoformat(), model, int(v[0]), int(v[1]), v[2],
+                user_id, self._user_names.get(user_id) if user_id is not None else None,
+            )
+            for (tenant_id, ordinal, model, user_id), v in pending.items()
+        ]
+        try:
+            await sink(rows)
+        except Exception:
+            for key, v in pending.items():
+                cur = self._pending.get(key)
+                if cur is None:
+                    self._pending[key] = v
+                else:
+                    for i in range(3):
+                        cur[i] += v[i]
+            raise
+        return len(rows)
+
+    def load_rollups(self, rows: List[CostRollup]) -> None:
+        """저장된 롤업 행으로 누적값 복원 (재시작 시, 사용자별 비용/이름 포함)"""
+        for row in rows:
+            ordinal = date.fromisoformat(row.date).toordinal()
+            self._add(row.tenant_id, ordinal, row.model, row.input_tokens, row.output_tokens, row.cost_usd, row.user_id)
+            if row.user_id and row.user_name:
+                self._user_names[row.user_id] = row.user_name
+
+    def forget_tenant(self, tenant_id: str) -> None:
+        """테넌트 데이터 제거"""
+        self._days.pop(tenant_id, None)
+
+    # =========================================================================
+    # 조회
+    # =========================================================================
+
+    def _period_days(self, tenant_id: str, period: str, today: Optional[date] = None):
+        days = self._days.get(tenant_id)
+        if not days:
+            return []
+        start, end = period_range(period, today)
+        return [(o, days[o]) for o in sorted(days) if start <= o <= end]
+
+    def by_model(self, tenant_id: str, period: str, today: Optional[date] = None) -> List[ModelCost]:
+        """모델별 비용 (비용 내림차순)"""
+        totals: Dict[str, List[float]] = {}
+        for _, day in self._period_days(tenant_id, period, today):
+            for model, vec in day.models.items():
+                acc = totals.get(model)
+                if acc is None:
+                    totals[model] = list(vec)
+                else:
+                    acc[0] += vec[0]
+                    acc[1] += vec[1]
+                    acc[2] += vec[2]
+        ordered = sorted(totals.items(), key=lambda item: item[1][2], reverse=True)
+        return [
+            ModelCost.model_construct(
+                model=model,
+                input_tokens=int(v[0]),
+                output_tokens=int(v[1]),
+                cost_usd=round(v[2], 6),
+            )
+            for model, v in ordered
+        ]
+
+    def by_user(self, tenant_id: str, period: str, limit: int = 10, today: Optional[date] = None) -> List[UserCost]:
+        """사용자별 비용 상위 limit명"""
+        totals: Dict[str, List[float]] = {}
+        for _, day in self._period_days(tenant_id, period, today):
+            for user_id, vec in day.users.items():
+                acc = totals.get(user_id)
+                if acc is None:
+                    totals[user_id] = list(vec)
+                else:
+                    acc[0] += vec[0]
+                    acc[1] += vec[1]
+        best = heapq.nlargest(limit, totals.items(), key=lambda item: item[1][1])
+        return [
+            UserCost.model_construct(
+                user_id=user_id,
+                name=self._user_names.get(user_id, user_id),
+                cost_usd=round(v[1], 6),
+                tokens=int(v[0]),
+            )
+            for user_id, v in best
+        ]
+
+    def daily_costs(self, tenant_id: str, period: str, today: Optional[date] = None) -> List[DailyCost]:
+        """일별 비용 (기간 내 모든 날짜, 비용 없는 날은 0)"""
+        start, end = period_range(period, today)
+        days = self._days.get(tenant_id, {})
+        result = []
+        for ordinal in range(start, end + 1):
+            day = days.get(ordinal)
+            cost = sum(vec[2] for vec in day.models.values()) if day else 0.0
+            result.append(DailyCost.model_construct(
+                date=date.fromordinal(ordinal).isoformat(),
+                cost_usd=round(cost, 6),
+            ))
+        return result
+
+    def total_cost(self, tenant_id: str, period: str, today: Optional[date] = None) -> float:
+        """기간 총 비용"""
+        return round(sum(
+            vec[2]
+            for _, day in self._period_days(tenant_id, period, today)
+            for vec in day.models.values()
+        ), 6)
+
+    def costs_response(self, tenant_id: str, period: str, today: Optional[date] = None) -> CostsResponse:
+        """CostsResponse 생성"""
+        by_model = self.by_model(tenant_id, period, today)
+        return CostsResponse(
+            tenant_id=tenant_id,
+            period=period,
+            total_cost_usd=round(sum(m.cost_usd for m in by_model), 6),
+            by_model=by_model,
+            by_user_top10=self.by_user(tenant_id, period, 10, today),
+            daily_trend=self.daily_costs(tenant_id, period, today),
+        )
@@ -0,0 +1,307 @@
+"""
+테넌트별 일별 시계열 저장소
+
+사용자/메시지/토큰/비용 일별 값을 테넌트마다 고정 크기 링 버퍼(typed array)에
+누적하고, /stats, /stats/costs 응답의 trends/daily_trend를 기간 단위로 잘라 제공합니다.
+"""
+
+import re
+from array import array
+from datetime import date, datetime
+from typing import Optional, Dict, List, NamedTuple, Set, Tuple
+
+from mt_paas.standard_api.models_v2 import DailyTrend, DailyCost
+from .recorder import UsageEvent, UsageRecorder
+
+_ROLLING_PERIOD = re.compile(r"^(\d+)d$")
+_MONTH_PERIOD = re.compile(r"^(\d{4})-(\d{2})$")
+
+# 이벤트 메트릭 → 시계열 필드
+_METRIC_FIELDS = {
+    "messages": "messages",
+    "tokens": "tokens",
+    "llm_tokens": "tokens",
+    "cost_usd": "cost_usd",
+}
+
+
+class SeriesWindow(NamedTuple):
+    """기간 단위로 잘라낸 시계열 (필드별 array)"""
+    start: date
+    users: array
+    messages: array
+    tokens: array
+    cost_usd: array
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+
+def period_range(period: str, today: Optional[date] = None) -> Tuple[int, int]:
+    """
+    기간 문자열을 (시작 ordinal, 종료 ordinal) 로 변환
+
+    지원 형식: "7d", "30d", "90d" (오늘 포함 최근 N일), "YYYY-MM" (해당 월)
+    """
+    today = today or datetime.utcnow().date()
+    match = _ROLLING_PERIOD.match(period)
+    if match:
+        days = max(int(match.group(1)), 1)
+        end = today.toordinal()
+        return end - days + 1, end
+
+    match = _MONTH_PERIOD.match(period)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+        first = date(year, month, 1)
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+        return first.toordinal(), next_month.toordinal() - 1
+
+    raise ValueError(f"Unsupported period: {period}")
+
+
+class _TenantSeries:
+    """테넌트 1개의 링 버퍼"""
+    __slots__ = ("users", "messages", "tokens", "cost_usd", "latest", "_user_sets")
+
+    def __init__(self, capacity: int):
+        self.users = array("q", bytes(8 * capacity))
+        self.messages = array("q", bytes(8 * capacity))
+        self.tokens = array("q", bytes(8 * capacity))
+        self.cost_usd = array("d", bytes(8 * capacity))
+        # 링에 담긴 가장 최근 날짜 (ordinal)
+        self.latest = 0
+        # 일별 고유 사용자 집계용 (최근 이틀만 유지)
+        self._user_sets: Dict[int, Set[str]] = {}
+
+
+class DailySeriesStore:
+    """
+    일별 시계열 저장소
+
+    테넌트마다 capacity일 크기의 링 버퍼를 필드별 typed array로 유지합니다.
+    링에는 (latest - capacity, latest] 구간의 날짜만 담기며, 날짜가 넘어가면
+    지나간 슬롯을 0으로 비웁니다. 기간 조회는 최대 두 번의 array 슬라이스로 끝납니다.
+
+    Example:
+        series = DailySeriesStore(days=120)
+        series.attach(recorder)
+
+        async def get_tenant_stats(self, tenant_id, period):
+            return StatsResponse(
+                tenant_id=tenant_id,
+                period=period,
+                summary=...,
+                trends={"daily": series.daily_trends(tenant_id, period)},
+            )
+    """
+
+    FIELDS = ("users", "messages", "tokens", "cost_usd")
+
+    def __init__(self, days: int = 120):
+        """
+        Args:
+            days: 테넌트별 보관 일수 (90일 조회를 위해 90 이상)
+        """
+        if days < 90:
+            raise ValueError("days must be at least 90")
+        self.capacity = days
+        self._tenants: Dict[str, _TenantSeries] = {}
+
+    def attach(self, recorder: UsageRecorder) -> None:
+        """사용량 기록기에 연결"""
+        recorder.add_listener(self.observe)
+
+    def observe(self, event: UsageEvent) -> None:
+        """사용량 이벤트 반영 (UsageRecorder 리스너)"""
+        field = _METRIC_FIELDS.get(event.metric)
+        if field is None and event.user_id is None:
+            return
+        day = datetime.utcfromtimestamp(event.timestamp).date() if event.timestamp else None
+        self.add(
+            event.tenant_id,
+            day=day,
+            user_id=event.user_id,
+            **({field: event.amount} if field else {}),
+        )
+
+    # =========================================================================
+    # 갱신
+    # =========================================================================
+
+    def add(
+        self,
+        tenant_id: str,
+        day: Optional[date] = None,
+        messages: int = 0,
+        tokens: int = 0,
+        cost_usd: float = 0.0,
+        user_id: Optional[str] = None,
+        users: int = 0,
+    ) -> None:
+        """
+        일별 값 누적
+
+        Args:
+            tenant_id: 테넌트 ID
+            day: 날짜 (기본: 오늘, UTC)
+            messages/tokens/cost_usd: 더할 값
+            user_id: 해당 일 활동 사용자 (고유 사용자 수에 반영)
+            users: 활성 사용자 수에 직접 더할 값
+        """
+        ordinal = (day or datetime.utcnow().date()).toordinal()
+        series = self._tenants.get(tenant_id)
+        if series is None:
+            series = self._tenants[tenant_id] = _TenantSeries(self.capacity)
+
+        if not self._advance(series, ordinal):
+            return
+
+        slot = ordinal % self.capacity
+        if messages:
+            series.messages[slot] += int(messages)
+        if tokens:
+            series.tokens[slot] += int(tokens)
+        if cost_usd:
+            series.cost_usd[slot] += cost_usd
+        if users:
+            series.users[slot] += int(users)
+        if user_id is not None:
+            seen = series._user_sets.get(ordinal)
+            if seen is None:
+                seen = series._user_sets[ordinal] = set()
+                for old in [o for o in series._user_sets if o < ordinal - 1]:
+                    del series._user_sets[old]
+            if user_id not in seen:
+                seen.add(user_id)
+                series.users[slot] += 1
+
+    def set_users(self, tenant_id: str, day: date, count: int) -> None:
+        """일별 활성 사용자 수 지정 (DB 재집계 결과 반영 등)"""
+        ordinal = day.toordinal()
+        series = self._tenants.get(tenant_id)
+        if series is None:
+            series = self._tenants[tenant_id] = _TenantSeries(self.capacity)
+        if self._advance(series, ordinal):
+            series.users[ordinal % self.capacity] = count
+
+    def _advance(self, series: _TenantSeries, ordinal: int) -> bool:
+        """링을 ordinal까지 전진시키고, 기록 가능한 날짜인지 반환"""
+        latest = series.latest
+        if ordinal <= latest:
+            return ordinal > latest - self.capacity
+
+        capacity = self.capacity
+        if latest == 0 or ordinal - latest >= capacity:
+            for name in self.FIELDS:
+                arr = getattr(series, name)
+                arr[:] = array(arr.typecode, bytes(8 * capacity))
+        else:
+            for o in range(latest + 1, ordinal + 1):
+                slot = o % capacity
+                series.users[slot] = 0
+                series.messages[slot] = 0
+                series.tokens[slot] = 0
+                series.cost_usd[slot] = 0.0
+        series.latest = ordinal
+        return True
+
+    def forget_tenant(self, tenant_id: str) -> None:
+        """테넌트 데이터 제거"""
+        self._tenants.pop(tenant_id, None)
+
+    # =========================================================================
+    # 조회
+    # =========================================================================
+
+    def window(self, tenant_id: str, period: str, today: Optional[date] = None) -> SeriesWindow:
+        """기간 구간의 필드별 array 반환 (일자별 객체 생성 없음)"""
+        start, end = period_range(period, today)
+        if end - start + 1 > self.capacity:
+            start = end - self.capacity + 1
+        length = end - start + 1
+
+        series = self._tenants.get(tenant_id)
+        if series is None:
+            return self._empty(start, length)
+
+        # 링에 실제로 담긴 구간과의 교집합
+        lo = max(start, series.latest - self.capacity + 1)
+        hi = min(end, series.latest)
+        arrays = []
+        for name in self.FIELDS:
+            ring = getattr(series, name)
+            out = array(ring.typecode)
+            if lo > start:
+                out.frombytes(bytes(8 * (min(lo, end + 1) - start)))
+            if lo <= hi:
+                a, b = lo % self.capacity, hi % self.capacity
+                if a <= b:
+                    out.extend(ring[a:b + 1])
+                else:
+                    out.extend(ring[a:])
+                    out.extend(ring[:b + 1])
+            if len(out) < length:
+                out.frombytes(bytes(8 * (length - len(out))))
+            arrays.append(out)
+
+        return SeriesWindow(date.fromordinal(start), *arrays)
+
+    def _empty(self, start: int, length: int) -> SeriesWindow:
+        zeros = bytes(8 * length)
+        return SeriesWindow(
+            date.fromordinal(start),
+            array("q", zeros),
+            array("q", zeros),
+            array("q", zeros),
+            array("d", zeros),
+        )
+
+    def totals(self, tenant_id: str, period: str, today: Optional[date] = None) -> Dict[str, float]:
+        """기간 합계 (users는 일별 합계)"""
+        window = self.window(tenant_id, period, today)
+        return {name: sum(getattr(window, name)) for name in self.FIELDS}
+
+    def daily_trends(self, tenant_id: str, period: str, today: Optional[date] = None) -> List[DailyTrend]:
+        """StatsResponse.trends["daily"] 목록 (검증 생략 생성)"""
+        window = self.window(tenant_id, period, today)
+        start = window.start.toordinal()
+        construct = DailyTrend.model_construct
+        return [
+            construct(date=date.fromordinal(start + i).isoformat(), users=u, messages=m, tokens=t)
+            for i, (u, m, t) in enumerate(zip(window.users, window.messages, window.tokens))
+        ]
+
+    def daily_costs(self, tenant_id: str, period: str, today: Optional[date] = None) -> List[DailyCost]:
+        """CostsResponse.daily_trend 목록 (검증 생략 생성)"""
+        window = self.window(tenant_id, period, today)
+        start = window.start.toordinal()
+        construct = DailyCost.model_construct
+        return [
+            construct(date=date.fromordinal(start + i).isoformat(), cost_usd=round(c, 6))
+            for i, c in enumerate(window.cost_usd)
+        ]
+
+    # =========================================================================
+    # 직렬화 fast path
+    # =========================================================================
+
+    def trends_json(self, tenant_id: str, period: str, today: Optional[date] = None) -> str:
+        """trends["daily"] JSON 배열 문자열 (Pydantic 모델 생성 없이 바로 직렬화)"""
+        window = self.window(tenant_id, period, today)
+        start = window.start.toordinal()
+        parts = [
+            f'{{"date":"{date.fromordinal(start + i).isoformat()}","users":{u},"messages":{m},"tokens":{t}}}'
+            for i, (u, m, t) in enumerate(zip(window.users, window.messages, window.tokens))
+        ]
+        return "[" + ",".join(parts) + "]"
+
+    def costs_json(self, tenant_id: str, period: str, today: Optional[date] = None) -> str:
+        """daily_trend JSON 배열 문자열 (Pydantic 모델 생성 없이 바로 직렬화)"""
+        window = self.window(tenant_id, period, today)
+        start = window.start.toordinal()
+        parts = [
+            f'{{"date":"{date.fromordinal(start + i).isoformat()}","cost_usd":{round(c, 6)!r}}}'
+            for i, c in enumerate(window.cost_usd)
+        ]
+        return "[" + ",".join(parts) + "]"
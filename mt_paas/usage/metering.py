@@ -0,0 +1,221 @@
+"""
+LLM 호출 계측
+
+LLM 클라이언트 응답에서 토큰 수와 지연 시간을 읽어 현재 테넌트로
+사용량 기록기(UsageRecorder)에 적재합니다.
+
+지원 응답 형식:
+    - OpenAI: usage.prompt_tokens / usage.completion_tokens (Responses API: input_tokens / output_tokens)
+    - Anthropic: usage.input_tokens / usage.output_tokens
+    - Google Generative AI: usage_metadata.prompt_token_count / candidates_token_count
+"""
+
+import functools
+import inspect
+from time import perf_counter
+from typing import Optional, Any, Callable, Tuple
+
+from mt_paas.middleware.tenant import get_current_tenant
+from .recorder import UsageRecorder, get_usage_recorder
+
+
+def extract_token_usage(response: Any) -> Optional[Tuple[Optional[str], int, int]]:
+    """
+    LLM 응답에서 (모델명, 입력 토큰, 출력 토큰) 추출
+
+    Returns:
+        인식할 수 없는 응답이면 None
+    """
+    if response is None:
+        return None
+
+    if isinstance(response, dict):
+        model = response.get("model")
+        usage = response.get("usage") or response.get("usage_metadata")
+        get = dict.get
+    else:
+        model = getattr(response, "model", None)
+        usage = getattr(response, "usage", None) or getattr(response, "usage_metadata", None)
+        get = getattr
+
+    if usage is None:
+        return None
+
+    if isinstance(usage, dict):
+        get = dict.get
+
+    # OpenAI Chat Completions
+    input_tokens = get(usage, "prompt_tokens", None)
+    if input_tokens is not None:
+        return model, int(input_tokens), int(get(usage, "completion_tokens", 0) or 0)
+
+    # Anthropic / OpenAI Responses
+    input_tokens = get(usage, "input_tokens", None)
+    if input_tokens is not None:
+        return model, int(input_tokens), int(get(usage, "output_tokens", 0) or 0)
+
+    # Google Generative AI
+    input_tokens = get(usage, "prompt_token_count", None)
+    if input_tokens is not None:
+        return model, int(input_tokens), int(get(usage, "candidates_token_count", 0) or 0)
+
+    return None
+
+
+class MeteredCall:
+    """
+    계측 중인 LLM 호출 1건
+
+    with 블록 안에서 record(response)로 응답을 넘기면, 블록 종료 시
+    지연 시간과 함께 llm_tokens 이벤트를 적재합니다.
+    스트리밍 응답은 청크마다 record()를 호출하면 마지막 usage가 사용됩니다.
+    """
+    __slots__ = (
+        "_recorder", "tenant_id", "user_id", "model",
+        "input_tokens", "output_tokens", "_started", "latency_ms",
+    )
+
+    def __init__(
+        self,
+        recorder: UsageRecorder,
+        tenant_id: Optional[str],
+        model: Optional[str],
+        user_id: Optional[str],
+    ):
+        self._recorder = recorder
+        self.tenant_id = tenant_id
+        self.model = model
+        self.user_id = user_id
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._started = 0.0
+        self.latency_ms = 0.0
+
+    def record(self, response: Any) -> Any:
+        """응답에서 토큰 사용량 읽기 (응답을 그대로 반환)"""
+        usage = extract_token_usage(response)
+        if usage is not None:
+            model, self.input_tokens, self.output_tokens = usage
+            if model and not self.model:
+                self.model = model
+        return response
+
+    def set_usage(self, input_tokens: int, output_tokens: int, model: Optional[str] = None) -> None:
+        """토큰 사용량 직접 지정"""
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        if model:
+            self.model = model
+
+    def __enter__(self) -> "MeteredCall":
+        self._started = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.latency_ms = (perf_counter() - self._started) * 1000
+        total = self.input_tokens + self.output_tokens
+        if self.tenant_id is None or not total:
+            return
+        self._recorder.record(
+            self.tenant_id,
+            "llm_tokens",
+            total,
+            user_id=self.user_id,
+            model=self.model,
+            tags={
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "latency_ms": self.latency_ms,
+                "error": exc_type is not None,
+            },
+        )
+
+    async def __aenter__(self) -> "MeteredCall":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+
+class LLMMeter:
+    """
+    LLM 호출 계측기
+
+    Example:
+        meter = LLMMeter()
+
+        # 컨텍스트 매니저
+        with meter.call(user_id=user.id) as call:
+            response = await client.chat.completions.create(model="gpt-4o", messages=...)
+            call.record(response)
+
+        # 함수 래핑
+        create = meter.wrap(client.messages.create)
+        response = await create(model="claude-3-5-sonnet-latest", messages=...)
+    """
+
+    def __init__(self, recorder: Optional[UsageRecorder] = None):
+        """
+        Args:
+            recorder: 적재할 사용량 기록기 (기본: 전역 기록기)
+        """
+        self._recorder = recorder
+
+    @property
+    def recorder(self) -> UsageRecorder:
+        if self._recorder is not None:
+            return self._recorder
+        return get_usage_recorder()
+
+    def call(
+        self,
+        model: Optional[str] = None,
+        user_id: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+    ) -> MeteredCall:
+        """
+        LLM 호출 계측 컨텍스트
+
+        Args:
+            model: 모델명 (응답에 모델명이 없을 때, 예: Google)
+            user_id: 호출 사용자 ID
+            tenant_id: 테넌트 ID (기본: 현재 요청 테넌트)
+        """
+        if tenant_id is None:
+            ctx = get_current_tenant()
+            tenant_id = ctx.tenant_id if ctx else None
+        return MeteredCall(self.recorder, tenant_id, model, user_id)
+
+    def wrap(self, func: Callable, model: Optional[str] = None) -> Callable:
+        """
+        LLM 클라이언트 호출 함수 래핑 (sync/async 모두 지원)
+
+        래핑된 함수는 model=, user_id= 키워드를 그대로 전달하며
+        user_id는 계측용으로만 사용하고 원 함수에는 넘기지 않습니다.
+        """
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, user_id: Optional[str] = None, **kwargs):
+                with self.call(model=kwargs.get("model", model), user_id=user_id) as call:
+                    return call.record(await func(*args, **kwargs))
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, user_id: Optional[str] = None, **kwargs):
+            with self.call(model=kwargs.get("model", model), user_id=user_id) as call:
+                return call.record(func(*args, **kwargs))
+        return wrapper
+
+
+def metered(model: Optional[str] = None, meter: Optional[LLMMeter] = None) -> Callable:
+    """
+    LLM 호출 함수 데코레이터
+
+    Example:
+        @metered()
+        async def ask(question: str):
+            return await client.chat.completions.create(model="gpt-4o", messages=[...])
+    """
+    def decorator(func: Callable) -> Callable:
+        return (meter or LLMMeter()).wrap(func, model=model)
+    return decorator
@@ -0,0 +1,198 @@
+"""
+사용량 버퍼 기록기
+
+요청 경로에서는 이벤트를 큐에 적재만 하고, 테넌트별 집계는
+drain() 시점에 한 번에 수행합니다.
+파생 집계(상위 사용자, 일별 시계열, 비용) 리스너는 record() 시점에 바로 호출됩니다.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Optional, Dict, Any, Callable, List, NamedTuple, Set
+
+from mt_paas.middleware.tenant import get_current_tenant
+
+logger = logging.getLogger(__name__)
+
+
+class UsageEvent(NamedTuple):
+    """사용량 이벤트"""
+    tenant_id: str
+    metric: str
+    amount: float = 1
+    user_id: Optional[str] = None
+    model: Optional[str] = None
+    timestamp: float = 0.0
+    tags: Optional[Dict[str, Any]] = None
+
+
+class UsageRecorder:
+    """
+    테넌트별 사용량 기록기
+
+    record()는 리스너 호출과 deque append 한 번으로 끝나므로 요청 경로를 막지 않습니다.
+    보고용 집계는 drain()에서 수행하며, 이전 drain 이후 사용량이 변한 테넌트만 반환합니다.
+
+    Example:
+        recorder = UsageRecorder()
+        recorder.record("hallym_univ", "api_calls")
+        recorder.record("hallym_univ", "llm_tokens", 1200, user_id="user_1")
+
+        deltas = recorder.drain()
+        # {"hallym_univ": {"api_calls": 1, "llm_tokens": 1200, "active_users": 1}}
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 100_000,
+        gauge_metrics: Optional[Set[str]] = None,
+        buffer: bool = True,
+    ):
+        """
+        Args:
+            max_pending: 집계 전 최대 보관 이벤트 수 (초과 시 가장 오래된 이벤트 폐기)
+            gauge_metrics: 합산 대신 마지막 값을 사용하는 메트릭 (예: storage_usage)
+            buffer: drain()으로 가져갈 이벤트를 쌓을지 여부 (보고기가 없으면 False)
+        """
+        self.max_pending = max_pending
+        self.buffer = buffer
+        self.gauge_metrics = gauge_metrics if gauge_metrics is not None else {"storage_usage"}
+        self.dropped = 0
+
+        self._pending: deque = deque(maxlen=max_pending)
+        self._listeners: List[Callable[[UsageEvent], None]] = []
+
+        # 전송 실패 등으로 되돌려진 집계값
+        self._carry: Dict[str, Dict[str, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def active(self) -> bool:
+        """기록한 이벤트를 소비하는 곳(보고기, 리스너)이 있는지"""
+        return self.buffer or bool(self._listeners)
+
+    # =========================================================================
+    # 기록 (요청 경로)
+    # =========================================================================
+
+    def record(
+        self,
+        tenant_id: str,
+        metric: str,
+        amount: float = 1,
+        user_id: Optional[str] = None,
+        model: Optional[str] = None,
+        tags: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """사용량 이벤트 기록"""
+        if not self.active:
+            return
+        event = UsageEvent(tenant_id, metric, amount, user_id, model, time.time(), tags)
+
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Usage listener error: {e}")
+
+        if not self.buffer:
+            return
+        if len(self._pending) == self.max_pending:
+            self.dropped += 1
+        self._pending.append(event)
+
+    def record_current(self, metric: str, amount: float = 1, **kwargs) -> bool:
+        """현재 요청의 테넌트로 사용량 기록 (테넌트 컨텍스트 없으면 무시)"""
+        ctx = get_current_tenant()
+        if ctx is None:
+            return False
+        self.record(ctx.tenant_id, metric, amount, **kwargs)
+        return True
+
+    def add_listener(self, listener: Callable[[UsageEvent], None]) -> None:
+        """
+        이벤트 리스너 등록
+
+        record() 시점에 이벤트마다 호출되며, 보고기(drain) 유무와 관계없이 동작합니다.
+        일별 시계열, 비용 집계 등 파생 집계를 같은 파이프라인에 연결할 때 사용합니다.
+        요청 경로에서 실행되므로 가벼워야 합니다.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[UsageEvent], None]) -> None:
+        """이벤트 리스너 제거"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # =========================================================================
+    # 집계
+    # =========================================================================
+
+    def drain(self) -> Dict[str, Dict[str, float]]:
+        """
+        적재된 이벤트를 테넌트별로 집계하여 반환
+
+        Returns:
+            {tenant_id: {metric: value}} - 변화가 있는 테넌트만 포함
+        """
+        deltas: Dict[str, Dict[str, float]] = self._carry
+        self._carry = {}
+        users: Dict[str, Set[str]] = {}
+
+        pending = self._pending
+        gauges = self.gauge_metrics
+
+        while pending:
+            event = pending.popleft()
+            metrics = deltas.get(event.tenant_id)
+            if metrics is None:
+                metrics = deltas[event.tenant_id] = {}
+
+            if event.metric in gauges:
+                metrics[event.metric] = event.amount
+            else:
+                metrics[event.metric] = metrics.get(event.metric, 0) + event.amount
+
+            if event.user_id is not None:
+                users.setdefault(event.tenant_id, set()).add(event.user_id)
+
+        for tenant_id, user_ids in users.items():
+            metrics = deltas[tenant_id]
+            metrics["active_users"] = max(metrics.get("active_users", 0), len(user_ids))
+
+        return deltas
+
+    def restore(self, deltas: Dict[str, Dict[str, float]]) -> None:
+        """
+        전송하지 못한 집계값 되돌리기
+
+        다음 drain() 결과에 합산됩니다.
+        """
+        for tenant_id, metrics in deltas.items():
+            carry = self._carry.setdefault(tenant_id, {})
+            for metric, value in metrics.items():
+                if metric in self.gauge_metrics or metric == "active_users":
+                    carry[metric] = max(carry.get(metric, 0), value)
+                else:
+                    carry[metric] = carry.get(metric, 0) + value
+
+
+# 전역 기록기
+_recorder: Optional[UsageRecorder] = None
+
+
+def get_usage_recorder() -> UsageRecorder:
+    """전역 사용량 기록기 반환"""
+    global _recorder
+    if _recorder is None:
+        _recorder = UsageRecorder()
+    return _recorder
+
+
+def set_usage_recorder(recorder: UsageRecorder) -> None:
+    """전역 사용량 기록기 지정"""
+    global _recorder
+    _recorder = recorder
@@ -0,0 +1,298 @@
+"""
+사용량 주기 보고기
+
+UsageRecorder에 쌓인 테넌트별 사용량을 주기마다 하나의 압축 배치로
+Service Market에 전송합니다.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+import httpx
+from tenacity import (
+    AsyncRetrying,
+    stop_after_attempt,
+    wait_exponential,
+    retry_if_exception,
+)
+
+from mt_paas.config import MTPaaSConfig
+from .recorder import UsageRecorder
+
+logger = logging.getLogger(__name__)
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """재시도할 오류: 전송 오류, 5xx, 429 (그 외 4xx는 다시 보내도 같은 결과)"""
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return False
+
+
+class UsageReporter:
+    """
+    사용량 배치 보고기
+
+    - interval마다 변화가 있는 테넌트만 모아 gzip 배치 1건으로 전송
+    - 실패 시 지수 백오프로 재시도, 최종 실패한 배치는 다음 주기에 같은 내용 그대로 재전송
+    - 배치 순번(sequence)과 전송 중인 배치를 커서 파일에 저장하여 재시작 후에도 이어서 보고
+
+    같은 sequence는 항상 같은 내용이므로 마켓은 (service_id, sequence)로 중복 수신을 판별할 수 있습니다.
+
+    Example:
+        reporter = UsageReporter(
+            recorder,
+            endpoint="https://market.k-university.ai/api/v1/usage/batch",
+            api_key=os.getenv("MARKET_API_KEY"),
+            service_id="keli_tutor",
+        )
+
+        @app.on_event("startup")
+        async def startup():
+            await reporter.start()
+
+        @app.on_event("shutdown")
+        async def shutdown():
+            await reporter.stop()
+    """
+
+    def __init__(
+        self,
+        recorder: UsageRecorder,
+        endpoint: str,
+        api_key: Optional[str],
+        service_id: str,
+        interval_seconds: float = 300,
+        metrics: Optional[List[str]] = None,
+        cursor_path: Optional[str] = None,
+        max_retries: int = 5,
+        backoff_max_seconds: float = 60,
+        api_key_header: str = "X-Market-API-Key",
+        timeout: float = 30.0,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Args:
+            recorder: 사용량 기록기
+            endpoint: 마켓 사용량 수집 URL
+            api_key: 마켓 API 키
+            service_id: 서비스 ID
+            interval_seconds: 보고 주기 (초)
+            metrics: 보고할 메트릭 목록 (None이면 전체)
+            cursor_path: 커서 파일 경로 (None이면 저장하지 않음)
+            max_retries: 배치당 최대 전송 시도 횟수
+            backoff_max_seconds: 재시도 대기 상한 (초)
+            api_key_header: API 키 헤더 이름
+            timeout: 요청 타임아웃 (초)
+            http_client: 사용할 HTTP 클라이언트 (테스트 등)
+        """
+        self.recorder = recorder
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.service_id = service_id
+        self.interval_seconds = interval_seconds
+        self.metrics = set(metrics) if metrics else None
+        self.cursor_path = cursor_path
+        self.max_retries = max_retries
+        self.backoff_max_seconds = backoff_max_seconds
+        self.api_key_header = api_key_header
+        self.timeout = timeout
+
+        self._client = http_client
+        self._owns_client = http_client is None
+        self._task: Optional[asyncio.Task] = None
+
+        self._cursor: Dict[str, Any] = self._load_cursor()
+        # 이전 형식 커서의 미전송분 (배치로 만들기 전 집계값)
+        if self._cursor.get("pending"):
+            self.recorder.restore(self._cursor.pop("pending"))
+
+    @classmethod
+    def from_config(
+        cls,
+        recorder: UsageRecorder,
+        config: MTPaaSConfig,
+        **kwargs,
+    ) -> Optional["UsageReporter"]:
+        """설정에서 보고기 생성 (비활성이거나 엔드포인트가 없으면 None)"""
+        report = config.usage_report
+        if not report.enabled or not report.endpoint:
+            return None
+        return cls(
+            recorder,
+            endpoint=report.endpoint,
+            api_key=config.api_key,
+            service_id=config.service_name,
+            interval_seconds=report.interval_minutes * 60,
+            metrics=report.metrics,
+            cursor_path=report.cursor_path,
+            max_retries=report.max_retries,
+            backoff_max_seconds=report.backoff_max_seconds,
+            **kwargs,
+        )
+
+    @property
+    def sequence(self) -> int:
+        """마지막으로 전송 성공한 배치 순번"""
+        return self._cursor.get("sequence", 0)
+
+    # =========================================================================
+    # 실행 제어
+    # =========================================================================
+
+    async def start(self) -> None:
+        """백그라운드 보고 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Usage reporter started (interval: {self.interval_seconds}s)")
+
+    async def stop(self, flush: bool = True) -> None:
+        """백그라운드 보고 중지 (flush=True면 남은 사용량 전송)"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if flush:
+            await self.report_once()
+
+        if self._client and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.report_once()
+            except Exception as e:
+                logger.error(f"Usage report failed: {e}")
+
+    # =========================================================================
+    # 보고
+    # =========================================================================
+
+    async def report_once(self) -> bool:
+        """
+        누적된 사용량을 1회 보고
+
+        이전에 전송하지 못한 배치가 있으면 같은 sequence, 같은 내용으로 먼저 다시 보냅니다.
+        배치는 전송 전에 커서에 기록되므로 전송 중 취소(종료)되어도 사용량을 잃지 않습니다.
+
+        Returns:
+            bool: 전송 성공 여부 (보낼 사용량이 없으면 True)
+        """
+        while True:
+            batch = self._cursor.get("inflight")
+            retrying = batch is not None
+            if batch is None:
+                deltas = self._select_metrics(self.recorder.drain())
+                if not deltas:
+                    return True
+                batch = self._build_batch(self.sequence + 1, deltas)
+                self._cursor["inflight"] = batch
+                self._save_cursor()
+
+            try:
+                await self._send(batch)
+            except Exception as e:
+                logger.warning(f"Usage batch {batch['sequence']} not delivered: {e}")
+                return False
+
+            self._cursor["sequence"] = batch["sequence"]
+            self._cursor["last_reported_at"] = batch["reported_at"]
+            self._cursor.pop("inflight", None)
+            self._save_cursor()
+            logger.debug(f"Usage batch {batch['sequence']} sent ({len(batch['tenants'])} tenants)")
+            if not retrying:
+                return True
+
+    def _select_metrics(self, deltas: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        """보고 대상 메트릭만 남기고, 남은 값이 없는 테넌트는 제외"""
+        if self.metrics is None:
+            return deltas
+        selected = {}
+        for tenant_id, metrics in deltas.items():
+            kept = {k: v for k, v in metrics.items() if k in self.metrics}
+            if kept:
+                selected[tenant_id] = kept
+        return selected
+
+    def _build_batch(self, sequence: int, deltas: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+        """배치 페이로드 생성"""
+        return {
+            "service_id": self.service_id,
+            "sequence": sequence,
+            "since": self._cursor.get("last_reported_at"),
+            "reported_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "tenants": [
+                {"tenant_id": tenant_id, "metrics": metrics}
+                for tenant_id, metrics in deltas.items()
+            ],
+        }
+
+    async def _send(self, batch: Dict[str, Any]) -> None:
+        """gzip 압축 배치 전송 (전송 오류/5xx/429만 지수 백오프 재시도)"""
+        body = gzip.compress(json.dumps(batch, separators=(",", ":")).encode("utf-8"))
+        headers = {
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+        }
+        if self.api_key:
+            headers[self.api_key_header] = self.api_key
+
+        client = self._get_client()
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(self.max_retries),
+            wait=wait_exponential(multiplier=1, max=self.backoff_max_seconds),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True,
+        ):
+            with attempt:
+                response = await client.post(self.endpoint, content=body, headers=headers)
+                response.raise_for_status()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """HTTP 클라이언트 반환"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    # =========================================================================
+    # 커서
+    # =========================================================================
+
+    def _load_cursor(self) -> Dict[str, Any]:
+        """커서 파일 로드"""
+        if not self.cursor_path or not os.path.exists(self.cursor_path):
+            return {}
+        try:
+            with open(self.cursor_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Usage cursor unreadable, starting fresh: {e}")
+            return {}
+
+    def _save_cursor(self) -> None:
+        """커서 파일 저장 (임시 파일 기록 후 교체)"""
+        if not self.cursor_path:
+            return
+
+        tmp_path = f"{self.cursor_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._cursor, f)
+            os.replace(tmp_path, self.cursor_path)
+        except OSError as e:
+            logger.error(f"Usage cursor save failed: {e}")
@@ -0,0 +1,314 @@
+"""
+테넌트별 상위 사용자 추적기
+
+사용량 이벤트가 들어올 때마다 Space-Saving 스케치를 갱신하여
+/stats/top-users 조회 시 전체 사용자 정렬 없이 상위 K명을 반환합니다.
+"""
+
+import heapq
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Tuple
+
+from mt_paas.standard_api.models_v2 import TopUser, TopUsersResponse
+from .recorder import UsageEvent, UsageRecorder
+
+# 이벤트 메트릭 → TopUser 필드
+_METRIC_FIELDS = {
+    "sessions": "sessions",
+    "messages": "messages",
+    "tokens": "tokens",
+    "llm_tokens": "tokens",
+}
+
+_ROLLING_PERIOD = re.compile(r"^(\d+)d$")
+
+
+class _Entry:
+    """스케치 항목"""
+    __slots__ = ("score", "error", "sessions", "messages", "tokens", "last_active", "name", "email")
+
+    def __init__(self, score: float = 0, error: float = 0):
+        self.score = score
+        self.error = error
+        self.sessions = 0
+        self.messages = 0
+        self.tokens = 0
+        self.last_active = 0.0
+        self.name: Optional[str] = None
+        self.email: Optional[str] = None
+
+
+class _SpaceSaving:
+    """
+    Space-Saving 스케치
+
+    최대 capacity명의 카운터만 유지합니다. 가득 찬 상태에서 새 사용자가 오면
+    점수가 가장 낮은 항목을 대체하고, 그 점수를 오차(error)로 물려받습니다.
+    """
+    __slots__ = ("capacity", "entries", "_heap")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries: Dict[str, _Entry] = {}
+        # (score, user_id) 최소 힙 - 갱신된 항목은 지연 삭제
+        self._heap: List[Tuple[float, str]] = []
+
+    def add(
+        self, user_id: str, field: Optional[str], amount: float, score_inc: float, ts: float
+    ) -> Optional[_Entry]:
+        """
+        사용량 반영 (추적하지 않는 사용자의 점수 0 이벤트는 무시)
+
+        가득 찬 상태에서 점수가 늘지 않는 이벤트(순위 기준이 아닌 필드)로
+        기존 상위 사용자를 밀어내지 않습니다.
+        """
+        entry = self.entries.get(user_id)
+        created = entry is None
+        if created:
+            if len(self.entries) < self.capacity:
+                entry = _Entry()
+            elif score_inc <= 0:
+                return None
+            else:
+                floor = self._pop_min()
+                entry = _Entry(score=floor, error=floor)
+            self.entries[user_id] = entry
+
+        if field is not None:
+            setattr(entry, field, getattr(entry, field) + amount)
+        if ts > entry.last_active:
+            entry.last_active = ts
+
+        if score_inc or created:
+            entry.score += score_inc
+            heapq.heappush(self._heap, (entry.score, user_id))
+            if len(self._heap) > self.capacity * 4:
+                self._compact()
+        return entry
+
+    def _pop_min(self) -> float:
+        """점수가 가장 낮은 항목 제거 후 그 점수 반환"""
+        heap = self._heap
+        while heap:
+            score, user_id = heapq.heappop(heap)
+            entry = self.entries.get(user_id)
+            if entry is not None and entry.score == score:
+                del self.entries[user_id]
+                return score
+        # 힙이 비었으면 전수 탐색
+        user_id = min(self.entries, key=lambda u: self.entries[u].score)
+        return self.entries.pop(user_id).score
+
+    def _compact(self) -> None:
+        self._heap = [(e.score, uid) for uid, e in self.entries.items()]
+        heapq.heapify(self._heap)
+
+    @classmethod
+    def from_entries(cls, capacity: int, entries: Dict[str, _Entry]) -> "_SpaceSaving":
+        """병합 결과 중 점수 상위 capacity명으로 스케치 생성"""
+        sketch = cls(capacity)
+        if len(entries) > capacity:
+            entries = dict(heapq.nlargest(capacity, entries.items(), key=lambda item: item[1].score))
+        sketch.entries = entries
+        sketch._compact()
+        return sketch
+
+
+class TopUsersTracker:
+    """
+    테넌트별 상위 사용자 추적기
+
+    테넌트 × 일(YYYY-MM-DD) / 월(YYYY-MM) 단위로 Space-Saving 스케치를 유지합니다.
+
+    - "YYYY-MM", "YYYY-MM-DD" 기간: 해당 스케치에서 바로 상위 K명 선택
+    - "7d", "30d" 등 최근 N일 기간: 처음 조회 시(하루 한 번) 최근 N개 일별 스케치를 병합해
+      롤링 스케치를 만들고, 이후 오늘 이벤트는 롤링 스케치에도 바로 반영 (조회는 capacity에 비례)
+
+    capacity가 limit보다 충분히 크면 상위 K명은 정확하며,
+    각 점수의 과대 추정 오차는 error 이하입니다.
+
+    Example:
+        tracker = TopUsersTracker(rank_by="messages")
+        tracker.attach(recorder)
+
+        class MyHandler(StandardAPIHandlerV2):
+            top_users_tracker = tracker
+    """
+
+    def __init__(
+        self,
+        rank_by: str = "messages",
+        capacity: int = 200,
+        retention_days: int = 90,
+    ):
+        """
+        Args:
+            rank_by: 순위 기준 (sessions, messages, tokens)
+            capacity: 기간별 추적 사용자 수 (조회 limit의 4배 이상 권장)
+            retention_days: 일별 스케치 보관 일수
+        """
+        if rank_by not in ("sessions", "messages", "tokens"):
+            raise ValueError(f"Unsupported rank_by: {rank_by}")
+        self.rank_by = rank_by
+        self.capacity = capacity
+        self.retention_days = retention_days
+
+        # {tenant_id: {period_key: sketch}}
+        self._sketches: Dict[str, Dict[str, _SpaceSaving]] = {}
+        # 최근 N일 롤링 스케치 {tenant_id: {days: (기준일 YYYY-MM-DD, sketch)}}
+        self._rolling: Dict[str, Dict[int, Tuple[str, _SpaceSaving]]] = {}
+
+    def attach(self, recorder: UsageRecorder) -> None:
+        """사용량 기록기에 연결"""
+        recorder.add_listener(self.observe)
+
+    def observe(self, event: UsageEvent) -> None:
+        """사용량 이벤트 반영 (UsageRecorder 리스너)"""
+        if event.user_id is None:
+            return
+        field = _METRIC_FIELDS.get(event.metric)
+        if field is None:
+            return
+        tags = event.tags or {}
+        self.record(
+            event.tenant_id,
+            event.user_id,
+            field,
+            event.amount,
+            timestamp=event.timestamp or None,
+            name=tags.get("name"),
+            email=tags.get("email"),
+        )
+
+    def record(
+        self,
+        tenant_id: str,
+        user_id: str,
+        field: str,
+        amount: float = 1,
+        timestamp: Optional[float] = None,
+        name: Optional[str] = None,
+        email: Optional[str] = None,
+    ) -> None:
+        """사용자 사용량 반영 (field: sessions, messages, tokens)"""
+        ts = timestamp or time.time()
+        day = datetime.utcfromtimestamp(ts)
+        day_key = day.strftime("%Y-%m-%d")
+        score_inc = amount if field == self.rank_by else 0
+
+        periods = self._sketches.get(tenant_id)
+        if periods is None:
+            periods = self._sketches[tenant_id] = {}
+
+        sketches = [periods.get(key) for key in (day_key, day_key[:7])]
+        for i, key in enumerate((day_key, day_key[:7])):
+            if sketches[i] is None:
+                sketches[i] = periods[key] = _SpaceSaving(self.capacity)
+                if len(key) == 10:
+                    self._expire(periods, day)
+
+        rolling = self._rolling.get(tenant_id)
+        if rolling:
+            for days, (base_day, sketch) in list(rolling.items()):
+                if base_day == day_key:
+                    sketches.append(sketch)
+                else:
+                    # 다른 날짜의 이벤트 (지난 날 보정 등)는 다음 조회 때 다시 병합
+                    del rolling[days]
+
+        for sketch in sketches:
+            entry = sketch.add(user_id, field, amount, score_inc, ts)
+            if entry is None:
+                continue
+            if name:
+                entry.name = name
+            if email:
+                entry.email = email
+
+    def _expire(self, periods: Dict[str, _SpaceSaving], today: datetime) -> None:
+        """보관 기간이 지난 일별/월별 스케치 제거"""
+        cutoff = (today - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        for key in [k for k in periods if k < cutoff[: len(k)]]:
+            del periods[key]
+
+    # =========================================================================
+    # 조회
+    # =========================================================================
+
+    def top(self, tenant_id: str, period: str = "30d", limit: int = 10) -> List[TopUser]:
+        """상위 사용자 목록"""
+        periods = self._sketches.get(tenant_id)
+        if not periods:
+            return []
+
+        match = _ROLLING_PERIOD.match(period)
+        if match:
+            entries = self._rolling_sketch(tenant_id, periods, int(match.group(1))).entries
+        else:
+            sketch = periods.get(period)
+            entries = sketch.entries if sketch else {}
+
+        best = heapq.nlargest(limit, entries.items(), key=lambda item: item[1].score)
+        return [self._to_top_user(user_id, entry) for user_id, entry in best]
+
+    def top_users_response(self, tenant_id: str, period: str = "30d", limit: int = 10) -> TopUsersResponse:
+        """TopUsersResponse 생성"""
+        return TopUsersResponse(
+            tenant_id=tenant_id,
+            period=period,
+            users=self.top(tenant_id, period, limit),
+        )
+
+    def forget_tenant(self, tenant_id: str) -> None:
+        """테넌트 데이터 제거"""
+        self._sketches.pop(tenant_id, None)
+        self._rolling.pop(tenant_id, None)
+
+    def _rolling_sketch(self, tenant_id: str, periods: Dict[str, _SpaceSaving], days: int) -> _SpaceSaving:
+        """최근 N일 롤링 스케치 (날짜가 바뀌었거나 없으면 일별 스케치를 병합해 새로 생성)"""
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+        rolling = self._rolling.setdefault(tenant_id, {})
+        cached = rolling.get(days)
+        if cached is not None and cached[0] == today:
+            return cached[1]
+        sketch = _SpaceSaving.from_entries(self.capacity, self._merge_recent(periods, days))
+        rolling[days] = (today, sketch)
+        return sketch
+
+    def _merge_recent(self, periods: Dict[str, _SpaceSaving], days: int) -> Dict[str, _Entry]:
+        """최근 N일 일별 스케치 병합"""
+        today = datetime.utcnow()
+        merged: Dict[str, _Entry] = {}
+        for offset in range(min(days, self.retention_days)):
+            key = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
+            sketch = periods.get(key)
+            if sketch is None:
+                continue
+            for user_id, entry in sketch.entries.items():
+                acc = merged.get(user_id)
+                if acc is None:
+                    acc = merged[user_id] = _Entry()
+                acc.score += entry.score
+                acc.error += entry.error
+                acc.sessions += entry.sessions
+                acc.messages += entry.messages
+                acc.tokens += entry.tokens
+                if entry.last_active > acc.last_active:
+                    acc.last_active = entry.last_active
+                acc.name = acc.name or entry.name
+                acc.email = acc.email or entry.email
+        return merged
+
+    @staticmethod
+    def _to_top_user(user_id: str, entry: _Entry) -> TopUser:
+        return TopUser(
+            user_id=user_id,
+            name=entry.name or user_id,
+            email=entry.email or "",
+            sessions=int(entry.sessions),
+            messages=int(entry.messages),
+            tokens=int(entry.tokens),
+            last_active=datetime.utcfromtimestamp(entry.last_active).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        )
@@ -0,0 +1,88 @@
+"""
+TenantMiddleware 요청당 오버헤드 벤치마크
+
+HTTP 서버 없이 ASGI 앱을 직접 호출하여, 미들웨어가 없는 앱 대비
+요청 1건당 추가되는 시간을 측정합니다.
+
+사용법:
+    python sandbox/benchmarks/middleware_overhead.py [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from mt_paas.middleware import TenantMiddleware
+
+
+async def ping(request):
+    return PlainTextResponse("ok")
+
+
+def build_app(with_middleware: bool) -> Starlette:
+    app = Starlette(routes=[Route("/tenant/{tenant_id}/ping", ping), Route("/health", ping)])
+    if with_middleware:
+        app.add_middleware(TenantMiddleware)
+    return app
+
+
+def make_scope(path: str, headers: list) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+        "client": ("127.0.0.1", 12345),
+        "server": ("test", 80),
+    }
+
+
+async def run(app, scope: dict, n: int) -> float:
+    """n건 처리 후 요청당 평균 시간(µs) 반환"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    # warm-up
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def main(n: int) -> None:
+    cases = {
+        "header": make_scope("/tenant/t1/ping", [(b"host", b"test"), (b"x-tenant-id", b"t1")]),
+        "path": make_scope("/tenant/t1/ping", [(b"host", b"test")]),
+        "excluded": make_scope("/health", [(b"host", b"test")]),
+    }
+    bare = build_app(False)
+    wrapped = build_app(True)
+
+    print(f"{'case':<10} {'bare (µs)':>10} {'middleware (µs)':>16} {'overhead (µs)':>14}")
+    for name, scope in cases.items():
+        base = await run(bare, scope, n)
+        with_mw = await run(wrapped, scope, n)
+        print(f"{name:<10} {base:>10.1f} {with_mw:>16.1f} {with_mw - base:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
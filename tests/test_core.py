@@ -354,5 +354,1638 @@ class TestLifecycleEvents:
         assert LifecycleEvent.AFTER_ACTIVATE.value == "after_activate"
 
 
+
+class TestTenantMiddleware:
+    """테넌트 식별 미들웨어 테스트"""
+
+    def _client(self, **kwargs):
+        import httpx
+        from fastapi import FastAPI
+        from fastapi.responses import StreamingResponse
+        from mt_paas.middleware import TenantMiddleware, get_current_tenant
+
+        app = FastAPI()
+        app.add_middleware(TenantMiddleware, **kwargs)
+
+        def current():
+            ctx = get_current_tenant()
+            return ctx.tenant_id if ctx else None
+
+        @app.get("/whoami")
+        async def whoami():
+            return {"tenant_id": current()}
+
+        @app.get("/tenant/{tenant_id}/whoami")
+        async def whoami_path(tenant_id: str):
+            return {"tenant_id": current()}
+
+        @app.get("/health")
+        async def health():
+            return {"tenant_id": current()}
+
+        @app.get("/stream")
+        async def stream():
+            async def body():
+                for _ in range(3):
+                    yield f"{current()}\n"
+            return StreamingResponse(body(), media_type="text/plain")
+
+        transport = httpx.ASGITransport(app=app)
+        return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+    @pytest.mark.asyncio
+    async def test_identification_order(self):
+        """헤더 → 경로 → 쿼리 → 서브도메인 순 식별"""
+        async with self._client() as client:
+            header = await client.get("/tenant/by_path/whoami", headers={"X-Tenant-ID": "by_header"})
+            path = await client.get("/tenant/by_path/whoami")
+            query = await client.get("/whoami?tenant_id=by_query")
+            subdomain = await client.get("/whoami", headers={"host": "by-sub.service.com"})
+            www = await client.get("/whoami", headers={"host": "www.service.com"})
+            excluded = await client.get("/health", headers={"X-Tenant-ID": "ignored"})
+
+        assert header.json()["tenant_id"] == "by_header"
+        assert path.json()["tenant_id"] == "by_path"
+        assert query.json()["tenant_id"] == "by_query"
+        assert subdomain.json()["tenant_id"] == "by-sub"
+        assert www.json()["tenant_id"] is None
+        assert excluded.json()["tenant_id"] is None
+
+    @pytest.mark.asyncio
+    async def test_require_tenant_and_lookup(self):
+        """테넌트 필수 시 401, 조회 실패 시 컨텍스트 없음"""
+        async def lookup(tenant_id):
+            return TenantContextStub() if tenant_id == "known" else None
+
+        class TenantContextStub:
+            plan = "premium"
+
+        async with self._client(require_tenant=True, tenant_lookup=lookup) as client:
+            missing = await client.get("/whoami")
+            unknown = await client.get("/whoami", headers={"X-Tenant-ID": "unknown"})
+            known = await client.get("/whoami", headers={"X-Tenant-ID": "known"})
+
+        assert missing.status_code == 401
+        assert missing.json() == {"detail": "Tenant identification required"}
+        assert unknown.json()["tenant_id"] is None
+        assert known.json()["tenant_id"] == "known"
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_keeps_context(self):
+        """스트리밍 응답 본문 생성 중에도 컨텍스트 유지"""
+        from mt_paas.middleware import get_current_tenant
+
+        async with self._client() as client:
+            response = await client.get("/stream", headers={"X-Tenant-ID": "t1"})
+
+        assert response.text == "t1\nt1\nt1\n"
+        assert get_current_tenant() is None
+
+class TestTenantLookupCache:
+    """테넌트 조회 캐시 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_positive_and_negative_caching(self):
+        """있는/없는 테넌트 모두 캐시, 동시 미스는 1회 조회"""
+        import asyncio
+        from mt_paas.middleware import TenantLookupCache
+
+        calls = []
+
+        async def loader(tenant_id):
+            calls.append(tenant_id)
+            await asyncio.sleep(0)
+            return {"id": tenant_id} if tenant_id == "known" else None
+
+        cache = TenantLookupCache(ttl=60, negative_ttl=60)
+        results = await asyncio.gather(*(cache.lookup("known", loader) for _ in range(5)))
+        assert results == [{"id": "known"}] * 5
+
+        assert await cache.lookup("garbage", loader) is None
+        assert await cache.lookup("garbage", loader) is None
+        assert calls == ["known", "garbage"]
+        assert cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_and_max_size(self):
+        """만료 및 LRU 제거"""
+        import time
+        from mt_paas.middleware import TenantLookupCache
+
+        cache = TenantLookupCache(ttl=60, negative_ttl=0, max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert len(cache) == 2
+        assert "b" not in cache._entries
+
+        # negative_ttl=0이면 None 결과는 캐시하지 않음
+        cache.set("missing", None)
+        assert "missing" not in cache._entries
+
+        cache._entries["a"] = (time.monotonic() - 1, 1)
+        cache.get("a")
+        assert "a" not in cache._entries
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_lifecycle_invalidation(self):
+        """생성/삭제 이벤트 시 무효화"""
+        from types import SimpleNamespace
+        from mt_paas.core.lifecycle import TenantLifecycle, LifecycleEvent
+        from mt_paas.middleware import TenantLookupCache
+
+        lifecycle = TenantLifecycle(db_manager=None)
+        cache = TenantLookupCache()
+        cache.bind_lifecycle(lifecycle)
+
+        cache.set("t1", None)
+        await lifecycle._emit(LifecycleEvent.AFTER_CREATE, tenant=SimpleNamespace(id="t1"))
+        assert len(cache) == 0
+
+        cache.set("t1", {"id": "t1"})
+        await lifecycle._emit(LifecycleEvent.AFTER_DELETE, tenant_id="t1", hard_delete=False)
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_middleware_uses_cache(self):
+        """미들웨어가 캐시를 거쳐 조회"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.middleware import TenantMiddleware, TenantLookupCache
+
+        calls = []
+
+        async def lookup(tenant_id):
+            calls.append(tenant_id)
+            return None
+
+        app = FastAPI()
+        app.add_middleware(TenantMiddleware, tenant_lookup=lookup, lookup_cache=TenantLookupCache())
+
+        @app.get("/ping")
+        async def ping():
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(5):
+                await client.get("/ping", headers={"host": "garbage.service.com"})
+
+        assert calls == ["garbage"]
+
+
+    @pytest.mark.asyncio
+    async def test_owner_cancel_does_not_fail_waiters(self):
+        """처음 조회한 요청이 취소되어도 대기 중인 요청은 결과를 받고 결과는 캐시됨"""
+        import asyncio
+        from mt_paas.middleware import TenantLookupCache
+
+        release = asyncio.Event()
+
+        async def loader(tenant_id):
+            await release.wait()
+            return {"id": tenant_id}
+
+        cache = TenantLookupCache()
+        owner = asyncio.create_task(cache.lookup("t1", loader))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.lookup("t1", loader))
+        await asyncio.sleep(0)
+        owner.cancel()
+        release.set()
+
+        assert await waiter == {"id": "t1"}
+        assert owner.cancelled()
+        assert cache.get("t1") == {"id": "t1"}
+
+    @pytest.mark.asyncio
+    async def test_lookup_error_not_cached_as_missing(self):
+        """조회 오류는 없는 테넌트로 캐시하지 않고 503 응답"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.middleware import TenantMiddleware, TenantLookupCache
+
+        calls = []
+
+        async def lookup(tenant_id):
+            calls.append(tenant_id)
+            if len(calls) == 1:
+                raise ConnectionError("db down")
+            return {"plan": "basic"}
+
+        cache = TenantLookupCache(negative_ttl=60)
+        app = FastAPI()
+        app.add_middleware(TenantMiddleware, tenant_lookup=lookup, lookup_cache=cache)
+
+        @app.get("/ping")
+        async def ping():
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            failed = await client.get("/ping", headers={"X-Tenant-ID": "t1"})
+            recovered = await client.get("/ping", headers={"X-Tenant-ID": "t1"})
+
+        assert failed.status_code == 503
+        assert recovered.status_code == 200
+        assert calls == ["t1", "t1"]
+
+
+class TestKnownTenantFilter:
+    """알려진 테넌트 ID Bloom filter 테스트"""
+
+    def test_membership_and_false_positive_rate(self):
+        """등록된 ID는 항상 통과, 없는 ID는 대부분 거절"""
+        from mt_paas.middleware import KnownTenantFilter
+
+        known = KnownTenantFilter(error_rate=0.01)
+        assert known.might_contain("anything")  # 구성 전에는 모두 통과
+
+        ids = [f"tenant_{i}" for i in range(5000)]
+        known.build(ids)
+        assert all(known.might_contain(t) for t in ids)
+
+        false_positives = sum(known.might_contain(f"scanner_{i}") for i in range(10000))
+        assert false_positives < 300
+        assert known.stats()["tenants"] == 5000
+
+    @pytest.mark.asyncio
+    async def test_refresh_keeps_ids_added_during_rebuild(self):
+        """재구성 중 생성 이벤트로 추가된 ID 유지, 실패 시 기존 필터 유지"""
+        import asyncio
+        from types import SimpleNamespace
+        from mt_paas.core.lifecycle import TenantLifecycle, LifecycleEvent
+        from mt_paas.middleware import KnownTenantFilter
+
+        release = asyncio.Event()
+        source = ["t1"]
+
+        async def loader():
+            snapshot = list(source)
+            await release.wait()
+            return snapshot
+
+        lifecycle = TenantLifecycle(db_manager=None)
+        known = KnownTenantFilter(loader=loader)
+        known.bind_lifecycle(lifecycle)
+
+        task = asyncio.ensure_future(known.refresh())
+        await asyncio.sleep(0)
+        await lifecycle._emit(LifecycleEvent.AFTER_CREATE, tenant=SimpleNamespace(id="t2"))
+        release.set()
+        await task
+
+        assert known.might_contain("t1") and known.might_contain("t2")
+
+        async def broken():
+            raise RuntimeError("db down")
+
+        known.loader = broken
+        await known.refresh()
+        assert known.might_contain("t1")
+
+    @pytest.mark.asyncio
+    async def test_middleware_skips_lookup_for_unknown_ids(self):
+        """없는 테넌트 ID는 tenant_lookup 호출 없이 거절"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.middleware import TenantMiddleware, KnownTenantFilter, get_current_tenant
+
+        calls = []
+
+        async def lookup(tenant_id):
+            calls.append(tenant_id)
+            return {"plan": "basic"}
+
+        known = KnownTenantFilter()
+        known.build(["hallym"])
+
+        app = FastAPI()
+        app.add_middleware(TenantMiddleware, tenant_lookup=lookup, known_tenants=known)
+
+        @app.get("/ping")
+        async def ping():
+            ctx = get_current_tenant()
+            return {"tenant": ctx.tenant_id if ctx else None}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            bogus = await client.get("/ping", headers={"host": "wp-admin.service.com"})
+            real = await client.get("/ping", headers={"host": "hallym.service.com"})
+
+        assert bogus.json() == {"tenant": None}
+        assert real.json() == {"tenant": "hallym"}
+        assert calls == ["hallym"]
+        assert known.rejected == 1
+
+
+class TestSharedTenantDirectory:
+    """워커 공유 테넌트 디렉터리 테스트"""
+
+    def test_write_and_lookup(self, tmp_path):
+        """상태/요금제/기능 비트셋/설정 조회, 파일 교체 감지"""
+        from mt_paas.middleware import SharedTenantDirectory, DirectoryEntry, write_directory
+
+        path = str(tmp_path / "tenants.dir")
+        many_features = {f"feature_{i}": i % 2 == 0 for i in range(100)}
+        write_directory(path, [
+            DirectoryEntry("hallym", "active", "premium", {"rag": True, "quiz": False}, {"theme": "dark"}),
+            DirectoryEntry("paused", "suspended", "free"),
+            DirectoryEntry("wide", "active", "enterprise", many_features),
+        ])
+
+        directory = SharedTenantDirectory(path, check_interval=0)
+        hallym = directory.get("hallym")
+        assert hallym.is_active and hallym.plan == "premium"
+        assert hallym.features == {"rag": True}
+        assert hallym.to_context().config == {"theme": "dark"}
+        # 설정 JSON은 매핑당 1회만 디코딩
+        assert directory.get("hallym").config is hallym.config
+        assert not directory.get("paused").is_active
+        assert directory.get("wide").features == {k: True for k, v in many_features.items() if v}
+        assert directory.get("unknown") is None
+        assert len(directory) == 3
+
+        generation = directory.generation
+        write_directory(path, [DirectoryEntry("newcomer", "active")])
+        assert directory.get("newcomer").plan == "basic"
+        assert directory.get("hallym") is None
+        assert directory.generation != generation
+
+    @pytest.mark.asyncio
+    async def test_directory_misses_are_negative_cached(self, tmp_path):
+        """디렉터리를 쓰면 있는 테넌트는 캐시하지 않고, DB까지 간 미스만 캐시"""
+        from fastapi import FastAPI
+        from mt_paas import setup_multi_tenant, MTPaaSConfig
+        from mt_paas.middleware import DirectoryEntry, write_directory
+        from mt_paas.setup import _create_default_lookup
+
+        path = str(tmp_path / "tenants.dir")
+        write_directory(path, [DirectoryEntry("hallym", "active", "premium")])
+        config = MTPaaSConfig()
+        config.tenant_cache.shared_directory = True
+        config.tenant_cache.shared_directory_path = path
+        mt = setup_multi_tenant(FastAPI(), central_db_url="sqlite+aiosqlite:///:memory:", config=config)
+
+        loads = []
+
+        async def load(tenant_id):
+            loads.append(tenant_id)
+            return None
+
+        mt.tenant_loader.load = load
+        lookup = _create_default_lookup(mt)
+        for _ in range(3):
+            assert (await mt.tenant_cache.lookup("hallym", lookup)).plan == "premium"
+            assert await mt.tenant_cache.lookup("unknown", lookup) is None
+
+        assert loads == ["unknown"]
+        assert len(mt.tenant_cache) == 1
+
+    def test_missing_file(self, tmp_path):
+        """파일이 아직 없으면 준비 안 됨"""
+        from mt_paas.middleware import SharedTenantDirectory
+
+        directory = SharedTenantDirectory(str(tmp_path / "none.dir"), check_interval=0)
+        assert not directory.ready
+        assert directory.get("hallym") is None
+
+    @pytest.mark.asyncio
+    async def test_single_refresher_and_refresh_requests(self, tmp_path):
+        """잠금을 잡은 1개만 갱신, 다른 워커의 갱신 요청 반영"""
+        from mt_paas.middleware import SharedTenantDirectory, DirectoryRefresher, DirectoryEntry
+
+        path = str(tmp_path / "tenants.dir")
+        tenants = [DirectoryEntry("t1", "active")]
+
+        async def loader():
+            return list(tenants)
+
+        leader = DirectoryRefresher(path, loader)
+        follower = DirectoryRefresher(path, loader)
+        try:
+            assert leader.try_acquire()
+            assert not follower.try_acquire()
+
+            assert leader._refresh_due()
+            await leader.refresh()
+            assert not leader._refresh_due()
+
+            tenants.append(DirectoryEntry("t2", "active"))
+            follower.request_refresh()
+            assert leader._refresh_due()
+            await leader.refresh()
+            assert SharedTenantDirectory(path).get("t2") is not None
+        finally:
+            leader.release()
+            follower.release()
+
+class TestRateLimit:
+    """요금제별 속도 제한 테스트"""
+
+    def test_token_bucket(self):
+        """버킷 소진 후 대기 시간 반환, 시간 경과 시 충전"""
+        from mt_paas.middleware import MemoryRateLimiter
+
+        limiter = MemoryRateLimiter()
+        assert all(limiter.acquire("t1", 30) == 0.0 for _ in range(30))
+        wait = limiter.acquire("t1", 30)
+        assert 0 < wait <= 2.0
+
+        # 다른 테넌트는 독립
+        assert limiter.acquire("t2", 30) == 0.0
+
+        # 4초 경과 → 토큰 2개 충전 (30 rpm = 0.5/s)
+        limiter._buckets["t1"].updated -= 4
+        assert limiter.acquire("t1", 30) == 0.0
+
+    def test_idle_buckets_evicted(self):
+        """1분 이상 유휴 버킷과 최대 개수 초과분(LRU)은 제거, 사용 중인 버킷은 유지"""
+        from mt_paas.middleware import MemoryRateLimiter
+
+        limiter = MemoryRateLimiter(max_buckets=3)
+        for tenant in ("a", "b", "c"):
+            limiter.acquire(tenant, 30)
+        limiter.acquire("a", 30)
+
+        # 최대 개수 초과 → 가장 오래 사용되지 않은 b 제거
+        limiter.acquire("d", 30)
+        assert list(limiter._buckets) == ["c", "a", "d"]
+
+        # 유휴 버킷(가득 찬 상태)은 개수와 관계없이 제거
+        for tenant in ("c", "a"):
+            limiter._buckets[tenant].updated -= 61
+        limiter.acquire("e", 30)
+        assert list(limiter._buckets) == ["d", "e"]
+
+    def test_config_from_env(self, monkeypatch):
+        """요금제별 rpm 환경변수"""
+        from mt_paas.config import RateLimitConfig
+
+        monkeypatch.setenv("MT_RATE_LIMIT_BY_PLAN", "free=5,custom=7")
+        config = RateLimitConfig.from_env()
+        assert config.enabled is False
+        assert config.rpm_for("free") == 5
+        assert config.rpm_for("custom") == 7
+        assert config.rpm_for("premium") == 300
+        assert config.rpm_for("unknown") == 60
+
+    @pytest.mark.asyncio
+    async def test_middleware_429_with_retry_after(self):
+        """한도 초과 시 429 + Retry-After"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.middleware import RateLimitMiddleware, TenantMiddleware
+
+        class Info:
+            def __init__(self, plan):
+                self.plan = plan
+
+        async def lookup(tenant_id):
+            return Info("free" if tenant_id == "small" else "enterprise")
+
+        app = FastAPI()
+        app.add_middleware(RateLimitMiddleware, by_plan={"free": 2, "enterprise": 0})
+        app.add_middleware(TenantMiddleware, tenant_lookup=lookup)
+
+        @app.get("/ping")
+        async def ping():
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            small = [await client.get("/ping", headers={"X-Tenant-ID": "small"}) for _ in range(3)]
+            big = [await client.get("/ping", headers={"X-Tenant-ID": "big"}) for _ in range(5)]
+            anonymous = await client.get("/ping")
+
+        assert [r.status_code for r in small] == [200, 200, 429]
+        assert small[2].headers["Retry-After"] == "30"
+        assert small[2].json()["error"] == "RATE_LIMITED"
+        assert all(r.status_code == 200 for r in big)
+        assert anonymous.status_code == 200
+
+class TestFairScheduler:
+    """테넌트별 동시 처리 제한 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_noisy_tenant_queues_others_proceed(self):
+        """한도를 넘은 테넌트만 대기, 다른 테넌트는 바로 처리"""
+        import asyncio
+        from mt_paas.middleware import FairScheduler
+
+        scheduler = FairScheduler(max_concurrency=10, by_plan={"free": 2})
+        await scheduler.acquire("noisy", "free")
+        await scheduler.acquire("noisy", "free")
+
+        waiter = asyncio.create_task(scheduler.acquire("noisy", "free"))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert scheduler.stats()["noisy"]["queued"] == 1
+
+        await asyncio.wait_for(scheduler.acquire("quiet", "free"), 0.1)
+
+        scheduler.release("noisy")
+        await asyncio.wait_for(waiter, 0.1)
+        stats = scheduler.stats()["noisy"]
+        assert stats["in_flight"] == 2
+        assert stats["queued"] == 0
+        assert stats["max_queue_depth"] == 1
+        assert stats["waited"] == 1
+
+    @pytest.mark.asyncio
+    async def test_weighted_dispatch(self):
+        """전체 슬롯 부족 시 (처리 중 수 / 가중치)가 작은 테넌트 우선"""
+        import asyncio
+        from mt_paas.middleware import FairScheduler
+
+        scheduler = FairScheduler(max_concurrency=4, by_plan={"free": 1, "premium": 4})
+        await scheduler.acquire("big", "premium")
+        await scheduler.acquire("big", "premium")
+        await scheduler.acquire("big", "premium")
+        await scheduler.acquire("small", "free")
+
+        order = []
+
+        async def wait(tenant_id, plan):
+            await scheduler.acquire(tenant_id, plan)
+            order.append(tenant_id)
+
+        tasks = [
+            asyncio.create_task(wait("big", "premium")),
+            asyncio.create_task(wait("small", "free")),
+        ]
+        await asyncio.sleep(0)
+
+        # small은 자기 한도(1)가 차 있으므로 big(3/4)에 배정
+        scheduler.release("big")
+        await asyncio.sleep(0.01)
+        assert order == ["big"]
+
+        # small 반환 → small(0/1)이 big(3/4)보다 우선
+        scheduler.release("small")
+        await asyncio.gather(*tasks)
+        assert order == ["big", "small"]
+
+    @pytest.mark.asyncio
+    async def test_middleware_503_after_max_wait(self):
+        """대기 시간 초과 시 503"""
+        import asyncio
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.middleware import ConcurrencyLimitMiddleware, FairScheduler, TenantMiddleware
+
+        scheduler = FairScheduler(by_plan={"basic": 1}, max_wait=0.05)
+        release = asyncio.Event()
+
+        app = FastAPI()
+        app.add_middleware(ConcurrencyLimitMiddleware, scheduler=scheduler)
+        app.add_middleware(TenantMiddleware)
+
+        @app.get("/slow")
+        async def slow():
+            await release.wait()
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.get("/slow", headers={"X-Tenant-ID": "t1"}))
+            await asyncio.sleep(0.01)
+            second = await client.get("/slow", headers={"X-Tenant-ID": "t1"})
+            release.set()
+            first = await first
+
+        assert first.status_code == 200
+        assert second.status_code == 503
+        assert second.json()["error"] == "CONCURRENCY_LIMITED"
+        stats = scheduler.stats()["t1"]
+        assert stats["rejected"] == 1
+        assert stats["in_flight"] == 0
+
+class TestAdmissionControl:
+    """표준 API 승인 제어 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_codel_sheds_after_sustained_delay(self):
+        """대기 지연이 interval 동안 target을 넘으면 새 요청 거절, 대기열이 비면 해제"""
+        import asyncio
+        from mt_paas.middleware import AdmissionController, AdmissionRejected
+
+        controller = AdmissionController(max_in_flight=1, target_delay=0.001, interval=0.01, max_wait=5)
+        await controller.acquire()
+
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0.005)
+        # 맨 앞 대기 요청이 target 초과 → interval 경과 후 차단
+        second = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0.02)
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire()
+        assert controller.dropping
+        assert controller.stats()["shed"] == 1
+
+        # 우선 요청은 차단 중에도 승인, 일반 슬롯은 쓰지도 반환하지도 않음
+        await controller.acquire(priority=True)
+        assert controller.stats()["priority_in_flight"] == 1
+        assert controller.in_flight == 1
+        controller.release(priority=True)
+        assert not waiter.done()
+        assert controller.priority_in_flight == 0
+
+        controller.release()
+        await waiter
+        controller.release()
+        await second
+        controller.release()
+        assert not controller.dropping
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout_and_queue_full(self):
+        """대기 시간 초과/대기열 초과 시 거절"""
+        import asyncio
+        from mt_paas.middleware import AdmissionController, AdmissionRejected
+
+        controller = AdmissionController(max_in_flight=1, target_delay=10, max_queue=1, max_wait=0.01)
+        await controller.acquire()
+
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected, match="queue full"):
+            await controller.acquire()
+        with pytest.raises(AdmissionRejected, match="wait timeout"):
+            await waiter
+        assert controller.stats()["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_middleware_priority_paths(self):
+        """차단 중에도 헬스체크/라이프사이클은 처리, 표준 API만 503"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.middleware import AdmissionControlMiddleware, AdmissionController
+
+        controller = AdmissionController(max_in_flight=1)
+        app = FastAPI()
+        app.add_middleware(AdmissionControlMiddleware, controller=controller, retry_after=2)
+
+        @app.get("/mt/health")
+        async def health():
+            return {}
+
+        @app.post("/mt/tenant/{tenant_id}/activate")
+        async def activate(tenant_id: str):
+            return {}
+
+        @app.get("/mt/tenant/{tenant_id}/stats")
+        async def stats(tenant_id: str):
+            return {}
+
+        @app.get("/app")
+        async def other():
+            return {}
+
+        await controller.acquire()
+        controller._queue.append((None, 0.0))
+        controller.dropping = True
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            shed = await client.get("/mt/tenant/t1/stats")
+            health = await client.get("/mt/health")
+            activate = await client.post("/mt/tenant/t1/activate")
+            other = await client.get("/app")
+
+        assert shed.status_code == 503
+        assert shed.headers["retry-after"] == "2"
+        assert shed.json()["error"] == "OVERLOADED"
+        assert (health.status_code, activate.status_code, other.status_code) == (200, 200, 200)
+        assert controller.in_flight == 1
+        assert controller.priority_in_flight == 0
+
+
+class TestTenantSharding:
+    """테넌트 고정 배정 (일관 해시 디스패처) 테스트"""
+
+    def test_ring_moves_only_new_node_share(self):
+        """노드 추가 시 새 노드로 가는 테넌트만 이동 (약 1/N)"""
+        from mt_paas.sharding import HashRing
+
+        ring = HashRing(["w0", "w1", "w2"])
+        tenants = [f"tenant_{i}" for i in range(3000)]
+        before = {t: ring.get(t) for t in tenants}
+        assert set(before.values()) == {"w0", "w1", "w2"}
+        assert all(ring.get(t) == before[t] for t in tenants)
+
+        ring.add("w3")
+        after = {t: ring.get(t) for t in tenants}
+        moved = [t for t in tenants if after[t] != before[t]]
+        assert all(after[t] == "w3" for t in moved)
+        assert 0.15 < len(moved) / len(tenants) < 0.35
+
+        # 장애 노드는 건너뛰고 링의 다음 노드
+        assert ring.get(tenants[0], skip={after[tenants[0]]}) != after[tenants[0]]
+
+    @pytest.mark.asyncio
+    async def test_dispatcher_pins_tenant_to_worker(self):
+        """같은 테넌트는 항상 같은 워커로, 본문/쿼리/상태 코드는 그대로 전달"""
+        import httpx
+        from fastapi import FastAPI, Request
+        from mt_paas.sharding import TenantDispatcher
+
+        def worker_app(name):
+            app = FastAPI()
+
+            @app.post("/tenant/{tenant_id}/echo")
+            async def echo(tenant_id: str, request: Request):
+                body = await request.body()
+                return {"worker": name, "body": body.decode(), "q": request.query_params.get("q")}
+
+            @app.get("/mt/health")
+            async def health():
+                return {"worker": name}
+
+            return app
+
+        dispatcher = TenantDispatcher()
+        for name in ["w0", "w1", "w2"]:
+            dispatcher.add_worker(name, transport=httpx.ASGITransport(app=worker_app(name)))
+
+        transport = httpx.ASGITransport(app=dispatcher)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            seen = set()
+            for _ in range(3):
+                response = await client.post("/tenant/hallym_univ/echo?q=1", content=b"hello")
+                assert response.status_code == 200
+                assert response.json()["body"] == "hello"
+                assert response.json()["q"] == "1"
+                seen.add(response.json()["worker"])
+            assert seen == {dispatcher.route("hallym_univ")}
+
+            # 테넌트 없는 요청은 워커에 순서대로 분산
+            workers = {(await client.get("/mt/health")).json()["worker"] for _ in range(3)}
+            assert workers == {"w0", "w1", "w2"}
+
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_worker_is_skipped(self):
+        """연결 실패한 워커는 제외하고 다음 워커로 전달"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.sharding import TenantDispatcher
+
+        class Unreachable(httpx.AsyncBaseTransport):
+            async def handle_async_request(self, request):
+                raise httpx.ConnectError("connection refused")
+
+        app = FastAPI()
+
+        @app.get("/tenant/{tenant_id}/ping")
+        async def ping(tenant_id: str):
+            return {"ok": True}
+
+        dispatcher = TenantDispatcher(retry_down=60)
+        dispatcher.add_worker("up", transport=httpx.ASGITransport(app=app))
+        dispatcher.add_worker("down", transport=Unreachable())
+        tenant = next(f"t{i}" for i in range(1000) if dispatcher.route(f"t{i}") == "down")
+
+        transport = httpx.ASGITransport(app=dispatcher)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(f"/tenant/{tenant}/ping")
+
+        assert response.status_code == 200
+        assert dispatcher.stats()["down"]["down"] is True
+        assert dispatcher.route(tenant) == "up"
+
+        await dispatcher.remove_worker("up")
+        assert dispatcher.route(tenant) is None
+        await dispatcher.close()
+
+
+class TestCPUAccounting:
+    """테넌트별 CPU 시간 계측 테스트"""
+
+    @staticmethod
+    def _burn(seconds):
+        from time import thread_time
+        end = thread_time() + seconds
+        while thread_time() < end:
+            pass
+
+    @pytest.mark.asyncio
+    async def test_interleaved_coroutines_are_separated(self):
+        """번갈아 실행되는 코루틴의 CPU 시간이 서로 섞이지 않음"""
+        import asyncio
+        from mt_paas.middleware import CPUAccount, measure_cpu
+
+        async def heavy():
+            for _ in range(5):
+                self._burn(0.01)
+                await asyncio.sleep(0)
+            return "done"
+
+        async def light():
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+        heavy_account, light_account = CPUAccount("heavy"), CPUAccount("light")
+        result, _ = await asyncio.gather(
+            measure_cpu(heavy(), heavy_account),
+            measure_cpu(light(), light_account),
+        )
+
+        assert result == "done"
+        assert heavy_account.seconds >= 0.045
+        assert light_account.seconds < 0.01
+
+    @pytest.mark.asyncio
+    async def test_exceptions_propagate(self):
+        """코루틴 예외/취소가 그대로 전달"""
+        import asyncio
+        from mt_paas.middleware import CPUAccount, measure_cpu
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await measure_cpu(fail(), CPUAccount("t1"))
+
+        task = asyncio.ensure_future(measure_cpu(asyncio.sleep(10), CPUAccount("t1")))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    @pytest.mark.asyncio
+    async def test_middleware_records_loop_and_threadpool_time(self):
+        """스레드 풀 작업 포함 CPU 시간을 UsageRecorder/메트릭에 반영"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.middleware import (
+            TenantMiddleware, CPUAccountingMiddleware, RequestMetrics, run_in_threadpool, get_cpu_account,
+        )
+        from mt_paas.usage import UsageRecorder
+
+        recorder = UsageRecorder()
+        metrics = RequestMetrics()
+        app = FastAPI()
+        app.add_middleware(CPUAccountingMiddleware, recorder=recorder, metrics=metrics)
+        app.add_middleware(TenantMiddleware)
+
+        @app.get("/work")
+        async def work():
+            await run_in_threadpool(self._burn, 0.03)
+            account = get_cpu_account()
+            return {"thread_ms": account.thread_seconds * 1000 if account else None}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/work", headers={"X-Tenant-ID": "t1"})
+            await client.get("/work")
+
+        assert response.json()["thread_ms"] >= 29
+        deltas = recorder.drain()
+        assert list(deltas) == ["t1"]
+        assert deltas["t1"]["cpu_ms"] >= 29
+        assert metrics.cpu_seconds()["t1"] >= 0.029
+        assert 'mt_tenant_cpu_seconds_total{tenant="t1"}' in metrics.render_prometheus()
+
+    @pytest.mark.asyncio
+    async def test_sync_endpoint_thread_time(self):
+        """FastAPI 동기 엔드포인트/의존성(스레드 풀 실행)의 CPU 시간도 합산"""
+        import httpx
+        from fastapi import Depends, FastAPI
+        from mt_paas.middleware import TenantMiddleware, CPUAccountingMiddleware, RequestMetrics
+
+        metrics = RequestMetrics()
+        app = FastAPI()
+        app.add_middleware(CPUAccountingMiddleware, metrics=metrics)
+        app.add_middleware(TenantMiddleware)
+
+        def heavy_dependency():
+            self._burn(0.02)
+
+        @app.get("/sync")
+        def sync_work(_=Depends(heavy_dependency)):
+            self._burn(0.02)
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/sync", headers={"X-Tenant-ID": "t1"})
+
+        assert metrics.cpu_seconds()["t1"] >= 0.039
+
+class TestMemoryProfiler:
+    """테넌트별 메모리 할당 샘플링 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_trace_excludes_interleaved_allocations(self):
+        """추적 요청 사이에 실행된 다른 코루틴의 할당은 포함하지 않음"""
+        import asyncio
+        import tracemalloc
+        from mt_paas.middleware import MemoryProfiler
+
+        kept = []
+
+        async def small():
+            for _ in range(3):
+                kept.append(bytearray(10_000))
+                await asyncio.sleep(0)
+
+        async def big():
+            for _ in range(3):
+                await asyncio.sleep(0)
+                kept.append(bytearray(1_000_000))
+
+        profiler = MemoryProfiler(sample_rate=1)
+        await asyncio.gather(profiler.trace("small", small()), big())
+
+        report = profiler.report()["small"]
+        assert report["samples"] == 1
+        assert 25 <= report["avg_net_kb"] < 100
+        assert not tracemalloc.is_tracing()
+
+    @pytest.mark.asyncio
+    async def test_sampling_and_debug_endpoint(self):
+        """N건 중 1건만 추적, 보고서 엔드포인트로 조회"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.middleware import (
+            TenantMiddleware, MemoryProfilingMiddleware, MemoryProfiler, create_memory_debug_router,
+        )
+
+        retained = []
+        profiler = MemoryProfiler(sample_rate=3, min_interval=0)
+        app = FastAPI()
+        app.add_middleware(MemoryProfilingMiddleware, profiler=profiler)
+        app.add_middleware(TenantMiddleware, exclude_paths=["/debug"])
+        app.include_router(create_memory_debug_router(profiler))
+
+        @app.get("/load")
+        async def load():
+            retained.append(bytearray(500_000))
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(6):
+                await client.get("/load", headers={"X-Tenant-ID": "t1"})
+            await client.get("/load", headers={"X-Tenant-ID": "t2"})
+            report = (await client.get("/debug/memory", params={"tenant_id": "t1"})).json()
+
+        assert report["sample_rate"] == 3
+        assert list(report["tenants"]) == ["t1"]
+        t1 = report["tenants"]["t1"]
+        assert t1["samples"] == 2
+        assert t1["max_peak_kb"] >= 480
+        assert "test_core.py" in t1["top_sites"][0]["site"]
+
+    def test_min_interval_limits_traces(self, monkeypatch):
+        """sample_rate와 별도로 min_interval 안에는 추적을 시작하지 않음"""
+        from mt_paas.middleware import memory
+        from mt_paas.middleware import MemoryProfiler
+
+        now = [100.0]
+        monkeypatch.setattr(memory, "monotonic", lambda: now[0])
+        profiler = MemoryProfiler(sample_rate=1, min_interval=5)
+
+        assert profiler.should_sample()
+        profiler._last_started = now[0]
+        assert not profiler.should_sample()
+        now[0] += 5
+        assert profiler.should_sample()
+
+class TestRequestMetrics:
+    """테넌트/라우트별 요청 메트릭 테스트"""
+
+    def test_histogram_and_top_tenants(self):
+        """고정 버킷 히스토그램, 상위 N 외 테넌트는 other로 병합"""
+        from mt_paas.middleware import RequestMetrics
+
+        metrics = RequestMetrics(buckets=(0.1, 1.0), top_tenants=1)
+        for _ in range(3):
+            metrics.observe("busy", "/items/{id}", "GET", 200, 0.05)
+        metrics.observe("quiet1", "/items/{id}", "GET", 404, 0.5)
+        metrics.observe("quiet2", "/items/{id}", "GET", 500, 5.0)
+
+        snapshot = metrics.snapshot()
+        assert set(snapshot) == {"busy", "other"}
+        other = snapshot["other"][("/items/{id}", "GET")]
+        assert other.count == 2
+        assert other.status == [0, 0, 0, 1, 1]
+        assert other.buckets == [0, 1, 1]
+
+        text = metrics.render_prometheus()
+        assert 'mt_http_requests_total{tenant="busy",route="/items/{id}",method="GET",status="2xx"} 3' in text
+        assert 'mt_http_request_duration_seconds_bucket{tenant="busy",route="/items/{id}",method="GET",le="0.1"} 3' in text
+        assert 'mt_http_request_duration_seconds_bucket{tenant="other",route="/items/{id}",method="GET",le="+Inf"} 2' in text
+
+    def test_labels_are_sticky(self):
+        """라벨은 처음 정한 대로 유지되어 카운터가 줄지 않음"""
+        from mt_paas.middleware import RequestMetrics
+
+        metrics = RequestMetrics(top_tenants=2, max_tracked_tenants=3)
+        for tenant in ("a", "b", "c", "d"):
+            metrics.observe(tenant, "/x", "GET", 200, 0.01)
+        assert set(metrics.snapshot()) == {"a", "b", "other"}
+        assert len(metrics._labels) == 3
+
+        # 나중에 요청이 몰려도 a/b 라벨을 빼앗지 않음
+        before = {label: routes[("/x", "GET")].count for label, routes in metrics.snapshot().items()}
+        for _ in range(10):
+            metrics.observe("c", "/x", "GET", 200, 0.01)
+        metrics.observe_cpu("c", 0.5)
+        after = {label: routes[("/x", "GET")].count for label, routes in metrics.snapshot().items()}
+        assert after == {"a": before["a"], "b": before["b"], "other": before["other"] + 10}
+        assert metrics.cpu_seconds() == {"other": 0.5}
+
+    def test_named_slots_only_for_remembered_tenants(self):
+        """기억하지 못하는 테넌트는 개별 라벨 슬롯을 쓰지 않음 (max_tracked < top)"""
+        from mt_paas.middleware import RequestMetrics
+
+        # NO_TENANT가 한 칸을 쓰므로 실제로 기억하는 테넌트는 1개
+        metrics = RequestMetrics(top_tenants=5, max_tracked_tenants=2)
+        for tenant in ("a", "b", "c", "b", "c"):
+            metrics.observe(tenant, "/x", "GET", 200, 0.01)
+        assert metrics._named == 1
+        counts = {label: routes[("/x", "GET")].count for label, routes in metrics.snapshot().items()}
+        assert counts == {"a": 1, "other": 4}
+
+    @pytest.mark.asyncio
+    async def test_setup_does_not_expose_metrics_by_default(self):
+        """setup_multi_tenant는 metrics_path를 줄 때만 /metrics 노출, 의존성 적용"""
+        import httpx
+        from fastapi import Depends, FastAPI, HTTPException
+        from mt_paas.config import MTPaaSConfig
+        from mt_paas.setup import setup_multi_tenant
+
+        app = FastAPI()
+        setup_multi_tenant(app, central_db_url="sqlite+aiosqlite:///:memory:", config=MTPaaSConfig())
+        assert "/metrics" not in [route.path for route in app.routes]
+
+        def deny():
+            raise HTTPException(status_code=401)
+
+        app = FastAPI()
+        setup_multi_tenant(
+            app,
+            central_db_url="sqlite+aiosqlite:///:memory:",
+            config=MTPaaSConfig(),
+            metrics_path="/metrics",
+            metrics_dependencies=[Depends(deny)],
+        )
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/metrics")
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_middleware_and_endpoint(self):
+        """라우트 템플릿/상태 코드 집계 및 /metrics 노출"""
+        import httpx
+        from fastapi import FastAPI, HTTPException
+        from mt_paas.middleware import (
+            MetricsMiddleware, RequestMetrics, TenantMiddleware, create_metrics_router,
+        )
+
+        metrics = RequestMetrics()
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+        app.add_middleware(TenantMiddleware, exclude_paths=["/metrics"])
+        app.include_router(create_metrics_router(metrics))
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            if item_id == "missing":
+                raise HTTPException(status_code=404)
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/items/1", headers={"X-Tenant-ID": "t1"})
+            await client.get("/items/missing", headers={"X-Tenant-ID": "t1"})
+            await client.get("/nowhere")
+            response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert 'tenant="t1",route="/items/{item_id}",method="GET",status="2xx"} 1' in text
+        assert 'tenant="t1",route="/items/{item_id}",method="GET",status="4xx"} 1' in text
+        assert 'tenant="none",route="unrouted",method="GET",status="4xx"} 1' in text
+        assert "/metrics" not in text
+
+class TestJWTTenantExtractor:
+    """JWT 클레임 테넌트 식별 테스트"""
+
+    SECRET = "test-secret"
+
+    def _token(self, **claims):
+        import time
+        from jose import jwt
+
+        claims.setdefault("exp", int(time.time()) + 3600)
+        return jwt.encode(claims, self.SECRET, algorithm="HS256")
+
+    def test_verified_token_cache(self, monkeypatch):
+        """같은 토큰 재요청 시 서명 검증 생략"""
+        from mt_paas.middleware import jwt_tenant
+        from mt_paas.middleware import JWTTenantExtractor
+
+        calls = []
+        decode = jwt_tenant.jwt.decode
+
+        def counting_decode(*args, **kwargs):
+            calls.append(1)
+            return decode(*args, **kwargs)
+
+        monkeypatch.setattr(jwt_tenant.jwt, "decode", counting_decode)
+
+        extractor = JWTTenantExtractor(self.SECRET)
+        token = self._token(tenant_id="t1", sub="u1")
+        for _ in range(3):
+            tenant_id, claims = extractor.extract(f"Bearer {token}")
+            assert tenant_id == "t1"
+            assert claims["sub"] == "u1"
+        assert len(calls) == 1
+        assert extractor.hits == 2
+
+    def test_rejects_invalid_tokens(self):
+        """서명 불일치/만료/Bearer 아님"""
+        import time
+        from jose import jwt
+        from mt_paas.middleware import JWTTenantExtractor
+
+        extractor = JWTTenantExtractor(self.SECRET)
+        forged = jwt.encode({"tenant_id": "t1"}, "other-secret", algorithm="HS256")
+        expired = self._token(tenant_id="t1", exp=int(time.time()) - 10)
+
+        assert extractor.extract(f"Bearer {forged}") == (None, None)
+        assert extractor.extract(f"Bearer {expired}") == (None, None)
+        assert extractor.extract("Basic dXNlcjpwYXNz") == (None, None)
+        assert len(extractor._cache) == 0
+
+    def test_cache_entry_expires_with_token(self):
+        """캐시 항목은 토큰 exp까지만 유효"""
+        import time
+        from mt_paas.middleware import JWTTenantExtractor
+
+        extractor = JWTTenantExtractor(self.SECRET)
+        token = self._token(tenant_id="t1")
+        extractor.verify(token)
+        key, (expires_at, claims) = next(iter(extractor._cache.items()))
+        assert expires_at == claims["exp"]
+
+        # 만료 시각이 지나면 캐시를 쓰지 않고 다시 검증
+        extractor._cache[key] = (time.time() - 1, claims)
+        extractor.verify(token)
+        assert extractor.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_middleware_bearer_identification(self):
+        """Bearer 토큰 클레임으로 테넌트 식별, 검증 클레임이 헤더보다 우선"""
+        import httpx
+        from fastapi import FastAPI, Request
+        from mt_paas.middleware import TenantMiddleware, JWTTenantExtractor, get_current_tenant
+
+        app = FastAPI()
+        app.add_middleware(TenantMiddleware, jwt_extractor=JWTTenantExtractor(self.SECRET))
+
+        @app.get("/whoami")
+        async def whoami(request: Request):
+            ctx = get_current_tenant()
+            return {
+                "tenant_id": ctx.tenant_id if ctx else None,
+                "sub": getattr(request.state, "jwt_claims", {}).get("sub"),
+            }
+
+        token = self._token(tenant_id="jwt_tenant", sub="u1")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            by_jwt = await client.get("/whoami", headers={"Authorization": f"Bearer {token}"})
+            spoofed = await client.get(
+                "/whoami",
+                headers={"Authorization": f"Bearer {token}", "X-Tenant-ID": "other_tenant"},
+            )
+            by_header = await client.get("/whoami", headers={"X-Tenant-ID": "explicit"})
+
+        assert by_jwt.json() == {"tenant_id": "jwt_tenant", "sub": "u1"}
+        assert spoofed.json()["tenant_id"] == "jwt_tenant"
+        assert by_header.json()["tenant_id"] == "explicit"
+
+class FakeTenantDBManager:
+    """세션 열기/commit/rollback 기록용 DB 매니저"""
+
+    def __init__(self):
+        self.log = []
+
+    def get_tenant_session(self, tenant_id):
+        from contextlib import asynccontextmanager
+
+        @asynccontextmanager
+        async def session():
+            self.log.append(("open", tenant_id))
+            try:
+                yield object()
+                self.log.append(("commit", tenant_id))
+            except Exception:
+                self.log.append(("rollback", tenant_id))
+                raise
+
+        return session()
+
+
+class TestRequestTenantSession:
+    """요청 단위 테넌트 DB 세션 테스트"""
+
+    def _app(self, manager):
+        from fastapi import FastAPI, HTTPException, Depends
+        from mt_paas.middleware import TenantMiddleware, TenantDB, tenant_db, get_request_session
+
+        TenantSession = tenant_db(manager)
+        app = FastAPI()
+        app.add_middleware(TenantMiddleware)
+
+        async def service_helper():
+            return await get_request_session()
+
+        async def sub_dependency(db: TenantDB = TenantSession) -> TenantDB:
+            return db
+
+        @app.get("/shared")
+        async def shared(db: TenantDB = TenantSession, other: TenantDB = Depends(sub_dependency)):
+            first = await db.session()
+            assert await other.session() is first
+            assert await service_helper() is first
+            return {}
+
+        @app.get("/unused")
+        async def unused(db: TenantDB = TenantSession):
+            return {}
+
+        @app.get("/fail")
+        async def fail(db: TenantDB = TenantSession):
+            await db.session()
+            raise HTTPException(status_code=400)
+
+        return app
+
+    @pytest.mark.asyncio
+    async def test_one_lazy_session_per_request(self):
+        """요청당 세션 1개, 사용하지 않으면 열지 않음, 실패 시 rollback"""
+        import httpx
+
+        manager = FakeTenantDBManager()
+        transport = httpx.ASGITransport(app=self._app(manager))
+        headers = {"X-Tenant-ID": "t1"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            shared = await client.get("/shared", headers=headers)
+            unused = await client.get("/unused", headers=headers)
+            failed = await client.get("/fail", headers=headers)
+            no_tenant = await client.get("/unused")
+
+        assert shared.status_code == 200
+        assert unused.status_code == 200
+        assert failed.status_code == 400
+        assert no_tenant.status_code == 401
+        assert manager.log == [
+            ("open", "t1"), ("commit", "t1"),
+            ("open", "t1"), ("rollback", "t1"),
+        ]
+
+class TestDataLoader:
+    """DataLoader 배치 병합 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_tick_into_one_batch(self):
+        """같은 tick의 조회는 배치 1회, 같은 키는 Future 공유"""
+        import asyncio
+        from mt_paas.core import DataLoader
+
+        calls = []
+
+        async def batch_load(keys):
+            calls.append(list(keys))
+            await asyncio.sleep(0)
+            return {key: key.upper() for key in keys if key != "missing"}
+
+        loader = DataLoader(batch_load)
+        results = await asyncio.gather(
+            *(loader.load(key) for key in ["a", "b", "a", "missing", "a"])
+        )
+
+        assert results == ["A", "B", "A", None, "A"]
+        assert calls == [["a", "b", "missing"]]
+
+        # 다음 tick은 새 배치
+        assert await loader.load("a") == "A"
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_and_errors(self):
+        """배치 크기 분할, 배치 실패는 해당 키 조회 모두에 전달"""
+        import asyncio
+        from mt_paas.core import DataLoader
+
+        calls = []
+
+        async def batch_load(keys):
+            calls.append(list(keys))
+            if "bad" in keys:
+                raise RuntimeError("db down")
+            return {key: key for key in keys}
+
+        loader = DataLoader(batch_load, max_batch_size=2)
+        assert await loader.load_many(["a", "b", "c"]) == ["a", "b", "c"]
+        assert calls == [["a", "b"], ["c"]]
+
+        results = await asyncio.gather(loader.load("bad"), loader.load("bad"), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert await loader.load("ok") == "ok"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """한 조회가 취소되어도 같은 키의 다른 조회는 결과를 받음"""
+        import asyncio
+        from mt_paas.core import DataLoader
+
+        release = asyncio.Event()
+
+        async def batch_load(keys):
+            await release.wait()
+            return {key: 1 for key in keys}
+
+        loader = DataLoader(batch_load)
+        first = asyncio.ensure_future(loader.load("t1"))
+        second = asyncio.ensure_future(loader.load("t1"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        release.set()
+
+        assert await second == 1
+        assert loader.batches == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_batch_releases_waiters(self):
+        """배치 태스크가 취소되면 대기 중인 조회도 취소되고 다음 조회는 새 배치"""
+        import asyncio
+        from mt_paas.core import DataLoader
+
+        batch_tasks = []
+
+        async def batch_load(keys):
+            if not batch_tasks:
+                batch_tasks.append(asyncio.current_task())
+                await asyncio.Event().wait()
+            return {key: key for key in keys}
+
+        loader = DataLoader(batch_load)
+        pending = asyncio.ensure_future(loader.load("t1"))
+        await asyncio.sleep(0.01)
+        batch_tasks[0].cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        assert loader._futures == {}
+        assert await loader.load("t1") == "t1"
+
+    @pytest.mark.asyncio
+    async def test_single_flight(self):
+        """SingleFlight: 동시 호출 1회, 실패/forget된 호출 결과는 on_result로 전달 안 함"""
+        import asyncio
+        from mt_paas.core import SingleFlight
+
+        flight = SingleFlight()
+        calls = []
+        stored = []
+        release = asyncio.Event()
+
+        async def load():
+            calls.append(1)
+            await release.wait()
+            return len(calls)
+
+        first = asyncio.ensure_future(flight.do("k", load, on_result=stored.append))
+        second = asyncio.ensure_future(flight.do("k", load, on_result=stored.append))
+        await asyncio.sleep(0.01)
+        release.set()
+        assert await first == await second == 1
+        assert stored == [1] and len(flight) == 0
+
+        # 진행 중 forget → 결과는 받지만 저장하지 않음
+        release.clear()
+        pending = asyncio.ensure_future(flight.do("k", load, on_result=stored.append))
+        await asyncio.sleep(0.01)
+        flight.forget("k")
+        release.set()
+        assert await pending == 2
+        assert stored == [1]
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await flight.do("k", fail, on_result=stored.append)
+        assert stored == [1] and len(flight) == 0
+
+class TestQuotaEngine:
+    """구독 한도 집행 엔진 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_consume_and_release(self):
+        """한도 내 증가, 초과 시 거부, 해제 후 재허용"""
+        from mt_paas.core.quota import QuotaEngine, QuotaLimits
+
+        quota = QuotaEngine()
+        quota.set_limits("t1", QuotaLimits(max_users=2))
+
+        assert await quota.consume("t1", "users")
+        assert await quota.consume("t1", "users")
+        assert not await quota.consume("t1", "users")
+        assert quota.remaining("t1", "users") == 0
+        assert not quota.check("t1", "users")
+
+        await quota.release("t1", "users")
+        assert quota.check("t1", "users")
+        assert quota.remaining("t1", "users") == 1
+
+        # 무제한 리소스
+        assert await quota.consume("t1", "api_calls", 10_000)
+        assert quota.remaining("t1", "api_calls") is None
+
+    @pytest.mark.asyncio
+    async def test_enforce_raises_quota_exceeded(self):
+        """초과 시 QuotaExceededError"""
+        from mt_paas.core.quota import QuotaEngine, QuotaLimits
+        from mt_paas.standard_api import QuotaExceededError
+
+        quota = QuotaEngine()
+        quota.set_limits("t1", QuotaLimits(max_storage_mb=100))
+        quota.set_usage("t1", storage_mb=90)
+
+        with pytest.raises(QuotaExceededError) as exc:
+            await quota.enforce("t1", "storage_mb", 20)
+        assert exc.value.limit == 100
+        await quota.enforce("t1", "storage_mb", 10)
+
+    @pytest.mark.asyncio
+    async def test_lazy_seed_once(self):
+        """첫 조회 시 1회만 적재 (동시 요청 포함)"""
+        import asyncio
+        from mt_paas.core.quota import QuotaEngine
+
+        calls = []
+
+        async def counts_loader(tenant_id):
+            calls.append(tenant_id)
+            await asyncio.sleep(0)
+            return {"users": 5}
+
+        quota = QuotaEngine(counts_loader=counts_loader)
+        results = await asyncio.gather(*(quota.consume("t1", "users") for _ in range(10)))
+
+        assert all(results)
+        assert calls == ["t1"]
+        assert quota._tenants["t1"].users == 15
+
+    @pytest.mark.asyncio
+    async def test_seed_survives_owner_cancel(self):
+        """처음 적재를 시작한 요청이 취소되어도 대기 중인 요청은 적재 결과 사용"""
+        import asyncio
+        from mt_paas.core.quota import QuotaEngine
+
+        release = asyncio.Event()
+
+        async def counts_loader(tenant_id):
+            await release.wait()
+            return {"users": 2}
+
+        quota = QuotaEngine(counts_loader=counts_loader)
+        owner = asyncio.create_task(quota.ensure("t1"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(quota.ensure("t1"))
+        await asyncio.sleep(0)
+        owner.cancel()
+        release.set()
+
+        assert (await waiter).users == 2
+        assert owner.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_router_seeds_user_count_from_handler(self):
+        """counts_loader가 없으면 v2 라우터가 handler.list_users total로 사용자 수 적재"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.core.quota import QuotaEngine, QuotaLimits
+        from mt_paas.standard_api import create_standard_router_v2, UsersListResponse
+
+        class Handler:
+            created = []
+
+            async def list_users(self, tenant_id, filters):
+                return UsersListResponse(tenant_id=tenant_id, total=3, limit=filters.limit, offset=0, users=[])
+
+            async def create_user(self, tenant_id, request):
+                Handler.created.append(request.email)
+                raise AssertionError("quota should reject first")
+
+        quota = QuotaEngine()
+        app = FastAPI()
+        app.include_router(create_standard_router_v2(Handler(), require_auth=False, quota=quota))
+        assert quota.counts_loader is not None
+
+        quota.set_limits("t1", QuotaLimits(max_users=3))
+        await quota.seed("t1")
+        assert quota.remaining("t1", "users") == 0
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/mt/tenant/t1/users", json={"email": "a@b.c", "name": "a"})
+        assert response.status_code == 429
+        assert Handler.created == []
+
+    @pytest.mark.asyncio
+    async def test_middleware_rejects_over_daily_limit(self):
+        """일일 API 호출 한도 초과 시 미들웨어 429"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.core.quota import QuotaEngine, QuotaLimits
+        from mt_paas.middleware import TenantMiddleware
+
+        quota = QuotaEngine()
+        quota.set_limits("t1", QuotaLimits(max_api_calls_per_day=2))
+
+        app = FastAPI()
+        app.add_middleware(TenantMiddleware, quota=quota)
+
+        @app.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            codes = [
+                (await client.get("/ping", headers={"X-Tenant-ID": "t1"})).status_code
+                for _ in range(3)
+            ]
+            other = await client.get("/ping", headers={"X-Tenant-ID": "t2"})
+
+        assert codes == [200, 200, 429]
+        assert other.status_code == 200
+
+
+class TestSetupWiring:
+    """setup_multi_tenant 구성 테스트"""
+
+    @staticmethod
+    def make(**config_overrides):
+        from fastapi import FastAPI
+        from mt_paas import setup_multi_tenant, MTPaaSConfig
+
+        config = MTPaaSConfig()
+        for key, value in config_overrides.items():
+            setattr(config, key, value)
+        return setup_multi_tenant(FastAPI(), central_db_url="sqlite+aiosqlite:///:memory:", config=config)
+
+    def test_meter_uses_mt_usage_recorder(self):
+        """LLMMeter 기본 기록기가 mt.usage"""
+        from mt_paas.usage import LLMMeter, get_usage_recorder
+
+        mt = self.make()
+        assert get_usage_recorder() is mt.usage
+        assert LLMMeter().recorder is mt.usage
+
+    @pytest.mark.asyncio
+    async def test_memory_report_requires_dependencies(self):
+        """메모리 보고서는 debug_path와 인증 의존성이 모두 있을 때만 노출"""
+        import httpx
+        from fastapi import Depends, FastAPI
+        from mt_paas import setup_multi_tenant, MTPaaSConfig
+        from mt_paas.config import MemoryProfilingConfig
+
+        async def status(**kwargs):
+            config = MTPaaSConfig()
+            config.memory_profiling = MemoryProfilingConfig(enabled=True, debug_path="/debug/memory")
+            app = FastAPI()
+            setup_multi_tenant(app, central_db_url="sqlite+aiosqlite:///:memory:", config=config, **kwargs)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return (await client.get("/debug/memory")).status_code
+
+        assert await status() == 404
+        assert await status(memory_debug_dependencies=[Depends(lambda: None)]) == 200
+
+    def test_opt_in_features_off_by_default(self):
+        """알려진 테넌트 필터/속도 제한/CPU 계측은 기본 비활성"""
+        from mt_paas.middleware import CPUAccountingMiddleware
+
+        mt = self.make()
+        assert mt.known_tenants is None
+        assert mt.rate_limiter is None
+        assert CPUAccountingMiddleware not in [m.cls for m in mt.app.user_middleware]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
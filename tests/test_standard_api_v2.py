@@ -696,5 +696,642 @@ class TestMockHandler:
         assert result.limit == 20
 
 
+# =============================================================================
+# API 키 검증 테스트
+# =============================================================================
+
+class TestAPIKeyVerifier:
+    """API 키 검증기 테스트"""
+
+    def test_multiple_keys_and_counts(self, monkeypatch):
+        """환경변수의 여러 키 허용, 키별 요청 수 집계, 원문은 보관하지 않음"""
+        from mt_paas.standard_api import APIKeyVerifier
+
+        monkeypatch.setenv("TEST_MARKET_API_KEY", "key-a, key-b")
+        verifier = APIKeyVerifier(env="TEST_MARKET_API_KEY")
+
+        key_a = verifier.verify("key-a")
+        assert key_a is not None
+        assert verifier.verify("key-a") == key_a
+        assert verifier.verify("key-b") not in (None, key_a)
+        assert verifier.verify("key-c") is None
+        assert verifier.verify(None) is None
+
+        stats = verifier.stats()
+        assert stats["keys"][key_a]["requests"] == 2
+        assert stats["rejected"] == 2
+        assert "key-a" not in repr(stats)
+
+        # 한 번 읽은 뒤에는 환경변수를 다시 읽지 않음
+        monkeypatch.setenv("TEST_MARKET_API_KEY", "key-c")
+        assert verifier.verify("key-c") is None
+        verifier.reload()
+        assert verifier.verify("key-c") is not None
+        assert verifier.verify("key-a") is None
+
+    def test_invalid_env_entry_keeps_previous_keys(self, monkeypatch):
+        """환경변수에 잘못된 sha256: 항목이 있어도 예외 없이 이전 키 유지"""
+        from mt_paas.standard_api import APIKeyVerifier
+
+        monkeypatch.setenv("TEST_MARKET_API_KEY", "key-a")
+        verifier = APIKeyVerifier(keys=["static-key"], env="TEST_MARKET_API_KEY")
+        assert verifier.verify("key-a") is not None
+
+        monkeypatch.setenv("TEST_MARKET_API_KEY", "key-b,sha256:not-hex")
+        verifier.reload()
+        assert verifier.verify("key-a") is not None
+        assert verifier.verify("static-key") is not None
+        assert verifier.verify("key-b") is None
+
+    def test_reload_drops_removed_keys(self, monkeypatch, tmp_path):
+        """출처에서 빠진 키는 제거, 읽기 실패한 출처는 그 출처의 키만 유지"""
+        from mt_paas.standard_api import APIKeyVerifier
+
+        key_file = tmp_path / "keys.txt"
+        key_file.write_text("file-key\n")
+        monkeypatch.setenv("TEST_MARKET_API_KEY", "key-a")
+        verifier = APIKeyVerifier(env="TEST_MARKET_API_KEY", path=str(key_file))
+        assert verifier.verify("key-a") is not None
+        assert verifier.verify("file-key") is not None
+
+        # 파일 키 제거 + 환경변수는 읽기 실패 → key-a는 유지, file-key는 제거
+        key_file.write_text("")
+        monkeypatch.setenv("TEST_MARKET_API_KEY", "key-b,sha256:not-hex")
+        verifier.reload()
+        assert verifier.verify("key-a") is not None
+        assert verifier.verify("file-key") is None
+
+        monkeypatch.setenv("TEST_MARKET_API_KEY", "key-b")
+        verifier.reload()
+        assert verifier.verify("key-a") is None
+        assert verifier.verify("key-b") is not None
+
+    def test_rotation_window(self, monkeypatch):
+        """교체 시 유예 기간 동안 기존 키와 새 키 모두 허용, 이후 기존 키 거절"""
+        import time
+        from mt_paas.standard_api import APIKeyVerifier
+
+        verifier = APIKeyVerifier(keys=["old-key"], env=None)
+        new_id = verifier.rotate("new-key", grace_seconds=60)
+
+        assert verifier.verify("old-key") is not None
+        assert verifier.verify("new-key") == new_id
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 61)
+        assert verifier.verify("old-key") is None
+        assert verifier.verify("new-key") == new_id
+
+        verifier.revoke(new_id)
+        assert verifier.verify("new-key") is None
+        assert not verifier.configured
+
+    def test_file_hot_reload(self, tmp_path):
+        """키 파일 (해시 항목, 만료 시각) 수정 시 다시 읽음"""
+        import hashlib
+        import os
+        import time
+        from mt_paas.standard_api import APIKeyVerifier
+
+        path = tmp_path / "api_keys"
+        hashed = hashlib.sha256(b"hashed-key").hexdigest()
+        path.write_text(f"# 서비스 마켓\nfile-key\nsha256:{hashed}\nexpired-key 2020-01-01T00:00:00Z\n")
+        verifier = APIKeyVerifier(env=None, path=str(path), reload_interval=0.001)
+
+        assert verifier.verify("file-key") is not None
+        assert verifier.verify("hashed-key") is not None
+        assert verifier.verify("expired-key") is None
+
+        path.write_text("rotated-key\n")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        time.sleep(0.01)
+        assert verifier.verify("rotated-key") is not None
+        assert verifier.verify("file-key") is None
+
+        # 파일을 읽을 수 없으면 이전 키 유지
+        path.unlink()
+        verifier.reload()
+        assert verifier.verify("rotated-key") is not None
+
+    @pytest.mark.asyncio
+    async def test_routers_share_verifier(self, monkeypatch):
+        """v2 라우터와 호환 라우터가 같은 검증기로 인증"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.standard_api import (
+            APIKeyVerifier,
+            create_standard_router_v2,
+            create_service_market_compat_router,
+        )
+
+        verifier = APIKeyVerifier(keys=["market-key"], env=None)
+        app = FastAPI()
+        app.include_router(create_standard_router_v2(MockHandlerV2(), api_key_verifier=verifier))
+        app.include_router(create_service_market_compat_router(MockHandlerV2(), api_key_verifier=verifier))
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            ok = await client.get("/mt/tenant/t1/stats", headers={"X-Market-API-Key": "market-key"})
+            bad = await client.get("/mt/tenant/t1/stats", headers={"X-Market-API-Key": "wrong"})
+            missing = await client.get("/mt/tenant/t1/stats")
+            compat = await client.get("/api/tenant/stats/t1", headers={"X-API-Key": "market-key"})
+
+        assert ok.status_code == 200
+        assert bad.status_code == 401
+        assert missing.status_code == 401
+        assert compat.status_code == 200
+        assert sum(k["requests"] for k in verifier.stats()["keys"].values()) == 2
+
+
+# =============================================================================
+# 응답 캐시 테스트
+# =============================================================================
+
+class CountingHandlerV2(MockHandlerV2):
+    """핸들러 호출 수를 세는 Mock 핸들러"""
+
+    def __init__(self):
+        super().__init__()
+        self.stats_calls = 0
+        self.total_users = 100
+
+    async def get_tenant_stats(self, tenant_id, period="30d"):
+        self.stats_calls += 1
+        response = await super().get_tenant_stats(tenant_id, period)
+        response.summary.total_users = self.total_users
+        return response
+
+    async def delete_user(self, tenant_id, user_id):
+        from mt_paas.standard_api import DeleteUserResponse
+
+        self.total_users -= 1
+        return DeleteUserResponse(success=True, user_id=user_id, message="deleted")
+
+
+class TestResponseCache:
+    """v2 읽기 API 응답 캐시 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_etag_and_not_modified(self):
+        """같은 테넌트/파라미터는 캐시, If-None-Match 일치 시 304"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.standard_api import ResponseCache, create_standard_router_v2
+
+        handler = CountingHandlerV2()
+        cache = ResponseCache()
+        app = FastAPI()
+        app.include_router(create_standard_router_v2(handler, require_auth=False, response_cache=cache))
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/mt/tenant/t1/stats")
+            etag = first.headers["etag"]
+            second = await client.get("/mt/tenant/t1/stats")
+            not_modified = await client.get("/mt/tenant/t1/stats", headers={"If-None-Match": etag})
+            other_period = await client.get("/mt/tenant/t1/stats?period=7d")
+            other_tenant = await client.get("/mt/tenant/t2/stats", headers={"If-None-Match": etag})
+
+        assert first.status_code == 200
+        assert first.json()["summary"]["total_users"] == 100
+        assert second.headers["etag"] == etag
+        assert second.content == first.content
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert other_period.json()["period"] == "7d"
+        assert other_tenant.status_code == 200
+        # t1/30d, t1/7d, t2/30d만 계산
+        assert handler.stats_calls == 3
+        assert cache.stats()["not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidated_by_mutation_and_lifecycle(self):
+        """사용자 변경 API와 생명주기 이벤트 시 테넌트 캐시 무효화"""
+        import httpx
+        from types import SimpleNamespace
+        from fastapi import FastAPI
+        from mt_paas.core.lifecycle import TenantLifecycle, LifecycleEvent
+        from mt_paas.standard_api import ResponseCache, create_standard_router_v2
+
+        handler = CountingHandlerV2()
+        cache = ResponseCache()
+        lifecycle = TenantLifecycle(db_manager=None)
+        cache.bind_lifecycle(lifecycle)
+        app = FastAPI()
+        app.include_router(create_standard_router_v2(handler, require_auth=False, response_cache=cache))
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            etag = (await client.get("/mt/tenant/t1/stats")).headers["etag"]
+            await client.get("/mt/tenant/t2/stats")
+
+            assert (await client.delete("/mt/tenant/t1/users/u1")).status_code == 200
+            changed = await client.get("/mt/tenant/t1/stats", headers={"If-None-Match": etag})
+            assert changed.status_code == 200
+            assert changed.json()["summary"]["total_users"] == 99
+            assert handler.stats_calls == 3
+
+            # 다른 테넌트 캐시는 유지
+            await client.get("/mt/tenant/t2/stats")
+            assert handler.stats_calls == 3
+
+            for hook in lifecycle._hooks[LifecycleEvent.AFTER_SUSPEND]:
+                hook(tenant=SimpleNamespace(id="t2"))
+            await client.get("/mt/tenant/t2/stats")
+            assert handler.stats_calls == 4
+
+    @pytest.mark.asyncio
+    async def test_owner_cancel_and_errors(self):
+        """처음 계산한 요청이 취소되어도 대기 요청은 결과를 받고, 예외는 캐시하지 않음"""
+        import asyncio
+        from mt_paas.standard_api import ResponseCache
+
+        cache = ResponseCache()
+        release = asyncio.Event()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await release.wait()
+            return b"{}"
+
+        owner = asyncio.create_task(cache.get_or_compute("stats", "t1", (), compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_compute("stats", "t1", (), compute))
+        await asyncio.sleep(0)
+        owner.cancel()
+        release.set()
+
+        assert (await waiter).body == b"{}"
+        assert owner.cancelled()
+        assert cache.get("stats", "t1") is not None
+        assert len(calls) == 1
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("costs", "t1", (), fail)
+        assert cache.get("costs", "t1") is None
+
+
+# =============================================================================
+# 배치 API 테스트
+# =============================================================================
+
+class TestBatchEndpoint:
+    """POST /mt/batch 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_batch_results_in_order(self):
+        """하위 요청을 라우터로 실행하고 요청 순서대로 상태 코드/본문 반환"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.standard_api import APIKeyVerifier, create_standard_router_v2
+
+        verifier = APIKeyVerifier(keys=["market-key"], env=None)
+        app = FastAPI()
+        app.include_router(create_standard_router_v2(CountingHandlerV2(), api_key_verifier=verifier))
+
+        batch = {
+            "requests": [
+                {"path": "/mt/tenant/t1/stats"},
+                {"path": "/mt/tenant/t2/stats", "params": {"period": "7d"}},
+                {"method": "DELETE", "path": "/mt/tenant/t1/users/u1"},
+                {"path": "/mt/tenant/t1/stats/top-users?limit=500"},
+                {"path": "/mt/health"},
+                {"path": "/admin/secret"},
+                {"method": "PATCH", "path": "/mt/tenant/t1/stats"},
+                {"path": "/mt/tenant/t1/unknown"},
+            ]
+        }
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/mt/batch", json=batch, headers={"X-Market-API-Key": "market-key"})
+            unauthorized = await client.post("/mt/batch", json=batch)
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == [200, 200, 400, 422, 200, 400, 400, 404]
+        assert results[0]["body"]["tenant_id"] == "t1"
+        assert results[1]["body"]["period"] == "7d"
+        # 쓰기는 미들웨어를 거치도록 개별 요청으로만 허용
+        assert "Method not allowed" in results[2]["body"]["message"]
+        assert results[5]["body"]["error"] == "INVALID_REQUEST"
+        assert unauthorized.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_sub_requests_isolated_and_no_streaming(self):
+        """하위 요청은 배치 요청의 테넌트 컨텍스트를 물려받지 않고, 스트리밍 내보내기는 거절"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.middleware import TenantMiddleware, get_current_tenant
+        from mt_paas.standard_api import create_standard_router_v2
+
+        seen = []
+
+        class ContextHandler(MockHandlerV2):
+            async def get_tenant_stats(self, tenant_id, period="30d"):
+                seen.append(get_current_tenant())
+                return await super().get_tenant_stats(tenant_id, period)
+
+        app = FastAPI()
+        app.include_router(create_standard_router_v2(ContextHandler(), require_auth=False))
+        app.add_middleware(TenantMiddleware)
+
+        batch = {
+            "requests": [
+                {"path": "/mt/tenant/t1/stats"},
+                {"path": "/mt/tenant/t1/users/export"},
+                {"path": "/mt/tenant/t1/resources/export/"},
+            ]
+        }
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/mt/batch", json=batch, headers={"X-Tenant-ID": "t9"})
+
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == [200, 400, 400]
+        assert "Streaming endpoint" in results[1]["body"]["message"]
+        assert seen == [None]
+
+    @pytest.mark.asyncio
+    async def test_batch_concurrency_bound(self):
+        """하위 요청 동시 실행 수 제한, 최대 개수 초과 시 413"""
+        import asyncio
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.standard_api import create_standard_router_v2
+
+        class SlowHandler(MockHandlerV2):
+            running = 0
+            peak = 0
+
+            async def get_tenant_stats(self, tenant_id, period="30d"):
+                SlowHandler.running += 1
+                SlowHandler.peak = max(SlowHandler.peak, SlowHandler.running)
+                await asyncio.sleep(0.01)
+                SlowHandler.running -= 1
+                return await super().get_tenant_stats(tenant_id, period)
+
+        app = FastAPI()
+        app.include_router(create_standard_router_v2(
+            SlowHandler(), require_auth=False, batch_concurrency=3, batch_max_items=20
+        ))
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            items = [{"path": f"/mt/tenant/t{i}/stats"} for i in range(20)]
+            response = await client.post("/mt/batch", json={"requests": items})
+            too_many = await client.post("/mt/batch", json={"requests": items + items[:1]})
+
+        results = response.json()["results"]
+        assert [r["body"]["tenant_id"] for r in results] == [f"t{i}" for i in range(20)]
+        assert SlowHandler.peak == 3
+        assert too_many.status_code == 413
+
+
+class TestUsageExport:
+    """GET /mt/usage (전체 테넌트 사용량 NDJSON) 테스트"""
+
+    @staticmethod
+    def make_handler(tenant_ids, delay=0.0):
+        import asyncio
+        from mt_paas.standard_api import (
+            StandardAPIHandler, UsageResponse, UsageData, TenantNotFoundError,
+        )
+
+        class UsageHandler(StandardAPIHandler):
+            running = 0
+            peak = 0
+
+            async def activate_tenant(self, request): ...
+            async def deactivate_tenant(self, tenant_id, request): ...
+            async def get_tenant_status(self, tenant_id): ...
+
+            async def list_tenant_ids(self):
+                if tenant_ids is None:
+                    return await super().list_tenant_ids()
+                return tenant_ids
+
+            async def get_tenant_usage(self, tenant_id, period):
+                UsageHandler.running += 1
+                UsageHandler.peak = max(UsageHandler.peak, UsageHandler.running)
+                await asyncio.sleep(delay)
+                UsageHandler.running -= 1
+                if tenant_id == "deleted":
+                    raise TenantNotFoundError(tenant_id)
+                if tenant_id == "broken":
+                    raise RuntimeError("db connection lost")
+                return UsageResponse(
+                    tenant_id=tenant_id,
+                    period=period,
+                    usage=UsageData(active_users=1, total_sessions=2, api_calls=3, ai_tokens=4, storage_mb=5)
+                )
+
+        return UsageHandler()
+
+    @pytest.mark.asyncio
+    async def test_default_fan_out(self):
+        """기본 구현: 동시 조회 수 제한, 삭제된 테넌트 건너뜀, 잘못된 기간/미구현 에러"""
+        import json
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.standard_api import create_standard_router
+
+        tenant_ids = [f"t{i}" for i in range(10)] + ["deleted"]
+        handler = self.make_handler(tenant_ids, delay=0.01)
+        app = FastAPI()
+        app.include_router(create_standard_router(handler, require_auth=False, export_concurrency=3))
+        unsupported = FastAPI()
+        unsupported.include_router(create_standard_router(self.make_handler(None), require_auth=False))
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/mt/usage", params={"period": "2026-01"})
+            bad_period = await client.get("/mt/usage", params={"period": "2026-1-1"})
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=unsupported), base_url="http://test") as client:
+            not_implemented = await client.get("/mt/usage", params={"period": "2026-01"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(r["tenant_id"] for r in rows) == sorted(tenant_ids[:-1])
+        assert all(r["period"] == "2026-01" and r["usage"]["api_calls"] == 3 for r in rows)
+        assert type(handler).peak == 3
+        assert bad_period.status_code == 400
+        assert not_implemented.status_code == 501
+
+    @pytest.mark.asyncio
+    async def test_default_keeps_results_finished_with_failure(self):
+        """기본 구현: 한 테넌트 조회가 실패해도 함께 끝난 결과를 먼저 반환한 뒤 예외"""
+        handler = self.make_handler(["a", "broken", "c"])
+
+        received = []
+        with pytest.raises(RuntimeError, match="db connection lost"):
+            async for report in handler.export_usage("2026-01"):
+                received.append(report.tenant_id)
+        assert sorted(received) == ["a", "c"]
+
+    @pytest.mark.asyncio
+    async def test_override_and_client_stream(self):
+        """오버라이드한 export_usage를 v2 라우터로 스트리밍, 클라이언트가 줄 단위로 소비"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.market.client import ServiceMarketClient
+        from mt_paas.standard_api import UsageResponse, UsageData, create_standard_router_v2
+
+        handler = self.make_handler([])
+
+        async def export_usage(period, concurrency=8):
+            for tenant_id in ("a", "b"):
+                yield UsageResponse(
+                    tenant_id=tenant_id,
+                    period=period,
+                    usage=UsageData(api_calls=12, ai_tokens=3400, quiz_count=5, total_cost=1.5),
+                )
+            raise RuntimeError("db connection lost")
+
+        handler.export_usage = export_usage
+        app = FastAPI()
+        app.include_router(create_standard_router_v2(handler, require_auth=False))
+
+        market = ServiceMarketClient()
+        market.register_service("svc", base_url="http://test", api_key="k")
+        client = market.get_service("svc")
+        client._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+
+        received = []
+        with pytest.raises(RuntimeError, match="db connection lost"):
+            async for report in market.stream_service_usage("svc", "2026-02"):
+                received.append(report)
+        await market.close_all()
+
+        assert [(r.tenant_id, r.service_id, r.period) for r in received] == [
+            ("a", "svc", "2026-02"),
+            ("b", "svc", "2026-02"),
+        ]
+        metrics = {m.name: (m.value, m.unit) for m in received[0].metrics}
+        assert metrics["api_calls"] == (12, "calls")
+        assert metrics["ai_tokens"] == (3400, "tokens")
+        assert metrics["quiz_count"] == (5, "count")
+        assert "total_cost" not in metrics
+        assert received[0].total_cost == 1.5
+
+
+class TestTenantExport:
+    """GET /mt/tenant/{id}/users/export, /resources/export 테스트"""
+
+    @staticmethod
+    def make_handler(user_count, page_cap=100):
+        from mt_paas.standard_api import (
+            StandardAPIHandlerV2, UsersListResponse, UserInfo, TenantNotFoundError,
+        )
+
+        class PagedHandler(StandardAPIHandlerV2):
+            pages = []
+
+            async def activate_tenant(self, request): ...
+            async def deactivate_tenant(self, tenant_id, request): ...
+            async def get_tenant_status(self, tenant_id): ...
+            async def get_tenant_usage(self, tenant_id, period): ...
+            async def get_tenant_stats(self, tenant_id, period): ...
+            async def get_tenant_costs(self, tenant_id, period): ...
+            async def create_user(self, tenant_id, request): ...
+            async def update_user(self, tenant_id, user_id, request): ...
+            async def delete_user(self, tenant_id, user_id): ...
+            async def get_settings(self, tenant_id): ...
+
+            async def get_user(self, tenant_id, user_id):
+                return UserInfo(
+                    user_id=user_id, email=f"{user_id}@x.ac.kr", name=user_id,
+                    role="user", status="active", created_at="2026-01-01T00:00:00Z"
+                )
+
+            async def list_users(self, tenant_id, filters):
+                if tenant_id != "t1":
+                    raise TenantNotFoundError(tenant_id)
+                PagedHandler.pages.append((filters.offset, filters.limit, filters.role))
+                end = min(filters.offset + min(filters.limit, page_cap), user_count)
+                return UsersListResponse(
+                    tenant_id=tenant_id,
+                    total=user_count,
+                    limit=filters.limit,
+                    offset=filters.offset,
+                    users=[await self.get_user(tenant_id, f"u{i}") for i in range(filters.offset, end)]
+                )
+
+        return PagedHandler()
+
+    @pytest.mark.asyncio
+    async def test_default_paged_export(self):
+        """기본 구현은 최대 페이지 크기로 list_users를 반복, 필터 전달, 없는 테넌트 404"""
+        import json
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.standard_api import create_standard_router_v2
+
+        handler = self.make_handler(250)
+        app = FastAPI()
+        app.include_router(create_standard_router_v2(handler, require_auth=False))
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            users = await client.get("/mt/tenant/t1/users/export", params={"role": "user"})
+            missing = await client.get("/mt/tenant/nope/users/export")
+            resources = await client.get("/mt/tenant/t1/resources/export")
+            single = await client.get("/mt/tenant/t1/users/u7")
+
+        assert users.status_code == 200
+        assert users.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in users.text.splitlines()]
+        assert [r["user_id"] for r in rows] == [f"u{i}" for i in range(250)]
+        assert type(handler).pages == [(0, 100, "user"), (100, 100, "user"), (200, 100, "user")]
+        assert missing.status_code == 404
+        assert missing.json()["detail"]["error"] == "TENANT_NOT_FOUND"
+        assert resources.status_code == 200 and resources.text == ""
+        assert single.json()["user_id"] == "u7"
+
+    @pytest.mark.asyncio
+    async def test_short_pages_do_not_end_export(self):
+        """서비스가 페이지 크기를 100보다 작게 제한해도 total까지 모두 내보냄"""
+        from mt_paas.standard_api import UserFilters
+
+        handler = self.make_handler(70, page_cap=30)
+        users = [user.user_id async for user in handler.export_users("t1", UserFilters())]
+
+        assert users == [f"u{i}" for i in range(70)]
+        assert [offset for offset, _, _ in type(handler).pages] == [0, 30, 60]
+
+    @pytest.mark.asyncio
+    async def test_generator_override(self):
+        """오버라이드한 비동기 제너레이터를 페이지 호출 없이 그대로 스트리밍"""
+        import httpx
+        from fastapi import FastAPI
+        from mt_paas.standard_api import ResourceItem, create_standard_router_v2
+
+        handler = self.make_handler(0)
+
+        async def export_resources(tenant_id, filters):
+            for i in range(1000):
+                yield ResourceItem(
+                    id=f"r{i}", title=f"doc {i}", type=filters.type or "document",
+                    created_at="2026-01-01T00:00:00Z"
+                )
+
+        handler.export_resources = export_resources
+        app = FastAPI()
+        app.include_router(create_standard_router_v2(handler, require_auth=False))
+
+        lines = []
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            async with client.stream("GET", "/mt/tenant/t1/resources/export", params={"type": "course"}) as response:
+                async for line in response.aiter_lines():
+                    lines.append(line)
+
+        assert len(lines) == 1000
+        assert '"type":"course"' in lines[0]
+        assert type(handler).pages == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
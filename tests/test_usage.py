@@ -0,0 +1,678 @@
+"""
+사용량 파이프라인 테스트
+
+기록기, 마켓 보고기 등 DB 없이 동작하는 유닛 테스트
+"""
+
+import gzip
+import json
+
+import httpx
+import pytest
+
+
+class TestUsageRecorder:
+    """사용량 기록기 테스트"""
+
+    def test_drain_aggregates_per_tenant(self):
+        """테넌트별 집계"""
+        from mt_paas.usage import UsageRecorder
+
+        recorder = UsageRecorder()
+        recorder.record("t1", "api_calls")
+        recorder.record("t1", "api_calls")
+        recorder.record("t1", "llm_tokens", 500, user_id="u1")
+        recorder.record("t1", "llm_tokens", 300, user_id="u2")
+        recorder.record("t2", "storage_usage", 10)
+        recorder.record("t2", "storage_usage", 12)
+
+        deltas = recorder.drain()
+        assert deltas["t1"] == {"api_calls": 2, "llm_tokens": 800, "active_users": 2}
+        assert deltas["t2"] == {"storage_usage": 12}
+
+    def test_drain_only_changed_tenants(self):
+        """변화가 있는 테넌트만 반환"""
+        from mt_paas.usage import UsageRecorder
+
+        recorder = UsageRecorder()
+        recorder.record("t1", "api_calls")
+        recorder.record("t2", "api_calls")
+        recorder.drain()
+
+        recorder.record("t2", "api_calls", 3)
+        assert recorder.drain() == {"t2": {"api_calls": 3}}
+        assert recorder.drain() == {}
+
+    def test_restore_carries_over(self):
+        """되돌린 집계값은 다음 drain에 합산"""
+        from mt_paas.usage import UsageRecorder
+
+        recorder = UsageRecorder()
+        recorder.restore({"t1": {"api_calls": 5}})
+        recorder.record("t1", "api_calls", 2)
+        assert recorder.drain() == {"t1": {"api_calls": 7}}
+
+    def test_record_current_uses_context(self):
+        """현재 테넌트 컨텍스트로 기록"""
+        from mt_paas.usage import UsageRecorder
+        from mt_paas.middleware.tenant import (
+            TenantContext, set_current_tenant, clear_current_tenant,
+        )
+
+        recorder = UsageRecorder()
+        assert recorder.record_current("api_calls") is False
+
+        set_current_tenant(TenantContext(tenant_id="ctx_tenant"))
+        try:
+            assert recorder.record_current("api_calls") is True
+        finally:
+            clear_current_tenant()
+        assert recorder.drain() == {"ctx_tenant": {"api_calls": 1}}
+
+    def test_max_pending_drops_oldest(self):
+        """보관 한도 초과 시 오래된 이벤트 폐기"""
+        from mt_paas.usage import UsageRecorder
+
+        recorder = UsageRecorder(max_pending=2)
+        for _ in range(3):
+            recorder.record("t1", "api_calls")
+        assert recorder.dropped == 1
+        assert recorder.drain() == {"t1": {"api_calls": 2}}
+
+
+class TestUsageReporter:
+    """마켓 사용량 보고기 테스트"""
+
+    def _reporter(self, handler, tmp_path, **kwargs):
+        from mt_paas.usage import UsageRecorder, UsageReporter
+
+        recorder = kwargs.pop("recorder", None) or UsageRecorder()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return UsageReporter(
+            recorder,
+            endpoint="https://market.test/api/v1/usage/batch",
+            api_key="market-key",
+            service_id="keli_tutor",
+            cursor_path=str(tmp_path / "cursor.json"),
+            backoff_max_seconds=0,
+            http_client=client,
+            **kwargs,
+        )
+
+    async def test_default_config_reports_cpu_ms(self, tmp_path):
+        """기본 설정으로 만든 보고기는 CPUAccountingMiddleware의 cpu_ms도 보고"""
+        from mt_paas.config import MTPaaSConfig
+        from mt_paas.usage import UsageRecorder, UsageReporter
+
+        received = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received.append(json.loads(gzip.decompress(request.content)))
+            return httpx.Response(200)
+
+        config = MTPaaSConfig()
+        config.usage_report.endpoint = "https://market.test/api/v1/usage/batch"
+        config.usage_report.cursor_path = str(tmp_path / "cursor.json")
+        reporter = UsageReporter.from_config(
+            UsageRecorder(),
+            config,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        reporter.recorder.record("t1", "api_calls")
+        reporter.recorder.record("t1", "cpu_ms", 12.5)
+
+        assert await reporter.report_once() is True
+        assert received[0]["tenants"] == [{"tenant_id": "t1", "metrics": {"api_calls": 1, "cpu_ms": 12.5}}]
+
+    async def test_sends_compressed_batch(self, tmp_path):
+        """gzip 배치 1건 전송 및 커서 저장"""
+        received = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.headers["Content-Encoding"] == "gzip"
+            assert request.headers["X-Market-API-Key"] == "market-key"
+            received.append(json.loads(gzip.decompress(request.content)))
+            return httpx.Response(200)
+
+        reporter = self._reporter(handler, tmp_path, metrics=["api_calls"])
+        reporter.recorder.record("t1", "api_calls", 3)
+        reporter.recorder.record("t1", "internal_metric", 1)
+        reporter.recorder.record("t2", "internal_metric", 1)
+
+        assert await reporter.report_once() is True
+        assert len(received) == 1
+        batch = received[0]
+        assert batch["service_id"] == "keli_tutor"
+        assert batch["sequence"] == 1
+        assert batch["tenants"] == [{"tenant_id": "t1", "metrics": {"api_calls": 3}}]
+
+        cursor = json.loads((tmp_path / "cursor.json").read_text())
+        assert cursor["sequence"] == 1
+        assert "pending" not in cursor
+
+        # 변화가 없으면 전송하지 않음
+        assert await reporter.report_once() is True
+        assert len(received) == 1
+
+    async def test_retry_then_success(self, tmp_path):
+        """일시 오류 후 재시도 성공"""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(1)
+            return httpx.Response(503 if len(calls) < 3 else 200)
+
+        reporter = self._reporter(handler, tmp_path)
+        reporter.recorder.record("t1", "api_calls")
+
+        assert await reporter.report_once() is True
+        assert len(calls) == 3
+        assert reporter.sequence == 1
+
+    async def test_client_error_not_retried(self, tmp_path):
+        """4xx는 재시도하지 않고, 429는 재시도"""
+        statuses = [400]
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(1)
+            return httpx.Response(statuses.pop(0) if statuses else 200)
+
+        reporter = self._reporter(handler, tmp_path, max_retries=3)
+        reporter.recorder.record("t1", "api_calls")
+        assert await reporter.report_once() is False
+        assert len(calls) == 1
+
+        statuses.append(429)
+        assert await reporter.report_once() is True
+        assert len(calls) == 3
+
+    async def test_failure_persists_pending(self, tmp_path):
+        """최종 실패한 배치는 커서에 보존되고 재시작 후 같은 sequence/내용으로 재전송"""
+        from mt_paas.usage import UsageRecorder
+
+        def failing(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500)
+
+        reporter = self._reporter(failing, tmp_path, max_retries=2)
+        reporter.recorder.record("t1", "api_calls", 4)
+        assert await reporter.report_once() is False
+        assert reporter.sequence == 0
+
+        received = []
+
+        def ok(request: httpx.Request) -> httpx.Response:
+            received.append(json.loads(gzip.decompress(request.content)))
+            return httpx.Response(200)
+
+        # 재시작 시뮬레이션: 새 기록기 + 같은 커서 파일
+        restarted = self._reporter(ok, tmp_path, recorder=UsageRecorder())
+        restarted.recorder.record("t1", "api_calls", 1)
+        assert await restarted.report_once() is True
+        assert [(b["sequence"], b["tenants"]) for b in received] == [
+            (1, [{"tenant_id": "t1", "metrics": {"api_calls": 4}}]),
+            (2, [{"tenant_id": "t1", "metrics": {"api_calls": 1}}]),
+        ]
+        assert restarted.sequence == 2
+
+    async def test_cancelled_send_keeps_batch(self, tmp_path):
+        """전송 중 취소(종료)되어도 배치를 잃지 않고 같은 내용으로 재전송"""
+        import asyncio
+
+        received = []
+        blocked = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(gzip.decompress(request.content))
+            if not received and not blocked.is_set():
+                blocked.set()
+                await asyncio.sleep(3600)
+            received.append(body)
+            return httpx.Response(200)
+
+        reporter = self._reporter(handler, tmp_path)
+        reporter.recorder.record("t1", "api_calls", 2)
+        task = asyncio.create_task(reporter.report_once())
+        await blocked.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        reporter.recorder.record("t1", "api_calls", 1)
+        assert await reporter.report_once() is True
+        assert [(b["sequence"], b["tenants"][0]["metrics"]) for b in received] == [
+            (1, {"api_calls": 2}),
+            (2, {"api_calls": 1}),
+        ]
+
+    def test_recorder_without_consumer_does_not_buffer(self):
+        """보고기/리스너가 없으면 요청마다 이벤트를 쌓지 않음"""
+        from mt_paas.usage import UsageRecorder
+
+        recorder = UsageRecorder(buffer=False)
+        assert recorder.active is False
+        recorder.record("t1", "api_calls")
+        assert len(recorder) == 0
+
+    def test_from_config_disabled_without_endpoint(self):
+        """엔드포인트가 없으면 보고기 미생성"""
+        from mt_paas.config import MTPaaSConfig
+        from mt_paas.usage import UsageRecorder, UsageReporter
+
+        config = MTPaaSConfig()
+        assert UsageReporter.from_config(UsageRecorder(), config) is None
+
+        config.usage_report.endpoint = "https://market.test/usage/batch"
+        reporter = UsageReporter.from_config(UsageRecorder(), config)
+        assert reporter.interval_seconds == 300
+        assert reporter.service_id == "mt_paas"
+
+
+class TestTopUsersTracker:
+    """상위 사용자 추적기 테스트"""
+
+    def test_rank_by_messages(self):
+        """메시지 수 기준 상위 K명"""
+        from mt_paas.usage import TopUsersTracker
+
+        tracker = TopUsersTracker(rank_by="messages")
+        for i in range(20):
+            tracker.record("t1", f"user_{i}", "messages", i)
+        tracker.record("t1", "user_3", "tokens", 999, name="김철수", email="kim@test.ac.kr")
+
+        top = tracker.top("t1", "30d", limit=3)
+        assert [u.user_id for u in top] == ["user_19", "user_18", "user_17"]
+
+        user_3 = [u for u in tracker.top("t1", "30d", limit=20) if u.user_id == "user_3"][0]
+        assert user_3.tokens == 999
+        assert user_3.name == "김철수"
+        assert tracker.top("other", "30d") == []
+
+    def test_calendar_periods(self):
+        """월/일 단위 기간 조회"""
+        import time
+        from datetime import datetime
+        from mt_paas.usage import TopUsersTracker
+
+        tracker = TopUsersTracker()
+        now = time.time()
+        tracker.record("t1", "u1", "messages", 5, timestamp=now)
+
+        month = datetime.utcfromtimestamp(now).strftime("%Y-%m")
+        day = datetime.utcfromtimestamp(now).strftime("%Y-%m-%d")
+        assert tracker.top("t1", month)[0].messages == 5
+        assert tracker.top("t1", day)[0].user_id == "u1"
+        assert tracker.top("t1", "1999-01") == []
+
+    def test_space_saving_keeps_heavy_hitters(self):
+        """추적 한도를 넘는 사용자 수에서도 상위 사용자 유지"""
+        from mt_paas.usage import TopUsersTracker
+
+        tracker = TopUsersTracker(capacity=20)
+        for round_ in range(50):
+            tracker.record("t1", "heavy_a", "messages", 10)
+            tracker.record("t1", "heavy_b", "messages", 5)
+            for i in range(10):
+                tracker.record("t1", f"light_{round_}_{i}", "messages", 1)
+
+        top = tracker.top("t1", "7d", limit=2)
+        assert [u.user_id for u in top] == ["heavy_a", "heavy_b"]
+        assert top[0].messages == 500
+
+    def test_rolling_sketch_and_zero_score_events(self):
+        """최근 N일 조회는 롤링 스케치를 재사용하며 새 이벤트 반영, 점수 0 이벤트는 상위 사용자를 밀어내지 않음"""
+        from mt_paas.usage import TopUsersTracker
+
+        tracker = TopUsersTracker(rank_by="messages", capacity=3)
+        for i, user_id in enumerate(["a", "b", "c"]):
+            tracker.record("t1", user_id, "messages", 10 + i)
+        assert [u.user_id for u in tracker.top("t1", "30d")] == ["c", "b", "a"]
+        rolling = tracker._rolling["t1"][30][1]
+
+        # 토큰만 쓰는 사용자가 많아도 상위 사용자 유지
+        for i in range(50):
+            tracker.record("t1", f"token_only_{i}", "tokens", 5000)
+        tracker.record("t1", "a", "messages", 100)
+
+        top = tracker.top("t1", "30d")
+        assert tracker._rolling["t1"][30][1] is rolling
+        assert [u.user_id for u in top] == ["a", "c", "b"]
+        assert top[0].messages == 110
+        assert [u.user_id for u in tracker.top("t1", "7d")] == ["a", "c", "b"]
+
+    async def test_handler_uses_tracker(self):
+        """핸들러 기본 get_top_users가 추적기 사용"""
+        from mt_paas.standard_api import StandardAPIHandlerV2
+        from mt_paas.usage import TopUsersTracker, UsageRecorder
+
+        recorder = UsageRecorder()
+        tracker = TopUsersTracker()
+        tracker.attach(recorder)
+        recorder.record("t1", "messages", 3, user_id="u1")
+        recorder.record("t1", "messages", 7, user_id="u2")
+        recorder.drain()
+
+        handler = type("H", (), {"top_users_tracker": tracker})()
+        response = await StandardAPIHandlerV2.get_top_users(handler, "t1", "30d", 10)
+        assert [u.user_id for u in response.users] == ["u2", "u1"]
+
+
+class TestListenersWithoutReporter:
+    """보고기 없이 기록 즉시 파생 집계 반영"""
+
+    def test_views_update_on_record(self):
+        from datetime import datetime
+        from mt_paas.usage import (
+            UsageRecorder, TopUsersTracker, DailySeriesStore, CostAccumulator, ModelPricing,
+        )
+
+        recorder = UsageRecorder(buffer=False)
+        tracker = TopUsersTracker(rank_by="tokens")
+        series = DailySeriesStore()
+        costs = CostAccumulator(ModelPricing.from_dict({"gpt-4o": {"input_per_1k": 0.0025, "output_per_1k": 0.01}}))
+        for view in (tracker, series, costs):
+            view.attach(recorder)
+        assert recorder.active is True
+
+        recorder.record("t1", "llm_tokens", 1500, user_id="u1", model="gpt-4o",
+                        tags={"input_tokens": 1000, "output_tokens": 500})
+
+        assert len(recorder) == 0
+        assert tracker.top("t1", "30d")[0].tokens == 1500
+        today = datetime.utcnow().date()
+        assert series.totals("t1", "7d", today)["tokens"] == 1500
+        assert costs.costs_response("t1", "7d", today).total_cost_usd == 0.0075
+
+
+class TestDailySeriesStore:
+    """일별 시계열 저장소 테스트"""
+
+    def test_window_and_trends(self):
+        """기간 슬라이스 및 응답 형태 변환"""
+        from datetime import date, timedelta
+        from mt_paas.usage import DailySeriesStore
+
+        today = date(2026, 1, 30)
+        store = DailySeriesStore()
+        store.add("t1", today, messages=10, tokens=1000, cost_usd=0.5, user_id="u1")
+        store.add("t1", today, messages=5, user_id="u1")
+        store.add("t1", today, user_id="u2")
+        store.add("t1", today - timedelta(days=2), messages=3, cost_usd=0.25)
+
+        window = store.window("t1", "7d", today)
+        assert len(window) == 7
+        assert window.start == date(2026, 1, 24)
+        assert list(window.messages) == [0, 0, 0, 0, 3, 0, 15]
+        assert list(window.users) == [0, 0, 0, 0, 0, 0, 2]
+
+        trends = store.daily_trends("t1", "7d", today)
+        assert trends[-1].date == "2026-01-30"
+        assert trends[-1].tokens == 1000
+
+        costs = store.daily_costs("t1", "2026-01", today)
+        assert len(costs) == 31
+        assert costs[27].cost_usd == 0.25
+
+        assert store.totals("t1", "30d", today)["messages"] == 18
+
+    def test_json_fast_path_matches_models(self):
+        """직렬화 fast path가 Pydantic 직렬화와 동일"""
+        import json
+        from datetime import date
+        from mt_paas.usage import DailySeriesStore
+
+        today = date(2026, 1, 30)
+        store = DailySeriesStore()
+        store.add("t1", today, messages=2, tokens=20, cost_usd=1.25, user_id="u1")
+
+        expected = [t.model_dump() for t in store.daily_trends("t1", "7d", today)]
+        assert json.loads(store.trends_json("t1", "7d", today)) == expected
+
+        expected = [c.model_dump() for c in store.daily_costs("t1", "7d", today)]
+        assert json.loads(store.costs_json("t1", "7d", today)) == expected
+
+    def test_ring_wraps_and_expires(self):
+        """보관 기간이 지난 날짜는 0으로 비워짐"""
+        from datetime import date, timedelta
+        from mt_paas.usage import DailySeriesStore
+
+        start = date(2026, 1, 1)
+        store = DailySeriesStore(days=90)
+        for i in range(200):
+            store.add("t1", start + timedelta(days=i), messages=1)
+
+        last = start + timedelta(days=199)
+        window = store.window("t1", "90d", last)
+        assert sum(window.messages) == 90
+
+        # 링보다 오래된 날짜 기록은 무시
+        store.add("t1", start, messages=100)
+        assert sum(store.window("t1", "90d", last).messages) == 90
+
+        # 건너뛴 날짜는 0
+        store.add("t1", last + timedelta(days=10), messages=1)
+        window = store.window("t1", "30d", last + timedelta(days=10))
+        assert list(window.messages[-11:]) == [1] + [0] * 9 + [1]
+
+    def test_attach_to_recorder(self):
+        """기록기 리스너로 연결"""
+        from mt_paas.usage import DailySeriesStore, UsageRecorder
+
+        recorder = UsageRecorder()
+        store = DailySeriesStore()
+        store.attach(recorder)
+        recorder.record("t1", "messages", 4, user_id="u1")
+        recorder.record("t1", "llm_tokens", 400, user_id="u1")
+        recorder.drain()
+
+        totals = store.totals("t1", "7d")
+        assert totals["messages"] == 4
+        assert totals["tokens"] == 400
+        assert totals["users"] == 1
+
+
+class TestCostAccumulator:
+    """모델별 비용 누적기 테스트"""
+
+    def _pricing(self):
+        from mt_paas.usage import ModelPricing
+
+        return ModelPricing.from_dict({
+            "gpt-4o": {"input_per_1k": 0.0025, "output_per_1k": 0.01},
+            "gpt-4o-mini": {"input_per_1k": 0.00015, "output_per_1k": 0.0006},
+            "default": {"input_per_1k": 0.001, "output_per_1k": 0.001},
+        })
+
+    def test_pricing_prefix_and_default(self):
+        """접두사 매칭 및 기본 단가"""
+        pricing = self._pricing()
+        assert pricing.cost("gpt-4o", 1000, 1000) == 0.0125
+        assert pricing.cost("gpt-4o-mini-2024-07-18", 1000, 0) == 0.00015
+        assert pricing.cost("unknown-model", 1000, 1000) == 0.002
+
+    def test_pricing_from_env(self, monkeypatch):
+        """환경변수 JSON에서 로드"""
+        from mt_paas.usage import ModelPricing
+
+        monkeypatch.setenv("MT_MODEL_PRICING", '{"m1": {"input_per_1k": 1, "output_per_1k": 2}}')
+        assert ModelPricing.from_env().cost("m1", 1000, 1000) == 3
+
+    def test_costs_response(self):
+        """ModelCost/UserCost/DailyCost 생성"""
+        from datetime import date, timedelta
+        from mt_paas.usage import CostAccumulator
+
+        today = date(2026, 1, 30)
+        costs = CostAccumulator(self._pricing())
+        costs.record("t1", "gpt-4o", 1000, 1000, user_id="u1", day=today, user_name="김철수")
+        costs.record("t1", "gpt-4o-mini", 1000, 1000, user_id="u2", day=today)
+        costs.record("t1", "gpt-4o", 2000, 0, user_id="u2", day=today - timedelta(days=1))
+        costs.record("t2", "gpt-4o", 1000, 1000, day=today)
+
+        response = costs.costs_response("t1", "7d", today)
+        assert response.total_cost_usd == round(0.0125 + 0.00075 + 0.005, 6)
+        assert [m.model for m in response.by_model] == ["gpt-4o", "gpt-4o-mini"]
+        assert response.by_model[0].input_tokens == 3000
+        assert response.by_user_top10[0].user_id == "u1"
+        assert response.by_user_top10[0].name == "김철수"
+        assert len(response.daily_trend) == 7
+        assert response.daily_trend[-2].cost_usd == 0.005
+
+        # 응답 직렬화
+        assert response.model_dump()["by_model"][0]["cost_usd"] == 0.0175
+
+    async def test_flush_rollups(self):
+        """롤업 증분 전달 및 실패 시 이월"""
+        from datetime import date
+        from mt_paas.usage import CostAccumulator
+
+        today = date(2026, 1, 30)
+        costs = CostAccumulator(self._pricing())
+        costs.record("t1", "gpt-4o", 1000, 0, day=today)
+
+        async def failing(rows):
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            await costs.flush(failing)
+
+        costs.record("t1", "gpt-4o", 1000, 0, day=today)
+        saved = []
+
+        async def sink(rows):
+            saved.extend(rows)
+
+        assert await costs.flush(sink) == 1
+        assert saved[0].input_tokens == 2000
+        assert saved[0].date == "2026-01-30"
+        assert await costs.flush(sink) == 0
+
+        # 롤업으로 복원
+        from mt_paas.usage import CostAccumulator as Fresh
+        restored = Fresh(self._pricing())
+        restored.load_rollups(saved)
+        assert restored.total_cost("t1", "7d", today) == 0.005
+
+    async def test_rollups_restore_user_costs(self):
+        """롤업은 사용자별로 나뉘어 저장되고 복원 후 by_user도 그대로"""
+        from datetime import date
+        from mt_paas.usage import CostAccumulator
+
+        today = date(2026, 1, 30)
+        costs = CostAccumulator(self._pricing())
+        costs.record("t1", "gpt-4o", 1000, 0, user_id="u1", user_name="김철수", day=today)
+        costs.record("t1", "gpt-4o", 2000, 0, user_id="u2", day=today)
+        costs.record("t1", "gpt-4o", 1000, 0, day=today)
+        saved = []
+
+        async def sink(rows):
+            saved.extend(rows)
+
+        assert await costs.flush(sink) == 3
+
+        restored = CostAccumulator(self._pricing())
+        restored.load_rollups(saved)
+        assert restored.by_user("t1", "7d", today=today) == costs.by_user("t1", "7d", today=today)
+        assert restored.by_user("t1", "7d", today=today)[1].name == "김철수"
+        assert restored.by_model("t1", "7d", today) == costs.by_model("t1", "7d", today)
+
+    def test_observe_llm_events(self):
+        """llm_tokens 이벤트 반영"""
+        from mt_paas.usage import CostAccumulator, UsageRecorder
+
+        recorder = UsageRecorder()
+        costs = CostAccumulator(self._pricing())
+        costs.attach(recorder)
+        recorder.record(
+            "t1", "llm_tokens", 1500, user_id="u1", model="gpt-4o",
+            tags={"input_tokens": 1000, "output_tokens": 500},
+        )
+        recorder.drain()
+        assert costs.total_cost("t1", "7d") == 0.0075
+
+
+class TestLLMMeter:
+    """LLM 호출 계측 테스트"""
+
+    def test_extract_token_usage(self):
+        """제공자별 응답 형식 인식"""
+        from types import SimpleNamespace
+        from mt_paas.usage import extract_token_usage
+
+        openai = SimpleNamespace(
+            model="gpt-4o",
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=20),
+        )
+        anthropic = SimpleNamespace(
+            model="claude-3-5-sonnet",
+            usage=SimpleNamespace(input_tokens=30, output_tokens=40),
+        )
+        google = SimpleNamespace(
+            usage_metadata=SimpleNamespace(prompt_token_count=50, candidates_token_count=60),
+        )
+        assert extract_token_usage(openai) == ("gpt-4o", 10, 20)
+        assert extract_token_usage(anthropic) == ("claude-3-5-sonnet", 30, 40)
+        assert extract_token_usage(google) == (None, 50, 60)
+        assert extract_token_usage({"model": "m", "usage": {"prompt_tokens": 1, "completion_tokens": 2}}) == ("m", 1, 2)
+        assert extract_token_usage("plain text") is None
+
+    def test_context_manager_tags_current_tenant(self):
+        """현재 테넌트로 llm_tokens 이벤트 적재"""
+        from types import SimpleNamespace
+        from mt_paas.usage import LLMMeter, UsageRecorder
+        from mt_paas.middleware.tenant import (
+            TenantContext, set_current_tenant, clear_current_tenant,
+        )
+
+        recorder = UsageRecorder()
+        meter = LLMMeter(recorder)
+        response = SimpleNamespace(
+            model="gpt-4o",
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=50),
+        )
+
+        # 테넌트 컨텍스트 없으면 적재하지 않음
+        with meter.call() as call:
+            call.record(response)
+        assert len(recorder) == 0
+
+        set_current_tenant(TenantContext(tenant_id="t1"))
+        try:
+            with meter.call(user_id="u1") as call:
+                call.record(response)
+        finally:
+            clear_current_tenant()
+
+        event = recorder._pending[0]
+        assert event.tenant_id == "t1"
+        assert event.model == "gpt-4o"
+        assert event.amount == 150
+        assert event.tags["input_tokens"] == 100
+        assert event.tags["latency_ms"] >= 0
+        assert recorder.drain() == {"t1": {"llm_tokens": 150, "active_users": 1}}
+
+    async def test_wrap_async_client(self):
+        """async 클라이언트 함수 래핑 → 비용 누적까지 연결"""
+        from types import SimpleNamespace
+        from mt_paas.usage import LLMMeter, UsageRecorder, CostAccumulator, ModelPricing
+
+        recorder = UsageRecorder()
+        costs = CostAccumulator(ModelPricing.from_dict({"claude": {"input_per_1k": 1, "output_per_1k": 1}}))
+        costs.attach(recorder)
+
+        async def create(model, messages):
+            return SimpleNamespace(model=model, usage=SimpleNamespace(input_tokens=500, output_tokens=500))
+
+        wrapped = LLMMeter(recorder).wrap(create)
+        from mt_paas.middleware.tenant import (
+            TenantContext, set_current_tenant, clear_current_tenant,
+        )
+        set_current_tenant(TenantContext(tenant_id="t1"))
+        try:
+            response = await wrapped(model="claude-3-haiku", messages=[], user_id="u1")
+        finally:
+            clear_current_tenant()
+
+        assert response.usage.input_tokens == 500
+        recorder.drain()
+        assert costs.total_cost("t1", "7d") == 1.0